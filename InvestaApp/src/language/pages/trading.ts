@@ -203,6 +203,7 @@ export const tradingTranslations = {
 
     // Empty states (PR 2)
     noOrdersYet: 'No orders yet',
+    loadMoreOrders: 'Load more orders',
     noNewsYet: 'No news available for this stock',
     noTradesYet: 'No recent trades',
     noFundamentals: 'No fundamental data available',
@@ -418,6 +419,7 @@ export const tradingTranslations = {
 
     // Empty states (PR 2)
     noOrdersYet: 'अभी तक कोई ऑर्डर नहीं',
+    loadMoreOrders: 'और ऑर्डर लोड करें',
     noNewsYet: 'इस स्टॉक के लिए कोई समाचार उपलब्ध नहीं',
     noTradesYet: 'हाल के कोई ट्रेड नहीं',
     noFundamentals: 'कोई मौलिक डेटा उपलब्ध नहीं',
@@ -633,6 +635,7 @@ export const tradingTranslations = {
 
     // Empty states (PR 2)
     noOrdersYet: 'இன்னும் ஆர்டர்கள் இல்லை',
+    loadMoreOrders: 'மேலும் ஆர்டர்களை ஏற்றவும்',
     noNewsYet: 'இந்த பங்குக்கு செய்திகள் இல்லை',
     noTradesYet: 'சமீபத்திய வர்த்தகங்கள் இல்லை',
     noFundamentals: 'அடிப்படை தரவு இல்லை',
@@ -848,6 +851,7 @@ export const tradingTranslations = {
 
     // Empty states (PR 2)
     noOrdersYet: 'ఇంకా ఆర్డర్లు లేవు',
+    loadMoreOrders: 'మరిన్ని ఆర్డర్లు లోడ్ చేయండి',
     noNewsYet: 'ఈ స్టాక్ కోసం వార్తలు అందుబాటులో లేవు',
     noTradesYet: 'ఇటీవలి ట్రేడ్లు లేవు',
     noFundamentals: 'ప్రాథమిక డేటా అందుబాటులో లేదు',
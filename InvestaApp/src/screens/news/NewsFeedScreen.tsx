@@ -25,6 +25,7 @@ interface NewsItem {
   stock: number;
   stock_symbol: string;
   stock_name: string;
+  symbols: string[];  // Every stock the story mentions
   title: string;
   source: string;
   summary: string;
@@ -36,20 +37,25 @@ const NewsFeedScreen = ({ navigation }: any) => {
   const [news, setNews] = useState<NewsItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
-  const [page, setPage] = useState(1);
+  // Opaque keyset cursor for the next page, null once the feed is exhausted
+  const [cursor, setCursor] = useState<string | null>(null);
   const [hasMore, setHasMore] = useState(true);
 
-  const fetchNews = useCallback(async (pageNum = 1, append = false) => {
+  const fetchNews = useCallback(async (pageCursor: string | null = null, append = false) => {
     try {
-      const response = await api.get('/api/news/', { params: { page: pageNum, page_size: 20 } });
+      const params: Record<string, any> = { page_size: 20 };
+      if (pageCursor) params.cursor = pageCursor;
+      const response = await api.get('/api/news/', { params });
       const results = response.data?.results ?? [];
       if (append) {
         setNews(prev => [...prev, ...results]);
       } else {
         setNews(results);
       }
-      setHasMore(results.length === 20);
-      setPage(pageNum);
+      const next: string | null = response.data?.next ?? null;
+      const match = next ? next.match(/[?&]cursor=([^&]+)/) : null;
+      setCursor(match ? decodeURIComponent(match[1]) : null);
+      setHasMore(!!match);
     } catch {
       // Silently fail
     } finally {
@@ -64,12 +70,12 @@ const NewsFeedScreen = ({ navigation }: any) => {
 
   const handleRefresh = () => {
     setRefreshing(true);
-    fetchNews(1);
+    fetchNews(null);
   };
 
   const handleLoadMore = () => {
-    if (!hasMore || loading) return;
-    fetchNews(page + 1, true);
+    if (!hasMore || loading || !cursor) return;
+    fetchNews(cursor, true);
   };
 
   const timeAgo = (dateStr: string) => {
@@ -100,7 +106,9 @@ const NewsFeedScreen = ({ navigation }: any) => {
       {item.summary ? (
         <Text style={styles.newsSummary} numberOfLines={3}>{item.summary}</Text>
       ) : null}
-      <Text style={styles.newsStock}>Related: {item.stock_name} ({item.stock_symbol})</Text>
+      <Text style={styles.newsStock}>
+        Related: {item.stock_name} ({item.symbols?.length ? item.symbols.join(', ') : item.stock_symbol})
+      </Text>
     </TouchableOpacity>
   );
 
@@ -10,7 +10,7 @@ import {
 } from 'react-native';
 import { useNavigation } from '@react-navigation/native';
 import { Ionicons } from '@expo/vector-icons';
-import { fetchOrderHistory } from './utils/tradingApi';
+import { fetchOrderHistoryPage } from './utils/tradingApi';
 import MainHeader from '../../components/MainHeader';
 import { useTranslation } from '../../language';
 
@@ -29,10 +29,13 @@ type NavigationProp = {
 const OrderHistoryScreen = () => {
   const navigation = useNavigation<NavigationProp>();
   const { t } = useTranslation();
-  const [selectedFilter, setSelectedFilter] = useState('All');
+  const [selectedFilter, setSelectedFilter] = useState(t.all);
   const [expandedItems, setExpandedItems] = useState<Set<string>>(new Set());
   const [orders, setOrders] = useState<any[]>([]);
   const [loading, setLoading] = useState(false);
+  // Keyset cursor for the next page of orders, null once the history is exhausted
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const filters = [t.all, t.buy, t.sell, t.thisWeek, t.thisMonth];
   
@@ -56,15 +59,38 @@ const OrderHistoryScreen = () => {
     setExpandedItems(newExpandedItems);
   };
 
+  // Filters are applied by the server so every page matches them
+  const getFilterParams = () => {
+    const daysAgo = (days: number) => {
+      const d = new Date();
+      d.setDate(d.getDate() - days);
+      return d.toISOString().slice(0, 10);
+    };
+    switch (selectedFilter) {
+      case t.buy:
+        return { side: 'BUY' };
+      case t.sell:
+        return { side: 'SELL' };
+      case t.thisWeek:
+        return { date_from: daysAgo(7) };
+      case t.thisMonth:
+        return { date_from: daysAgo(30) };
+      default:
+        // 'All' - no filtering
+        return {};
+    }
+  };
+
   useEffect(() => {
     let mounted = true;
     (async () => {
       try {
         setLoading(true);
-        const data = await fetchOrderHistory();
+        const page = await fetchOrderHistoryPage(getFilterParams());
         if (!mounted) return;
-        // Received orders data
-        setOrders(data);
+        // Received the first page of orders
+        setOrders(page.results);
+        setCursor(page.cursor);
       } catch (error) {
         console.error('OrderHistory: Error fetching orders:', error);
       } finally {
@@ -72,44 +98,20 @@ const OrderHistoryScreen = () => {
       }
     })();
     return () => { mounted = false; };
-  }, []);
-
-  const getFilteredOrders = () => {
-    let filtered = orders;
+  }, [selectedFilter]);
 
-    switch (selectedFilter) {
-      case 'Buy':
-        filtered = filtered.filter(order => (order.side || order.type) === 'BUY');
-        break;
-      case 'Sell':
-        filtered = filtered.filter(order => (order.side || order.type) === 'SELL');
-        break;
-      case 'This Week':
-        {
-          const weekAgo = new Date();
-          weekAgo.setDate(weekAgo.getDate() - 7);
-          filtered = filtered.filter(order => {
-            const ts = order.created_at ? new Date(order.created_at) : null;
-            return ts ? ts >= weekAgo : false;
-          });
-        }
-        break;
-      case 'This Month':
-        {
-          const monthAgo = new Date();
-          monthAgo.setDate(monthAgo.getDate() - 30);
-          filtered = filtered.filter(order => {
-            const ts = order.created_at ? new Date(order.created_at) : null;
-            return ts ? ts >= monthAgo : false;
-          });
-        }
-        break;
-      default:
-        // 'All' - no filtering
-        break;
+  const handleLoadMore = async () => {
+    if (!cursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchOrderHistoryPage({ ...getFilterParams(), cursor });
+      setOrders(prev => [...prev, ...page.results]);
+      setCursor(page.cursor);
+    } catch (error) {
+      console.error('OrderHistory: Error fetching more orders:', error);
+    } finally {
+      setLoadingMore(false);
     }
-
-    return filtered;
   };
 
   const formatTimestamp = (ts: string | undefined): string => {
@@ -126,8 +128,6 @@ const OrderHistoryScreen = () => {
     return `${d.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })}, ${time}`;
   };
 
-  const filteredOrders = getFilteredOrders();
-
   const renderHeader = () => (
     <View style={styles.header}>
       <MainHeader title={t.orderHistory} iconName="time" showBackButton onBackPress={handleBack} />
@@ -319,15 +319,20 @@ const OrderHistoryScreen = () => {
 
   const renderTradesList = () => (
     <View style={styles.tradesList}>
-      {filteredOrders.length === 0 ? (
+      {orders.length === 0 ? (
         <View style={styles.emptyTrades}>
           <Ionicons name="time-outline" size={48} color="#9CA3AF" />
           <Text style={styles.emptyText}>{t.noOrdersYet}</Text>
           <Text style={styles.emptySubtext}>{t.startTradingToSee}</Text>
         </View>
       ) : (
-        filteredOrders.map(renderTradeItem)
+        orders.map(renderTradeItem)
       )}
+      {cursor && orders.length > 0 ? (
+        <TouchableOpacity style={styles.loadMoreButton} onPress={handleLoadMore} disabled={loadingMore}>
+          <Text style={styles.loadMoreText}>{loadingMore ? t.loading : t.loadMoreOrders}</Text>
+        </TouchableOpacity>
+      ) : null}
     </View>
   );
 
@@ -456,6 +461,15 @@ const styles = StyleSheet.create({
     color: '#9CA3AF',
     textAlign: 'center',
   },
+  loadMoreButton: {
+    alignItems: 'center',
+    paddingVertical: 14,
+  },
+  loadMoreText: {
+    fontSize: 14,
+    fontWeight: '600',
+    color: '#2563EB',
+  },
   tradeItem: {
     backgroundColor: '#FFFFFF',
     borderBottomWidth: 1,
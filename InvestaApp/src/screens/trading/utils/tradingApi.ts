@@ -49,9 +49,29 @@ export const fetchPortfolioHoldings = async () => {
 };
 
 // Orders
+const ORDER_HISTORY_MAX_PAGE_SIZE = 100; // OrderHistoryPagination.max_page_size
+
+// The whole order history, following every keyset page; long lists should page with fetchOrderHistoryPage instead
 export const fetchOrderHistory = async (params?: { status?: string; side?: string; date_from?: string; date_to?: string }) => {
+	const orders: any[] = [];
+	let cursor: string | null = null;
+	do {
+		const page = await fetchOrderHistoryPage({ ...params, page_size: ORDER_HISTORY_MAX_PAGE_SIZE, ...(cursor ? { cursor } : {}) });
+		orders.push(...page.results);
+		cursor = page.cursor;
+	} while (cursor);
+	return orders;
+};
+
+// One keyset page of order history; `cursor` is parsed from the page's `next` link, null on the last page
+export const fetchOrderHistoryPage = async (params?: { status?: string; side?: string; date_from?: string; date_to?: string; cursor?: string; page_size?: number }) => {
 	const res = await api.get('orders/order_history/', { params });
-	return Array.isArray(res.data) ? res.data : (res.data?.results ?? []);
+	const next: string | null = res.data?.next ?? null;
+	const match = next ? next.match(/[?&]cursor=([^&]+)/) : null;
+	return {
+		results: Array.isArray(res.data) ? res.data : (res.data?.results ?? []),
+		cursor: match ? decodeURIComponent(match[1]) : null,
+	};
 };
 
 export const placeOrder = async (payload: {
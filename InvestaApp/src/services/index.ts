@@ -55,9 +55,9 @@ export type {
 export { default as tradingApi } from './tradingApi';
 export type {
   Stock, StockPrice, MarketData, TechnicalIndicator, StockDetail,
-  Portfolio, PortfolioHolding, Order, Trade, TradingPerformance,
-  UserWatchlist, Achievement, UserAchievement, LeaderboardEntry,
-  MarketSummary, TopMovers, TradeSummary
+  Portfolio, PortfolioHolding, PositionLot, CostBasisMethod, PortfolioSnapshot, Order, Trade, TradingPerformance,
+  UserWatchlist, Achievement, UserAchievement, LeaderboardEntry, LeaderboardPage, MyLeaderboardRank,
+  MarketSummary, TopMovers, TradeSummary, TradeSummaryBreakdown
 } from './tradingApi';
 
 // LLM / AI Tutor
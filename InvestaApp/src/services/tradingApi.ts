@@ -15,7 +15,8 @@ export interface Stock {
 }
 
 export interface StockPrice {
-  id: number;
+  // Not sent by price_history, whose rows are (possibly resampled) bars
+  id?: number;
   stock: number;
   stock_symbol: string;
   stock_name: string;
@@ -25,7 +26,7 @@ export interface StockPrice {
   low_price: number;
   close_price: number;
   volume: number;
-  created_at: string;
+  created_at?: string;
 }
 
 export interface MarketData {
@@ -70,7 +71,9 @@ export interface Portfolio {
   total_value: number;
   total_invested: number;
   total_profit_loss: number;
+  realized_pnl: number;
   cash_balance: number;
+  cost_basis_method: CostBasisMethod;
   created_at: string;
   updated_at: string;
   total_return_percentage: number;
@@ -78,6 +81,15 @@ export interface Portfolio {
   top_holdings: PortfolioHolding[];
 }
 
+export type CostBasisMethod = 'AVERAGE' | 'FIFO' | 'LIFO';
+
+export interface PositionLot {
+  id: number;
+  quantity: number;
+  price: number;
+  acquired_at: string;
+}
+
 export interface PortfolioHolding {
   id: number;
   portfolio: number;
@@ -88,11 +100,48 @@ export interface PortfolioHolding {
   current_price: number;
   market_value: number;
   unrealized_pnl: number;
+  realized_pnl: number;
+  lots: PositionLot[];
   created_at: string;
   updated_at: string;
   return_percentage: number;
 }
 
+export interface StockSearchResult {
+  id: number;
+  symbol: string;
+  name: string;
+  exchange: string;
+  sector: string;
+}
+
+export interface PortfolioSnapshot {
+  date: string;
+  total_value: string;
+  cash_balance: string;
+  total_invested: string;
+  total_profit_loss: string;
+}
+
+export interface ValueAtRisk {
+  percentage: number;
+  amount: number;
+}
+
+export interface PortfolioRisk {
+  lookback_days: number;
+  confidence: number;
+  benchmark: string;
+  as_of?: string;
+  observations?: number;
+  value: number;
+  volatility?: number;
+  beta?: number | null;
+  value_at_risk?: { historical: ValueAtRisk; parametric: ValueAtRisk };
+  holdings: { symbol: string; weight: number; volatility: number; beta: number | null }[];
+  correlation?: (number | null)[][];
+}
+
 export interface Order {
   id: number;
   user: number;
@@ -175,19 +224,32 @@ export interface UserAchievement {
 
 export interface LeaderboardEntry {
   id: number;
+  rank: number | null;
   user: {
     id: number;
     username: string;
-    email: string;
     first_name?: string;
     last_name?: string;
   };
+  timeframe: 'all' | 'monthly' | 'weekly';
+  period_start: string;
   portfolio_value: number;
   portfolio_growth_percentage: number;
+  total_profit_loss: number;
   total_trades: number;
-  successful_trades: number;
-  success_rate: number;
-  rank: number;
+}
+
+export interface LeaderboardPage {
+  timeframe: string;
+  count: number;
+  page: number;
+  page_size: number;
+  results: LeaderboardEntry[];
+}
+
+export interface MyLeaderboardRank extends LeaderboardEntry {
+  count: number;
+  percentile: number | null;
 }
 
 export interface MarketSummary {
@@ -198,6 +260,21 @@ export interface MarketSummary {
   total_volume: number;
 }
 
+// Columnar batch of quotes: every list is aligned with `symbols`
+export interface QuoteColumns {
+  symbols: string[];
+  price: (string | null)[];
+  change: (string | null)[];
+  change_percentage: (string | null)[];
+  volume: (number | null)[];
+  high: (string | null)[];
+  low: (string | null)[];
+  open: (string | null)[];
+  previous_close: (string | null)[];
+  updated_at: (string | null)[];
+  unknown: string[];
+}
+
 export interface TopMovers {
   top_gainers: MarketData[];
   top_losers: MarketData[];
@@ -210,6 +287,49 @@ export interface TradeSummary {
   total_volume: number;
   total_amount: number;
   average_trade_size: number;
+  by_symbol?: (TradeSummaryCounts & { symbol: string })[];
+  by_month?: (TradeSummaryCounts & { month: string })[];
+}
+
+export type TradeSummaryCounts = Omit<TradeSummary, 'by_symbol' | 'by_month'>;
+
+export type TradeSummaryBreakdown = 'symbol' | 'month';
+
+export type BacktestStrategy = 'buy_and_hold' | 'rebalance' | 'sma_crossover' | 'rsi';
+
+export interface BacktestRequest {
+  strategy: BacktestStrategy;
+  symbols: string[];
+  start?: string;
+  end?: string;
+  initial_capital?: number;
+  commission?: number;
+  points?: number;
+  rebalance_days?: number;
+  fast?: number;
+  slow?: number;
+  period?: number;
+  lower?: number;
+  upper?: number;
+}
+
+export interface BacktestResult {
+  strategy: BacktestStrategy;
+  symbols: string[];
+  start: string;
+  end: string;
+  initial_capital: number;
+  commission: number;
+  points: number;
+  params: Record<string, number>;
+  trades: number;
+  final_value: number;
+  total_return: number;
+  cagr: number;
+  volatility: number;
+  sharpe_ratio: number;
+  max_drawdown: number;
+  equity_curve: { date: string; value: number; drawdown: number }[];
 }
 
 // API Response types
@@ -263,6 +383,12 @@ class TradingApiService {
     return response.data?.results ?? [];
   }
 
+  // News feed: `q` full-text search, `cursor` is taken from the previous page's `next`
+  async getNews(params: { q?: string; symbol?: string; source?: string; cursor?: string; page_size?: number } = {}): Promise<{ next: string | null; results: any[] }> {
+    const response = await api.get('/news/', { params });
+    return { next: response.data?.next ?? null, results: response.data?.results ?? [] };
+  }
+
   async getStockRecentTrades(stockId: number, limit: number = 5): Promise<any[]> {
     const response = await api.get(`/stocks/${stockId}/recent_trades/?limit=${limit}`);
     return response.data?.results ?? [];
@@ -294,18 +420,45 @@ class TradingApiService {
     return response.data.holdings;
   }
 
+  async setCostBasisMethod(method: CostBasisMethod): Promise<CostBasisMethod> {
+    const response = await api.post('portfolio/cost_basis/', { method });
+    return response.data.cost_basis_method;
+  }
+
+  async getPortfolioHistory(days: number = 365, points?: number): Promise<PortfolioSnapshot[]> {
+    const query = points ? `&points=${points}` : '';
+    const response = await api.get(`portfolio/history/?days=${days}${query}`);
+    return response.data;
+  }
+
+  async getPortfolioRisk(lookback: number = 252, confidence: number = 0.95, benchmark?: string): Promise<PortfolioRisk> {
+    const query = benchmark ? `&benchmark=${encodeURIComponent(benchmark)}` : '';
+    const response = await api.get(`portfolio/risk/?lookback=${lookback}&confidence=${confidence}${query}`);
+    return response.data;
+  }
+
   // Order endpoints
   async createOrder(orderData: Partial<Order>): Promise<Order> {
     const response = await api.post('orders/', orderData);
     return response.data;
   }
 
+  // Every order, following the keyset pages of order_history; page with getOrderHistoryPage for long lists
   async getOrders(status?: string, side?: string): Promise<Order[]> {
-    const params = new URLSearchParams();
-    if (status) params.append('status', status);
-    if (side) params.append('side', side);
-    
-    const response = await api.get(`orders/order_history/${params.toString() ? '?' + params.toString() : ''}`);
+    const orders: Order[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await this.getOrderHistoryPage({ status, side, cursor, page_size: 100 });
+      orders.push(...page.results);
+      const match = page.next ? page.next.match(/[?&]cursor=([^&]+)/) : null;
+      cursor = match ? decodeURIComponent(match[1]) : undefined;
+    } while (cursor);
+    return orders;
+  }
+
+  // One keyset page of order history, newest first; pass the `cursor` from `next` for the following page
+  async getOrderHistoryPage(params: { status?: string; side?: string; date_from?: string; date_to?: string; cursor?: string; page_size?: number } = {}): Promise<{ next: string | null; results: Order[] }> {
+    const response = await api.get('orders/order_history/', { params });
     return response.data;
   }
 
@@ -320,8 +473,9 @@ class TradingApiService {
     return response.data;
   }
 
-  async getTradeSummary(): Promise<TradeSummary> {
-    const response = await api.get('trades/trade_summary/');
+  async getTradeSummary(breakdown: TradeSummaryBreakdown[] = []): Promise<TradeSummary> {
+    const params = breakdown.length ? { breakdown: breakdown.join(',') } : undefined;
+    const response = await api.get('trades/trade_summary/', { params });
     return response.data;
   }
 
@@ -331,8 +485,13 @@ class TradingApiService {
     return response.data;
   }
 
-  async getLeaderboard(timeframe: string = 'all'): Promise<LeaderboardEntry[]> {
-    const response = await api.get(`trading-performance/leaderboard/?timeframe=${timeframe}`);
+  async getLeaderboard(timeframe: string = 'all', page: number = 1): Promise<LeaderboardEntry[]> {
+    const response = await api.get(`trading-performance/leaderboard/?timeframe=${timeframe}&page=${page}`);
+    return response.data.results;
+  }
+
+  async getMyRank(timeframe: string = 'all'): Promise<MyLeaderboardRank> {
+    const response = await api.get(`trading-performance/my_rank/?timeframe=${timeframe}`);
     return response.data;
   }
 
@@ -342,11 +501,27 @@ class TradingApiService {
     return response.data;
   }
 
+  async getQuotes(symbols: string[]): Promise<QuoteColumns> {
+    const response = await api.get(`market-data/quotes/?symbols=${encodeURIComponent(symbols.join(','))}`);
+    return response.data;
+  }
+
   async getMarketSummary(): Promise<MarketSummary> {
     const response = await api.get('market-data/market_summary/');
     return response.data;
   }
 
+  // Backtest endpoints
+  async getBacktestStrategies(): Promise<Record<BacktestStrategy, Record<string, number>>> {
+    const response = await api.get('backtests/');
+    return response.data.strategies;
+  }
+
+  async runBacktest(request: BacktestRequest): Promise<BacktestResult> {
+    const response = await api.post('backtests/', request);
+    return response.data;
+  }
+
   // Achievement endpoints
   async getMyAchievements(): Promise<UserAchievement[]> {
     const response = await api.get('achievements/my_achievements/');
@@ -363,6 +538,11 @@ class TradingApiService {
     return this.getStocks(query);
   }
 
+  async autocompleteStocks(query: string, limit: number = 10): Promise<StockSearchResult[]> {
+    const response = await api.get(`stocks/search/?q=${encodeURIComponent(query)}&limit=${limit}`);
+    return response.data.results;
+  }
+
   async getStocksByCategory(category: string): Promise<Stock[]> {
     // This would map to backend filtering
     const stocks = await this.getStocks();
@@ -0,0 +1,41 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Portfolio
+from api.services.snapshots import BACKFILL_CHUNK_SIZE, backfill_snapshots
+
+
+class Command(BaseCommand):
+    help = "Reconstruct daily PortfolioSnapshot history from trades and daily closes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help="Only backfill these users (default: all portfolios)")
+        parser.add_argument('--start', help="First date as YYYY-MM-DD (default: each portfolio's first trade)")
+        parser.add_argument('--end', help="Last date as YYYY-MM-DD (default: today)")
+        parser.add_argument('--chunk-size', type=int, default=BACKFILL_CHUNK_SIZE,
+                            help=f"Portfolios replayed together (default: {BACKFILL_CHUNK_SIZE})")
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        portfolio_ids = None
+        if options['usernames']:
+            portfolios = dict(
+                Portfolio.objects.filter(user__username__in=options['usernames'])
+                .values_list('user__username', 'pk')
+            )
+            unknown = set(options['usernames']) - set(portfolios)
+            if unknown:
+                raise CommandError(f"No portfolio for: {', '.join(sorted(unknown))}")
+            portfolio_ids = list(portfolios.values())
+
+        started = time.perf_counter()
+        written = backfill_snapshots(portfolio_ids, start, end, options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} portfolio snapshots in {elapsed:.2f}s"))
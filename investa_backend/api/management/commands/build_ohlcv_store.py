@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Stock
+from api.services.ohlcv_store import ohlcv_store
+
+
+class Command(BaseCommand):
+    help = "Build the columnar OHLCV store from StockPrice history"
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Symbols to build (default: all active stocks)")
+
+    def handle(self, *args, **options):
+        stocks = Stock.objects.filter(is_active=True).order_by('symbol')
+        if options['symbols']:
+            symbols = [symbol.upper() for symbol in options['symbols']]
+            stocks = stocks.filter(symbol__in=symbols)
+            unknown = set(symbols) - set(stocks.values_list('symbol', flat=True))
+            if unknown:
+                raise CommandError(f"Unknown symbols: {', '.join(sorted(unknown))}")
+
+        total = 0
+        for stock in stocks:
+            count = ohlcv_store.build(stock)
+            total += count
+            self.stdout.write(f"{stock.symbol}: {count} bars")
+        self.stdout.write(self.style.SUCCESS(
+            f"OHLCV store built for {stocks.count()} stocks ({total} bars) in {ohlcv_store.root}"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Stock
+from api.services.rolling_stats import rebuild_rolling_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild StockRollingStats (52W high/low, moving averages) from price history"
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Symbols to rebuild (default: all active stocks)")
+
+    def handle(self, *args, **options):
+        stocks = Stock.objects.filter(is_active=True).order_by('symbol')
+        if options['symbols']:
+            symbols = [symbol.upper() for symbol in options['symbols']]
+            stocks = stocks.filter(symbol__in=symbols)
+            unknown = set(symbols) - set(stocks.values_list('symbol', flat=True))
+            if unknown:
+                raise CommandError(f"Unknown symbols: {', '.join(sorted(unknown))}")
+
+        built = 0
+        for stock in stocks:
+            if rebuild_rolling_stats(stock) is not None:
+                built += 1
+        self.stdout.write(self.style.SUCCESS(f"Rolling stats rebuilt for {built} stocks"))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Stock
+from api.services.indicators import DEFAULT_LOOKBACK, refresh_indicators
+
+
+class Command(BaseCommand):
+    help = "Compute RSI, MACD, SMA/EMA, Bollinger Bands and ATR for all stocks and upsert TechnicalIndicator"
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Symbols to compute (default: all active stocks)")
+        parser.add_argument('--lookback', type=int, default=DEFAULT_LOOKBACK,
+                            help=f"Bars loaded per symbol (default: {DEFAULT_LOOKBACK})")
+
+    def handle(self, *args, **options):
+        stocks = Stock.objects.filter(is_active=True)
+        if options['symbols']:
+            symbols = [symbol.upper() for symbol in options['symbols']]
+            stocks = stocks.filter(symbol__in=symbols)
+            unknown = set(symbols) - set(stocks.values_list('symbol', flat=True))
+            if unknown:
+                raise CommandError(f"Unknown symbols: {', '.join(sorted(unknown))}")
+
+        started = time.perf_counter()
+        written = refresh_indicators(list(stocks.values_list('pk', flat=True)), options['lookback'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Upserted {written} technical indicators in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.ingestion import DEFAULT_CHUNK_SIZE, IngestReport, Ingestor
+
+
+class Command(BaseCommand):
+    help = "Bulk-load end-of-day prices, quotes or index values from CSV/Parquet files, or news from JSONL/RSS"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help="CSV, Parquet, JSONL or RSS files to ingest")
+        parser.add_argument('--kind', choices=Ingestor.kinds, default='prices',
+                            help="prices -> StockPrice, quotes -> MarketData, indices -> MarketIndex, news -> StockNews")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help=f"Rows per batch (default: {DEFAULT_CHUNK_SIZE})")
+        parser.add_argument('--no-refresh', action='store_true',
+                            help="Skip refreshing the OHLCV store, rolling stats, indicators, quote cache and holding valuations")
+
+    def handle(self, *args, **options):
+        ingestor = Ingestor(options['kind'], options['chunk_size'], refresh=not options['no_refresh'])
+        report = IngestReport(options['kind'])
+        for path in options['files']:
+            try:
+                ingestor.ingest_file(path, report)
+            except (OSError, ImportError, ValueError) as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(f"{path}: {report.rows} rows so far")
+
+        if report.unknown_symbols:
+            self.stdout.write(self.style.WARNING(
+                f"Skipped unknown symbols: {', '.join(sorted(map(str, report.unknown_symbols)))}"
+            ))
+        skipped = f"{report.skipped} skipped"
+        if report.kind == 'news':
+            skipped += f", {report.duplicates} duplicates, {report.links} stock links"
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {report.rows} {report.kind} rows in {report.batches} batches "
+            f"({skipped}) in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+        ))
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.leaderboard import TIMEFRAMES, rebuild_leaderboard, rerank
+
+
+class Command(BaseCommand):
+    help = "Rebuild the leaderboard snapshot from portfolios and trades, or just refresh its ranks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timeframe', action='append', choices=TIMEFRAMES,
+                            help="Timeframe to rebuild; repeatable (default: all timeframes)")
+        parser.add_argument('--rerank-only', action='store_true',
+                            help="Only roll over finished periods and renumber ranks")
+        parser.add_argument('--loop', action='store_true',
+                            help="With --rerank-only, keep reranking every LEADERBOARD_RERANK_INTERVAL seconds")
+
+    def handle(self, *args, **options):
+        timeframes = options['timeframe'] or TIMEFRAMES
+        if options['loop']:
+            interval = settings.LEADERBOARD_RERANK_INTERVAL
+            if not options['rerank_only'] or interval <= 0:
+                raise CommandError("--loop needs --rerank-only and a positive LEADERBOARD_RERANK_INTERVAL")
+            while True:
+                started = time.monotonic()
+                self._rerank(timeframes)
+                time.sleep(max(interval - (time.monotonic() - started), 0))
+        started = time.perf_counter()
+        if options['rerank_only']:
+            self._rerank(timeframes)
+            return
+        written = rebuild_leaderboard(timeframes)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} leaderboard entries ({', '.join(timeframes)}) in {elapsed:.2f}s"
+        ))
+
+    def _rerank(self, timeframes):
+        started = time.perf_counter()
+        moved = sum(rerank(timeframe) for timeframe in timeframes)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Reranked {', '.join(timeframes)} ({moved} ranks moved) in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.performance import REBUILD_CHUNK_SIZE, rebuild_performance
+from api.services.trade_stats import rebuild_trade_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute TradingPerformance and UserTradeStats statistics from the trade log and report any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help="Only rebuild these users (default: everyone)")
+        parser.add_argument('--check', action='store_true',
+                            help="Only verify; exit with an error if any stored statistics drifted")
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE,
+                            help=f"Users per grouped query (default: {REBUILD_CHUNK_SIZE})")
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['usernames']:
+            users = dict(User.objects.filter(username__in=options['usernames']).values_list('username', 'pk'))
+            unknown = set(options['usernames']) - set(users)
+            if unknown:
+                raise CommandError(f"Unknown users: {', '.join(sorted(unknown))}")
+            user_ids = list(users.values())
+
+        fix = not options['check']
+        report = rebuild_performance(user_ids, options['chunk_size'], fix=fix)
+        if report.realized_filled:
+            self.stdout.write(f"Replayed realized P&L for {report.realized_filled} older SELL trades")
+        self.report_drift(report.drifted)
+        stats = rebuild_trade_stats(user_ids, options['chunk_size'], fix=fix)
+        self.report_drift(stats.drifted)
+
+        drifted = set(report.drifted) | set(stats.drifted)
+        summary = f"Checked {report.users} users, {len(drifted)} drifted"
+        if options['check'] and drifted:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary + ("" if options['check'] else ", rebuilt")))
+
+    def report_drift(self, drifted):
+        names = dict(User.objects.filter(pk__in=list(drifted)[:20]).values_list('pk', 'username'))
+        for user_id, differences in list(drifted.items())[:20]:
+            changes = ', '.join(f"{field} {stored} -> {value}" for field, (stored, value) in differences.items())
+            self.stdout.write(f"  {names.get(user_id, user_id)}: {changes}")
+        if len(drifted) > 20:
+            self.stdout.write(f"  ... and {len(drifted) - 20} more")
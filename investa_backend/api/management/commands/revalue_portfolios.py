@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Stock
+from api.services.revaluation import REVALUE_CHUNK_SIZE, revalue_holdings
+
+
+class Command(BaseCommand):
+    help = "Mark every portfolio holding to its latest MarketData price and refresh portfolio totals"
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Only revalue holdings of these symbols (default: all)")
+        parser.add_argument('--chunk-size', type=int, default=REVALUE_CHUNK_SIZE,
+                            help=f"Holdings per batch (default: {REVALUE_CHUNK_SIZE})")
+
+    def handle(self, *args, **options):
+        stock_ids = None
+        if options['symbols']:
+            symbols = [symbol.upper() for symbol in options['symbols']]
+            stocks = dict(Stock.objects.filter(symbol__in=symbols).values_list('symbol', 'pk'))
+            unknown = set(symbols) - set(stocks)
+            if unknown:
+                raise CommandError(f"Unknown symbols: {', '.join(sorted(unknown))}")
+            stock_ids = list(stocks.values())
+
+        report = revalue_holdings(stock_ids, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Revalued {report.holdings} holdings ({report.updated} changed, {report.portfolios} portfolios) "
+            f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+        ))
@@ -0,0 +1,30 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.revaluation import revalue_holdings
+from api.services.snapshots import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Nightly job: revalue holdings, then store every portfolio's end-of-day snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Snapshot date as YYYY-MM-DD (default: today)")
+        parser.add_argument('--no-revalue', action='store_true',
+                            help="Snapshot the stored totals without marking holdings to market first")
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        started = time.perf_counter()
+        if not options['no_revalue']:
+            report = revalue_holdings()
+            self.stdout.write(f"Revalued {report.holdings} holdings ({report.rows_per_second:,.0f} rows/s)")
+        written = take_snapshots(day)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Stored {written} portfolio snapshots in {elapsed:.2f}s"))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_ai_settings_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockRollingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('high_52w', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('low_52w', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('sma_20', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('sma_50', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('sma_200', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('avg_volume', models.BigIntegerField(blank=True, null=True)),
+                ('window_state', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rolling_stats', to='api.stock')),
+            ],
+            options={
+                'verbose_name_plural': 'Stock rolling stats',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_stockrollingstats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockprice',
+            name='stock',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='api.stock'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_stockprice_drop_stock_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeframe', models.CharField(choices=[('all', 'All Time'), ('monthly', 'This Month'), ('weekly', 'This Week')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('start_value', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('portfolio_value', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('portfolio_growth_percentage', models.DecimalField(decimal_places=2, default=0.0, max_digits=9)),
+                ('total_trades', models.IntegerField(default=0)),
+                ('rank', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Leaderboard entries',
+                'indexes': [models.Index(fields=['timeframe', 'rank'], name='api_leaderb_timefra_3bfa37_idx'), models.Index(fields=['timeframe', '-portfolio_growth_percentage', 'user'], name='api_leaderb_timefra_e63667_idx')],
+                'unique_together': {('timeframe', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_value', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('cash_balance', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('total_invested', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('total_profit_loss', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='api.portfolio')),
+            ],
+            options={
+                'unique_together': {('portfolio', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_portfoliosnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trade',
+            name='realized_pnl',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='tradingperformance',
+            name='total_trade_value',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=15),
+        ),
+    ]
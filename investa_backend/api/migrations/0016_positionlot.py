@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:18
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def open_lots(apps, schema_editor):
+    """Give every existing holding one lot at its average price"""
+    PortfolioHolding = apps.get_model('api', 'PortfolioHolding')
+    PositionLot = apps.get_model('api', 'PositionLot')
+    PositionLot.objects.bulk_create(
+        (
+            PositionLot(holding_id=pk, quantity=quantity, price=price, acquired_at=created_at)
+            for pk, quantity, price, created_at in PortfolioHolding.objects.filter(quantity__gt=0)
+            .values_list('pk', 'quantity', 'average_price', 'created_at').iterator()
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_trade_realized_pnl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolio',
+            name='cost_basis_method',
+            field=models.CharField(choices=[('AVERAGE', 'Average Cost'), ('FIFO', 'First In, First Out'), ('LIFO', 'Last In, First Out')], default='AVERAGE', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='realized_pnl',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='portfolioholding',
+            name='realized_pnl',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=15),
+        ),
+        migrations.CreateModel(
+            name='PositionLot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('acquired_at', models.DateTimeField()),
+                ('holding', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lots', to='api.portfolioholding')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['holding', 'acquired_at', 'id'], name='api_positio_holding_320ae7_idx')],
+            },
+        ),
+        migrations.RunPython(open_lots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_positionlot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketIndexValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('value', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('index', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='api.marketindex')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('index', 'date')},
+            },
+        ),
+    ]
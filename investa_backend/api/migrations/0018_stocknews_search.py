@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# SQLite: an external-content FTS5 table over StockNews kept in step by triggers.
+# Any later migration that rebuilds api_stocknews on SQLite must recreate them.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE api_stocknews_fts USING fts5("
+    "title, summary, content='api_stocknews', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER api_stocknews_fts_insert AFTER INSERT ON api_stocknews BEGIN "
+    "INSERT INTO api_stocknews_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary); END",
+    "CREATE TRIGGER api_stocknews_fts_delete AFTER DELETE ON api_stocknews BEGIN "
+    "INSERT INTO api_stocknews_fts (api_stocknews_fts, rowid, title, summary) "
+    "VALUES ('delete', old.id, old.title, old.summary); END",
+    "CREATE TRIGGER api_stocknews_fts_update AFTER UPDATE OF title, summary ON api_stocknews BEGIN "
+    "INSERT INTO api_stocknews_fts (api_stocknews_fts, rowid, title, summary) "
+    "VALUES ('delete', old.id, old.title, old.summary); "
+    "INSERT INTO api_stocknews_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary); END",
+    "INSERT INTO api_stocknews_fts (api_stocknews_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS api_stocknews_fts_insert",
+    "DROP TRIGGER IF EXISTS api_stocknews_fts_delete",
+    "DROP TRIGGER IF EXISTS api_stocknews_fts_update",
+    "DROP TABLE IF EXISTS api_stocknews_fts",
+]
+# PostgreSQL: a GIN index on the expression api.services.news searches with
+POSTGRES_FORWARD = [
+    "CREATE INDEX api_stocknews_search_idx ON api_stocknews USING GIN "
+    "(to_tsvector('english', title || ' ' || summary))",
+]
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS api_stocknews_search_idx"]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+    return run
+
+
+create_search_index = _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD})
+drop_search_index = _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_marketindexvalue'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='stocknews',
+            options={'ordering': ['-published_at', '-id'], 'verbose_name_plural': 'Stock news'},
+        ),
+        migrations.AlterField(
+            model_name='stocknews',
+            name='stock',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='news', to='api.stock'),
+        ),
+        migrations.AddIndex(
+            model_name='stocknews',
+            index=models.Index(fields=['published_at', 'id'], name='api_stockne_publish_514945_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stocknews',
+            index=models.Index(fields=['stock', 'published_at', 'id'], name='api_stockne_stock_i_d04040_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.5 on 2026-10-18 07:10
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Making content_hash unique rebuilds api_stocknews on SQLite, which drops the
+# FTS5 triggers from migration 0018; the index itself is keyed by id and survives
+SQLITE_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS api_stocknews_fts_insert AFTER INSERT ON api_stocknews BEGIN "
+    "INSERT INTO api_stocknews_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS api_stocknews_fts_delete AFTER DELETE ON api_stocknews BEGIN "
+    "INSERT INTO api_stocknews_fts (api_stocknews_fts, rowid, title, summary) "
+    "VALUES ('delete', old.id, old.title, old.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS api_stocknews_fts_update AFTER UPDATE OF title, summary ON api_stocknews BEGIN "
+    "INSERT INTO api_stocknews_fts (api_stocknews_fts, rowid, title, summary) "
+    "VALUES ('delete', old.id, old.title, old.summary); "
+    "INSERT INTO api_stocknews_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary); END",
+    "INSERT INTO api_stocknews_fts (api_stocknews_fts) VALUES ('rebuild')",
+]
+
+
+def _hash_content(title, summary):
+    # Frozen copy of StockNews.hash_content
+    text = '\n'.join(' '.join(str(part or '').split()).casefold() for part in (title, summary))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def merge_duplicate_stories(apps, schema_editor):
+    """Hash every story, keep the oldest copy of each and link it to all the copies' stocks"""
+    StockNews = apps.get_model('api', 'StockNews')
+    Link = StockNews.stocks.through
+    kept, links, duplicates = {}, set(), []
+    for pk, stock_id, title, summary in (
+        StockNews.objects.order_by('pk').values_list('pk', 'stock_id', 'title', 'summary').iterator()
+    ):
+        content_hash = _hash_content(title, summary)
+        if content_hash in kept:
+            duplicates.append(pk)
+        else:
+            kept[content_hash] = pk
+            StockNews.objects.filter(pk=pk).update(content_hash=content_hash)
+        links.add((kept[content_hash], stock_id))
+    StockNews.objects.filter(pk__in=duplicates).delete()
+    Link.objects.bulk_create([Link(stocknews_id=news_id, stock_id=stock_id) for news_id, stock_id in links])
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_stocknews_search'),
+    ]
+
+    operations = [
+        # Reversed last, after the table rebuilds undoing this migration
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.RemoveIndex(
+            model_name='stocknews',
+            name='api_stockne_stock_i_d04040_idx',
+        ),
+        migrations.AlterField(
+            model_name='stocknews',
+            name='stock',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='news', to='api.stock'),
+        ),
+        migrations.AddField(
+            model_name='stocknews',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=40, null=True),
+        ),
+        migrations.AddField(
+            model_name='stocknews',
+            name='stocks',
+            field=models.ManyToManyField(blank=True, related_name='linked_news', to='api.stock'),
+        ),
+        migrations.RunPython(merge_duplicate_stories, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='stocknews',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=40, unique=True),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def count_trades(apps, schema_editor):
+    """Materialize the stats of every existing trade: overall, per symbol and per month"""
+    Trade = apps.get_model('api', 'Trade')
+    UserTradeStats = apps.get_model('api', 'UserTradeStats')
+    counters = {
+        'total_trades': Count('pk'),
+        'buy_trades': Count('pk', filter=Q(side='BUY')),
+        'sell_trades': Count('pk', filter=Q(side='SELL')),
+        'total_volume': Sum('quantity', default=0),
+        'total_amount': Sum('total_amount', default=0),
+    }
+    groupings = [
+        ('total', Trade.objects.values('user_id', group=F('user_id'))),
+        ('symbol', Trade.objects.values('user_id', group=F('stock__symbol'))),
+        ('month', Trade.objects.annotate(group=TruncMonth('executed_at')).values('user_id', 'group')),
+    ]
+    for dimension, rows in groupings:
+        stats = []
+        for row in rows.annotate(**counters).iterator():
+            group = row.pop('group')
+            if dimension == 'total':
+                bucket = ''
+            else:
+                bucket = group.strftime('%Y-%m') if dimension == 'month' else group
+            stats.append(UserTradeStats(dimension=dimension, bucket=bucket, **row))
+        UserTradeStats.objects.bulk_create(stats, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_stocknews_dedup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTradeStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'All trades'), ('symbol', 'By symbol'), ('month', 'By month')], max_length=6)),
+                ('bucket', models.CharField(blank=True, max_length=10)),
+                ('total_trades', models.IntegerField(default=0)),
+                ('buy_trades', models.IntegerField(default=0)),
+                ('sell_trades', models.IntegerField(default=0)),
+                ('total_volume', models.BigIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trade_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'User trade stats',
+                'unique_together': {('user', 'dimension', 'bucket')},
+            },
+        ),
+        migrations.RunPython(count_trades, migrations.RunPython.noop),
+    ]
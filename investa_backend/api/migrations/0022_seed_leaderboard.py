@@ -0,0 +1,64 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count
+from django.utils import timezone
+
+
+def seed_leaderboard(apps, schema_editor):
+    """Create and rank entries of every portfolio for each timeframe, as rebuild_leaderboard would.
+
+    Portfolios predating LeaderboardEntry only got entries on their next
+    fill, so the leaderboard was empty right after 0013. Existing entries
+    are kept; weekly and monthly periods start from the current value.
+    """
+    Portfolio = apps.get_model('api', 'Portfolio')
+    Trade = apps.get_model('api', 'Trade')
+    LeaderboardEntry = apps.get_model('api', 'LeaderboardEntry')
+    today = timezone.localdate()
+    starts = {
+        'all': date(2000, 1, 1),
+        'monthly': today.replace(day=1),
+        'weekly': today - timedelta(days=today.weekday()),
+    }
+    values = [
+        (user_id, cash if not invested else total)
+        for user_id, cash, invested, total in
+        Portfolio.objects.values_list('user_id', 'cash_balance', 'total_invested', 'total_value').iterator()
+    ]
+    now = timezone.now()
+    for timeframe, start in starts.items():
+        trades = Trade.objects.all()
+        if timeframe != 'all':
+            trades = trades.filter(executed_at__gte=timezone.make_aware(datetime.combine(start, datetime.min.time())))
+        trade_counts = dict(trades.values('user_id').annotate(count=Count('pk')).values_list('user_id', 'count'))
+        entries = []
+        for user_id, value in values:
+            start_value = Decimal('10000.00') if timeframe == 'all' else value
+            growth = ((value - start_value) / start_value * 100).quantize(Decimal('0.01')) if start_value else 0
+            entries.append(LeaderboardEntry(
+                timeframe=timeframe, user_id=user_id, period_start=start, start_value=start_value,
+                portfolio_value=value, portfolio_growth_percentage=growth,
+                total_trades=trade_counts.get(user_id, 0), updated_at=now,
+            ))
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=2000, ignore_conflicts=True)
+
+        ranked = LeaderboardEntry.objects.filter(timeframe=timeframe).order_by('-portfolio_growth_percentage', 'user_id')
+        entries = []
+        for position, entry in enumerate(ranked.only('id', 'rank').iterator(), start=1):
+            if entry.rank != position:
+                entry.rank = position
+                entries.append(entry)
+        LeaderboardEntry.objects.bulk_update(entries, ['rank'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_order_history_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_leaderboard, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_seed_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='triggered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -7,8 +7,8 @@ from .learning import (
     Quiz, Question, Answer, UserQuizAttempt, UserQuizAnswer
 )
 from .trading import (
-    Stock, StockPrice, StockNews, MarketIndex, UserWatchlist, Portfolio, PortfolioHolding,
-    Order, Trade, TradingPerformance, TradingSession, MarketData,
+    Stock, StockPrice, StockRollingStats, StockNews, MarketIndex, MarketIndexValue, UserWatchlist, Portfolio, PortfolioHolding, PositionLot, PortfolioSnapshot,
+    Order, Trade, TradingPerformance, UserTradeStats, LeaderboardEntry, TradingSession, MarketData,
     TechnicalIndicator, Achievement, UserAchievement
 )
 from .notifications import Notification
@@ -31,8 +31,8 @@ __all__ = [
     'Quiz', 'Question', 'Answer', 'UserQuizAttempt', 'UserQuizAnswer',
     
     # Trading models
-    'Stock', 'StockPrice', 'StockNews', 'MarketIndex', 'UserWatchlist', 'Portfolio', 'PortfolioHolding',
-    'Order', 'Trade', 'TradingPerformance', 'TradingSession', 'MarketData',
+    'Stock', 'StockPrice', 'StockRollingStats', 'StockNews', 'MarketIndex', 'MarketIndexValue', 'UserWatchlist', 'Portfolio', 'PortfolioHolding', 'PositionLot', 'PortfolioSnapshot',
+    'Order', 'Trade', 'TradingPerformance', 'UserTradeStats', 'LeaderboardEntry', 'TradingSession', 'MarketData',
     'TechnicalIndicator', 'Achievement', 'UserAchievement',
     
     # Notification models
@@ -1,3 +1,5 @@
+import hashlib
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -27,18 +29,39 @@ class Stock(models.Model):
 
 
 class StockNews(models.Model):
-    """Stock-specific news and announcements"""
-    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='news')
+    """Stock news and announcements, stored once per story"""
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='news')  # Primary stock
+    # Every stock the story mentions, the primary one included
+    stocks = models.ManyToManyField(Stock, related_name='linked_news', blank=True)
     title = models.CharField(max_length=300)
     source = models.CharField(max_length=100)
     summary = models.TextField(blank=True)
     url = models.URLField(blank=True)
     published_at = models.DateTimeField()
+    content_hash = models.CharField(max_length=40, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-published_at']
+        ordering = ['-published_at', '-id']
         verbose_name_plural = 'Stock news'
+        # Keyset pages of the feed; title and summary are also full-text
+        # indexed (see migrations 0018 and 0019)
+        indexes = [
+            models.Index(fields=['published_at', 'id']),
+        ]
+
+    @staticmethod
+    def hash_content(title, summary):
+        """Identity of a story: sha1 of its case- and whitespace-normalized title and summary"""
+        text = '\n'.join(' '.join(str(part or '').split()).casefold() for part in (title, summary))
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        """Override save to fill content_hash and link the primary stock"""
+        if not self.content_hash:
+            self.content_hash = self.hash_content(self.title, self.summary)
+        super().save(*args, **kwargs)
+        self.stocks.add(self.stock_id)
 
     def __str__(self):
         return f"{self.stock.symbol} - {self.title[:50]}"
@@ -60,9 +83,24 @@ class MarketIndex(models.Model):
         return f"{self.name} - {self.value}"
 
 
+class MarketIndexValue(models.Model):
+    """Daily closing values of a market index, the benchmark for portfolio beta"""
+    index = models.ForeignKey(MarketIndex, on_delete=models.CASCADE, related_name='history')
+    date = models.DateField()
+    value = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        unique_together = ['index', 'date']
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.index.name} - {self.date}: {self.value}"
+
+
 class StockPrice(models.Model):
     """Historical stock prices"""
-    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='prices')
+    # The (stock, date) unique index already serves stock lookups
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='prices', db_index=False)
     date = models.DateField()
     open_price = models.DecimalField(max_digits=10, decimal_places=2)
     high_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -79,6 +117,26 @@ class StockPrice(models.Model):
         return f"{self.stock.symbol} - {self.date} - ₹{self.close_price}"
 
 
+class StockRollingStats(models.Model):
+    """Rolling price statistics maintained incrementally as daily bars arrive"""
+    stock = models.OneToOneField(Stock, on_delete=models.CASCADE, related_name='rolling_stats')
+    as_of = models.DateField()
+    high_52w = models.DecimalField(max_digits=10, decimal_places=2)
+    low_52w = models.DecimalField(max_digits=10, decimal_places=2)
+    sma_20 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    sma_50 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    sma_200 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    avg_volume = models.BigIntegerField(null=True, blank=True)  # 20-day average
+    window_state = models.JSONField(default=dict)  # Deques needed for the next update
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Stock rolling stats'
+
+    def __str__(self):
+        return f"{self.stock.symbol} - stats as of {self.as_of}"
+
+
 class UserWatchlist(models.Model):
     """User's stock watchlist"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='watchlist')
@@ -94,11 +152,19 @@ class UserWatchlist(models.Model):
 
 class Portfolio(models.Model):
     """User's investment portfolio"""
+    COST_BASIS_METHODS = [
+        ('AVERAGE', 'Average Cost'),
+        ('FIFO', 'First In, First Out'),
+        ('LIFO', 'Last In, First Out'),
+    ]
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='portfolio')
     total_value = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     total_invested = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     total_profit_loss = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    realized_pnl = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)  # Including closed positions
     cash_balance = models.DecimalField(max_digits=15, decimal_places=2, default=10000.00)  # Starting cash
+    cost_basis_method = models.CharField(max_length=10, choices=COST_BASIS_METHODS, default='AVERAGE')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -122,6 +188,7 @@ class PortfolioHolding(models.Model):
     current_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     market_value = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     unrealized_pnl = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    realized_pnl = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -135,6 +202,43 @@ class PortfolioHolding(models.Model):
         return f"{self.portfolio.user.username} - {self.stock.symbol} ({self.quantity} shares)"
 
 
+class PositionLot(models.Model):
+    """Open shares of a holding bought in one fill, consumed by later sells"""
+    holding = models.ForeignKey(PortfolioHolding, on_delete=models.CASCADE, related_name='lots')
+    quantity = models.IntegerField(validators=[MinValueValidator(1)])  # Shares still open
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    acquired_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Lots are always read per holding in acquisition order
+            models.Index(fields=['holding', 'acquired_at', 'id']),
+        ]
+
+    @property
+    def cost(self):
+        return self.quantity * self.price
+
+    def __str__(self):
+        return f"{self.holding} lot: {self.quantity} @ ₹{self.price}"
+
+
+class PortfolioSnapshot(models.Model):
+    """End-of-day portfolio totals, one row per portfolio and day"""
+    portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='snapshots')
+    date = models.DateField()
+    total_value = models.DecimalField(max_digits=15, decimal_places=2)
+    cash_balance = models.DecimalField(max_digits=15, decimal_places=2)
+    total_invested = models.DecimalField(max_digits=15, decimal_places=2)
+    total_profit_loss = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        unique_together = ['portfolio', 'date']  # Also the index history reads use
+
+    def __str__(self):
+        return f"{self.portfolio.user.username} - {self.date}: ₹{self.total_value}"
+
+
 class Order(models.Model):
     """Trading orders"""
     ORDER_TYPES = [
@@ -173,7 +277,16 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     filled_at = models.DateTimeField(null=True, blank=True)
-    
+    triggered_at = models.DateTimeField(null=True, blank=True)  # STOP_LIMIT whose stop was hit, resting as a limit
+
+    class Meta:
+        # Keyset pages of a user's order history, unfiltered or by status or side
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id']),
+            models.Index(fields=['user', 'status', 'created_at', 'id']),
+            models.Index(fields=['user', 'side', 'created_at', 'id']),
+        ]
+
     @property
     def is_completed(self):
         return self.status in ['FILLED', 'CANCELLED', 'REJECTED']
@@ -217,6 +330,7 @@ class Trade(models.Model):
     total_amount = models.DecimalField(max_digits=15, decimal_places=2)
     commission = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     net_amount = models.DecimalField(max_digits=15, decimal_places=2)
+    realized_pnl = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)  # SELL proceeds less the cost basis sold
     executed_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -235,6 +349,7 @@ class TradingPerformance(models.Model):
     worst_trade_loss = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     total_commission_paid = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     average_trade_size = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    total_trade_value = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)  # Running sum behind average_trade_size
     largest_position = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -255,6 +370,68 @@ class TradingPerformance(models.Model):
         return f"{self.user.username}'s Trading Performance"
 
 
+class UserTradeStats(models.Model):
+    """Running trade counters of a user: overall, per symbol and per calendar month"""
+    TOTAL, SYMBOL, MONTH = 'total', 'symbol', 'month'
+    DIMENSIONS = [
+        (TOTAL, 'All trades'),
+        (SYMBOL, 'By symbol'),
+        (MONTH, 'By month'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trade_stats')
+    dimension = models.CharField(max_length=6, choices=DIMENSIONS)
+    bucket = models.CharField(max_length=10, blank=True)  # '' for the total, the stock symbol or YYYY-MM
+    total_trades = models.IntegerField(default=0)
+    buy_trades = models.IntegerField(default=0)
+    sell_trades = models.IntegerField(default=0)
+    total_volume = models.BigIntegerField(default=0)  # Shares traded
+    total_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'dimension', 'bucket']
+        verbose_name_plural = 'User trade stats'
+
+    def __str__(self):
+        return f"{self.user.username} - {self.dimension} {self.bucket}".rstrip()
+
+
+class LeaderboardEntry(models.Model):
+    """Materialized leaderboard standing of a user for one timeframe"""
+    TIMEFRAMES = [
+        ('all', 'All Time'),
+        ('monthly', 'This Month'),
+        ('weekly', 'This Week'),
+    ]
+
+    timeframe = models.CharField(max_length=10, choices=TIMEFRAMES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    period_start = models.DateField()
+    start_value = models.DecimalField(max_digits=15, decimal_places=2)  # Portfolio value when the period began
+    portfolio_value = models.DecimalField(max_digits=15, decimal_places=2)
+    portfolio_growth_percentage = models.DecimalField(max_digits=9, decimal_places=2, default=0.00)
+    total_trades = models.IntegerField(default=0)  # Trades within the period
+    rank = models.IntegerField(null=True, blank=True)  # Refreshed in bulk; null until first ranked
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['timeframe', 'user']
+        indexes = [
+            models.Index(fields=['timeframe', 'rank']),
+            # Lets the rerank read entries already in rank order
+            models.Index(fields=['timeframe', '-portfolio_growth_percentage', 'user']),
+        ]
+        verbose_name_plural = 'Leaderboard entries'
+
+    @property
+    def total_profit_loss(self):
+        return self.portfolio_value - self.start_value
+
+    def __str__(self):
+        return f"{self.user.username} - {self.timeframe} #{self.rank}"
+
+
 class TradingSession(models.Model):
     """Track user's trading sessions for performance analysis"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trading_sessions')
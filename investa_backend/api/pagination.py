@@ -0,0 +1,102 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Forward cursor pagination on a unique ``(field, id)`` sort key.
+
+    The cursor carries the last row's key and the next page is the rows past
+    it, ``field <= value AND (field < value OR id < pk)`` for descending
+    order: one range read on a ``(field, id)`` index, with no COUNT(*) and no
+    OFFSET however deep the client pages. Subclasses set ``ordering``.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_page_size(request)
+        (field, descending), (tiebreak, _) = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+        model_field = queryset.model._meta.get_field(field)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            try:
+                value, pk = model_field.to_python(cursor[0]), int(cursor[1])
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            before, after = ('lt', 'lte') if descending else ('gt', 'gte')
+            queryset = queryset.filter(
+                Q(**{f'{field}__{after}': value}),
+                Q(**{f'{field}__{before}': value}) | Q(**{f'{tiebreak}__{before}': pk}),
+            )
+
+        rows = list(queryset[:self.limit + 1])
+        self.next_key = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            self.next_key = [model_field.value_to_string(last), getattr(last, tiebreak)]
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(cursor, list) or len(cursor) != 2:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, key):
+        encoded = base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.next_key) if self.next_key is not None else None
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class NewsCursorPagination(KeysetPagination):
+    """Newest news first"""
+    ordering = ('-published_at', '-id')
+
+
+class OrderHistoryPagination(KeysetPagination):
+    """Newest orders first"""
+    ordering = ('-created_at', '-id')
@@ -259,7 +259,7 @@ def create_user_watchlists(users, stocks):
 
 def create_portfolio_holdings(portfolios, stocks):
     """Create portfolio holdings"""
-    from api.models import PortfolioHolding
+    from api.models import PortfolioHolding, PositionLot
     
     holdings_created = 0
     created_holdings = []
@@ -295,6 +295,9 @@ def create_portfolio_holdings(portfolios, stocks):
             )
             
             if created:
+                PositionLot.objects.create(
+                    holding=holding, quantity=quantity, price=average_price, acquired_at=holding.created_at
+                )
                 holdings_created += 1
                 created_holdings.append(holding)
                 print(f"   ✅ Created holding for {portfolio.user.username}: {stock.symbol} ({quantity} shares @ ₹{current_price})")
@@ -701,15 +704,17 @@ def create_stock_news(stocks):
         for item in news_items:
             published_at = now - timedelta(days=item.get('days_ago', 1))
             news_obj, created = StockNews.objects.get_or_create(
-                stock=stock,
-                title=item['title'],
+                content_hash=StockNews.hash_content(item['title'], item.get('summary', '')),
                 defaults={
+                    'stock': stock,
+                    'title': item['title'],
                     'source': item['source'],
                     'summary': item.get('summary', ''),
                     'url': item.get('url', ''),
                     'published_at': published_at,
                 }
             )
+            news_obj.stocks.add(stock)
             if created:
                 news_created += 1
                 created_news.append(news_obj)
@@ -744,4 +749,25 @@ def create_market_indices():
             print(f"   📈 Created index: {index.name} = {index.value}")
 
     print(f"   📊 Created {indices_created} market indices")
+    create_market_index_history(created_indices)
     return created_indices
+
+
+def create_market_index_history(indices):
+    """Create 90 days of closing values per index, ending at its current value"""
+    from api.models import MarketIndexValue
+    import random
+
+    values_created = 0
+    for index in indices:
+        # Walk backwards from today's value with the same -2% to +2% daily moves as prices
+        close = float(index.value)
+        history = []
+        for i in range(90):
+            history.append(MarketIndexValue(
+                index=index, date=date.today() - timedelta(days=i), value=Decimal(str(round(close, 2)))
+            ))
+            close /= 1 + random.uniform(-0.02, 0.02)
+        values_created += len(MarketIndexValue.objects.bulk_create(history, ignore_conflicts=True))
+
+    print(f"   📊 Created {values_created} market index values (90 days per index)")
@@ -21,8 +21,8 @@ from .learning import (
 )
 from .trading import (
     StockSerializer, StockDetailSerializer, StockPriceSerializer, UserWatchlistSerializer, StockWatchlistSerializer,
-    PortfolioSerializer, PortfolioSummarySerializer, PortfolioHoldingSerializer,
-    OrderSerializer, OrderHistorySerializer, TradeSerializer,
+    PortfolioSerializer, PortfolioSummarySerializer, PortfolioHoldingSerializer, PositionLotSerializer,
+    OrderSerializer, BulkOrderSerializer, OrderHistorySerializer, TradeSerializer, BacktestSerializer,
     TradingPerformanceSerializer, TradingSessionSerializer,
     MarketDataSerializer, TechnicalIndicatorSerializer,
     AchievementSerializer, UserAchievementSerializer, LeaderboardSerializer,
@@ -56,8 +56,8 @@ __all__ = [
     
     # Trading serializers
     'StockSerializer', 'StockDetailSerializer', 'StockPriceSerializer', 'UserWatchlistSerializer', 'StockWatchlistSerializer',
-    'PortfolioSerializer', 'PortfolioSummarySerializer', 'PortfolioHoldingSerializer',
-    'OrderSerializer', 'OrderHistorySerializer', 'TradeSerializer',
+    'PortfolioSerializer', 'PortfolioSummarySerializer', 'PortfolioHoldingSerializer', 'PositionLotSerializer',
+    'OrderSerializer', 'BulkOrderSerializer', 'OrderHistorySerializer', 'TradeSerializer', 'BacktestSerializer',
     'TradingPerformanceSerializer', 'TradingSessionSerializer',
     'MarketDataSerializer', 'TechnicalIndicatorSerializer',
     'AchievementSerializer', 'UserAchievementSerializer', 'LeaderboardSerializer',
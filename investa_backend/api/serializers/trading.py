@@ -1,10 +1,18 @@
+import copy
+
+from django.conf import settings
+from django.db.models import F
 from rest_framework import serializers
 from ..models import (
-    Stock, StockPrice, StockNews, MarketIndex, UserWatchlist, Portfolio, PortfolioHolding,
-    Order, Trade, TradingPerformance, TradingSession, MarketData,
+    Stock, StockPrice, StockNews, MarketIndex, UserWatchlist, Portfolio, PortfolioHolding, PositionLot,
+    Order, Trade, TradingPerformance, LeaderboardEntry, TradingSession, MarketData,
     TechnicalIndicator, Achievement, UserAchievement
 )
 from .auth import UserSerializer
+from ..services.backtest import DEFAULT_CAPITAL, DEFAULT_COMMISSION, DEFAULT_POINTS, PARAMETERS, STRATEGIES
+from ..services.news import attach_symbols, linked_symbols
+from ..services.ohlcv_store import ohlcv_store
+from ..services.quotes import QUOTE_SNAPSHOT_ATTR, get_quote, quote_cache
 
 
 class StockSerializer(serializers.ModelSerializer):
@@ -20,17 +28,17 @@ class StockSerializer(serializers.ModelSerializer):
     
     def get_current_price(self, obj):
         """Get current price from market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         return float(market_data.current_price) if market_data else 0.0
     
     def get_change_percentage(self, obj):
         """Get change percentage from market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         return float(market_data.change_percentage) if market_data else 0.0
     
     def get_change_amount(self, obj):
         """Get change amount from market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         return float(market_data.change_amount) if market_data else 0.0
 
 
@@ -51,23 +59,26 @@ class StockDetailSerializer(serializers.ModelSerializer):
 
     def get_current_price(self, obj):
         """Get current price from market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         return float(market_data.current_price) if market_data else 0.0
 
     def get_change_percentage(self, obj):
         """Get change percentage from market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         return float(market_data.change_percentage) if market_data else 0.0
 
     def get_change_amount(self, obj):
         """Get change amount from market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         return float(market_data.change_amount) if market_data else 0.0
 
     def get_market_data(self, obj):
         """Get full market data"""
-        market_data = obj.market_data.first()
+        market_data = get_quote(obj)
         if market_data:
+            # Cached rows are shared, so attach the stock to a private copy
+            market_data = copy.copy(market_data)
+            market_data.stock = obj
             return MarketDataSerializer(market_data).data
         return None
 
@@ -75,14 +86,30 @@ class StockDetailSerializer(serializers.ModelSerializer):
         """Compute fundamentals from StockPrice, MarketData, and Stock fields"""
         from decimal import Decimal
         fundamentals = []
-        market_data = obj.market_data.first()
-        # 52W High / Low from available StockPrice history (up to 365 days)
-        prices = obj.prices.all().order_by('-date')[:365]
-        if prices:
-            high_52w = max(float(p.high_price) for p in prices)
-            low_52w = min(float(p.low_price) for p in prices)
+        market_data = get_quote(obj)
+        # 52W High / Low from the maintained rolling stats row when there is one
+        stats = getattr(obj, 'rolling_stats', None)
+        if stats is not None:
+            highs, lows = [stats.high_52w], [stats.low_52w]
+        else:
+            # Fall back to the columnar store, else StockPrice history (up to 365 days)
+            bars = ohlcv_store.tail(obj.symbol, 365)
+            if bars is not None:
+                highs, lows = bars['high'], bars['low']
+            else:
+                prices = obj.prices.all().order_by('-date')[:365]
+                highs = [float(p.high_price) for p in prices]
+                lows = [float(p.low_price) for p in prices]
+        if len(highs):
+            high_52w = float(max(highs))
+            low_52w = float(min(lows))
             fundamentals.append({'label': '52W High', 'value': f"₹{high_52w:.2f}"})
             fundamentals.append({'label': '52W Low', 'value': f"₹{low_52w:.2f}"})
+        if stats is not None:
+            if stats.sma_50 is not None:
+                fundamentals.append({'label': '50D Avg', 'value': f"₹{float(stats.sma_50):.2f}"})
+            if stats.sma_200 is not None:
+                fundamentals.append({'label': '200D Avg', 'value': f"₹{float(stats.sma_200):.2f}"})
         if market_data:
             if market_data.dividend_yield is not None:
                 fundamentals.append({'label': 'Dividend Yield', 'value': f"{float(market_data.dividend_yield):.2f}%"})
@@ -98,12 +125,12 @@ class StockDetailSerializer(serializers.ModelSerializer):
 
     def get_news(self, obj):
         """Latest 10 news items for the stock"""
-        latest = obj.news.all()[:10]
+        latest = attach_symbols(list(obj.linked_news.select_related('stock')[:10]))
         return StockNewsSerializer(latest, many=True).data
 
     def get_recent_news(self, obj):
         """Latest 5 news items (compact view)"""
-        latest = obj.news.all()[:5]
+        latest = attach_symbols(list(obj.linked_news.select_related('stock')[:5]))
         return StockNewsSerializer(latest, many=True).data
 
 
@@ -144,7 +171,7 @@ class PortfolioSerializer(serializers.ModelSerializer):
     class Meta:
         model = Portfolio
         fields = '__all__'
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'created_at', 'updated_at', 'triggered_at']
 
 
 class PortfolioSummarySerializer(serializers.ModelSerializer):
@@ -155,12 +182,21 @@ class PortfolioSummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = Portfolio
         fields = '__all__'
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'created_at', 'updated_at', 'triggered_at']
+
+
+class PositionLotSerializer(serializers.ModelSerializer):
+    """Serializer for PositionLot model"""
+
+    class Meta:
+        model = PositionLot
+        fields = ['id', 'quantity', 'price', 'acquired_at']
 
 
 class PortfolioHoldingSerializer(serializers.ModelSerializer):
     """Serializer for PortfolioHolding model"""
     stock = StockSerializer(read_only=True)
+    lots = PositionLotSerializer(many=True, read_only=True)
     return_percentage = serializers.ReadOnlyField()
     
     class Meta:
@@ -168,6 +204,31 @@ class PortfolioHoldingSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
 
+    def to_representation(self, instance):
+        """Value the holding at the live quote rather than the stored price"""
+        data = super().to_representation(instance)
+        quote = get_quote(instance.stock)
+        if quote is None:
+            return data
+        market_value = quote.current_price * instance.quantity
+        unrealized_pnl = market_value - instance.total_invested
+        data['current_price'] = self.fields['current_price'].to_representation(quote.current_price)
+        data['market_value'] = self.fields['market_value'].to_representation(market_value)
+        data['unrealized_pnl'] = self.fields['unrealized_pnl'].to_representation(unrealized_pnl)
+        if instance.total_invested:
+            data['return_percentage'] = round((unrealized_pnl / instance.total_invested) * 100, 2)
+        return data
+
+
+def _validate_order_prices(attrs):
+    """Require the prices each order type needs"""
+    order_type = attrs.get('order_type', 'MARKET')
+    if order_type in ('LIMIT', 'STOP_LIMIT') and not attrs.get('price'):
+        raise serializers.ValidationError({'price': f'{order_type} orders require a limit price.'})
+    if order_type in ('STOP', 'STOP_LIMIT') and not attrs.get('stop_price'):
+        raise serializers.ValidationError({'stop_price': f'{order_type} orders require a stop price.'})
+    return attrs
+
 
 class OrderSerializer(serializers.ModelSerializer):
     """Serializer for Order model"""
@@ -181,12 +242,97 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = '__all__'
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'created_at', 'updated_at', 'triggered_at']
     
     def get_calculated_total(self, obj):
         """Get calculated total amount"""
         return float(obj.calculated_total_amount)
 
+    def validate(self, attrs):
+        """Require the prices each order type needs"""
+        return _validate_order_prices(attrs)
+
+
+class BulkOrderItemSerializer(serializers.Serializer):
+    """One order inside a bulk submission"""
+    stock = serializers.IntegerField()
+    side = serializers.ChoiceField(choices=Order.ORDER_SIDE)
+    order_type = serializers.ChoiceField(choices=Order.ORDER_TYPES, default='MARKET')
+    quantity = serializers.IntegerField(min_value=1)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+    stop_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, attrs):
+        return _validate_order_prices(attrs)
+
+
+class BulkOrderSerializer(serializers.Serializer):
+    """Validate a batch of orders together and resolve their stocks in one query"""
+    orders = BulkOrderItemSerializer(many=True, allow_empty=False, max_length=settings.BULK_ORDER_MAX_ORDERS)
+
+    def validate_orders(self, orders):
+        stock_ids = {item['stock'] for item in orders}
+        # One LEFT JOIN fetches every stock together with its quote
+        stocks = (
+            Stock.objects.filter(pk__in=stock_ids, is_active=True)
+            .annotate(quote_price=F('market_data__current_price'))
+            .in_bulk()
+        )
+        errors = []
+        for item in orders:
+            stock = stocks.get(item['stock'])
+            if stock is None:
+                errors.append({'stock': [f"Invalid pk \"{item['stock']}\" - object does not exist."]})
+                continue
+            errors.append({})
+            item['stock'] = stock
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return orders
+
+
+class BacktestSerializer(serializers.Serializer):
+    """Validate a strategy backtest request and resolve its symbols in one query"""
+    strategy = serializers.ChoiceField(choices=list(STRATEGIES))
+    symbols = serializers.ListField(
+        child=serializers.CharField(max_length=10), allow_empty=False, max_length=settings.BACKTEST_MAX_SYMBOLS
+    )
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    initial_capital = serializers.FloatField(min_value=1, default=DEFAULT_CAPITAL)
+    commission = serializers.FloatField(min_value=0, max_value=0.05, default=DEFAULT_COMMISSION)
+    points = serializers.IntegerField(min_value=0, max_value=2000, default=DEFAULT_POINTS)
+    # Strategy parameters; defaults come from STRATEGIES
+    rebalance_days = serializers.IntegerField(min_value=1, required=False)
+    fast = serializers.IntegerField(min_value=2, required=False)
+    slow = serializers.IntegerField(min_value=3, required=False)
+    period = serializers.IntegerField(min_value=2, required=False)
+    lower = serializers.FloatField(min_value=0, max_value=100, required=False)
+    upper = serializers.FloatField(min_value=0, max_value=100, required=False)
+
+    def validate_symbols(self, symbols):
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        stocks = Stock.objects.filter(symbol__in=symbols).in_bulk(field_name='symbol')
+        unknown = [symbol for symbol in symbols if symbol not in stocks]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown symbols: {', '.join(unknown)}")
+        return [stocks[symbol] for symbol in symbols]
+
+    def validate(self, attrs):
+        defaults = STRATEGIES[attrs['strategy']]
+        params = {**defaults, **{name: attrs.pop(name) for name in list(attrs) if name in PARAMETERS}}
+        if params.get('fast', 0) >= params.get('slow', 1):
+            raise serializers.ValidationError({'fast': 'Must be shorter than slow'})
+        if params.get('lower', 0) >= params.get('upper', 1):
+            raise serializers.ValidationError({'lower': 'Must be below upper'})
+        if attrs.get('start') and attrs.get('end') and attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError({'start': 'Must be before end'})
+        # Only the chosen strategy's parameters take part (and key the cache)
+        attrs['params'] = {name: value for name, value in params.items() if name in defaults}
+        attrs['stocks'] = attrs.pop('symbols')
+        return attrs
+
 
 class OrderHistorySerializer(serializers.ModelSerializer):
     """Serializer for order history"""
@@ -197,7 +343,7 @@ class OrderHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = '__all__'
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'created_at', 'updated_at', 'triggered_at']
     
     def get_calculated_total(self, obj):
         """Get calculated total amount"""
@@ -213,7 +359,7 @@ class TradeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Trade
         fields = '__all__'
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'created_at', 'updated_at', 'triggered_at']
 
 
 class TradingPerformanceSerializer(serializers.ModelSerializer):
@@ -247,6 +393,21 @@ class MarketDataSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
 
+    live_fields = ['current_price', 'change_amount', 'change_percentage', 'volume']
+
+    def to_representation(self, instance):
+        """Serialize the row, taking live fields from a newer cached quote"""
+        # Let the nested stock reuse this row instead of re-querying its quote
+        stock = instance.stock
+        if not hasattr(stock, QUOTE_SNAPSHOT_ATTR):
+            setattr(stock, QUOTE_SNAPSHOT_ATTR, [instance])
+        data = super().to_representation(instance)
+        quote = quote_cache.get(instance.stock_id)
+        if quote is not None and quote.updated_at > instance.updated_at:
+            for name in self.live_fields:
+                data[name] = self.fields[name].to_representation(getattr(quote, name))
+        return data
+
 
 class TechnicalIndicatorSerializer(serializers.ModelSerializer):
     """Serializer for TechnicalIndicator model"""
@@ -277,24 +438,42 @@ class UserAchievementSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'achievement', 'earned_at']
 
 
-class LeaderboardSerializer(serializers.Serializer):
-    """Serializer for leaderboard data"""
-    user = UserSerializer(read_only=True)
-    total_profit_loss = serializers.DecimalField(max_digits=15, decimal_places=2)
-    total_trades = serializers.IntegerField()
-    success_rate = serializers.DecimalField(max_digits=5, decimal_places=2)
-    rank = serializers.IntegerField()
+class LeaderboardSerializer(serializers.ModelSerializer):
+    """Serializer for LeaderboardEntry rows"""
+    user = serializers.SerializerMethodField()
+    total_profit_loss = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['id', 'rank', 'user', 'timeframe', 'period_start', 'portfolio_value',
+                  'portfolio_growth_percentage', 'total_profit_loss', 'total_trades']
+        read_only_fields = fields
+
+    def get_user(self, obj):
+        user = obj.user
+        return {'id': user.id, 'username': user.username,
+                'first_name': user.first_name, 'last_name': user.last_name}
 
 
 class StockNewsSerializer(serializers.ModelSerializer):
     """Serializer for StockNews model"""
+    stock_symbol = serializers.CharField(source='stock.symbol', read_only=True)
+    stock_name = serializers.CharField(source='stock.name', read_only=True)
+    symbols = serializers.SerializerMethodField()
     time_ago = serializers.SerializerMethodField()
 
     class Meta:
         model = StockNews
-        fields = ['id', 'stock', 'title', 'source', 'summary', 'url', 'published_at', 'time_ago', 'created_at']
+        fields = [
+            'id', 'stock', 'stock_symbol', 'stock_name', 'symbols', 'title', 'source', 'summary', 'url',
+            'published_at', 'time_ago', 'created_at',
+        ]
         read_only_fields = ['created_at']
 
+    def get_symbols(self, obj):
+        """Every stock the story is linked to"""
+        return linked_symbols(obj)
+
     def get_time_ago(self, obj):
         """Human-readable time-ago string"""
         from django.utils import timezone
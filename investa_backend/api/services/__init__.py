@@ -0,0 +1,20 @@
+# Services package - shared trading logic used by views, serializers and commands
+
+from .quotes import (
+    QUOTE_COLUMNS, QUOTE_SNAPSHOT_ATTR, QuoteCache, quote_cache, with_quote_snapshot, get_quote, get_quotes,
+    attach_quotes, quote_version, quote_columns,
+)
+
+__all__ = [
+    # Quote helpers
+    'QUOTE_COLUMNS',
+    'QUOTE_SNAPSHOT_ATTR',
+    'QuoteCache',
+    'quote_cache',
+    'with_quote_snapshot',
+    'get_quote',
+    'get_quotes',
+    'attach_quotes',
+    'quote_version',
+    'quote_columns',
+]
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import CharField
+from django.db.models.functions import Cast
+
+from ..models import StockPrice
+from .charts import chart_versions, lttb_indices
+from .execution import COMMISSION_RATE
+from .indicators import RSI_PERIOD, rsi, sma
+from .ohlcv_store import ohlcv_store
+
+
+TRADING_DAYS = 252
+STRATEGIES = {
+    'buy_and_hold': {},
+    'rebalance': {'rebalance_days': 21},
+    'sma_crossover': {'fast': 20, 'slow': 50},
+    'rsi': {'period': RSI_PERIOD, 'lower': 30, 'upper': 70},
+}
+PARAMETERS = sorted({name for defaults in STRATEGIES.values() for name in defaults})
+DEFAULT_CAPITAL = 10000.0
+DEFAULT_COMMISSION = float(COMMISSION_RATE)
+DEFAULT_POINTS = 250
+
+
+class PriceMatrixCache:
+    """Process-wide LRU of forward-filled (symbols x days) close matrices.
+
+    Entries are keyed by the stock ids and their chart cache versions, so a
+    new bar for any symbol makes its matrices unreachable.
+    """
+
+    def __init__(self, max_entries=None):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self):
+        return self._max_entries or settings.BACKTEST_MATRIX_CACHE_SIZE
+
+    def get(self, stocks, versions):
+        """``(dates, closes)`` for ``stocks``, loading them on a miss"""
+        key = (tuple(stock.pk for stock in stocks), tuple(versions))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = load_closes(stocks)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+price_matrix_cache = PriceMatrixCache()
+
+
+def load_closes(stocks):
+    """Whole close history of ``stocks`` on their union of trading days.
+
+    Symbols with an OHLCV store file are read from it, the rest in a single
+    StockPrice query. Gaps carry the previous close forward; days before a
+    symbol's first bar stay NaN.
+    """
+    series = {}
+    missing = []
+    for stock in stocks:
+        bars = ohlcv_store.read(stock.symbol)
+        if bars is None:
+            missing.append(stock.pk)
+        else:
+            series[stock.pk] = (bars['date'], bars['close'])
+    if missing:
+        query = (
+            StockPrice.objects.filter(stock_id__in=missing)
+            .annotate(day=Cast('date', CharField()))
+            .order_by('stock_id', 'date')
+            .values_list('stock_id', 'day', 'close_price')
+        )
+        # Raw rows with text dates skip the per-value date and Decimal converters
+        with connection.cursor() as cursor:
+            cursor.execute(*query.query.sql_with_params())
+            rows = cursor.fetchall()
+        if rows:
+            ids, dates, closes = zip(*rows)
+            ids = np.array(ids, dtype=np.int64)
+            # Symbols share their trading days, so only distinct strings are parsed
+            labels, inverse = np.unique(np.array(dates), return_inverse=True)
+            dates = labels.astype('datetime64[D]')[inverse]
+            closes = np.array(closes, dtype=float)
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+            for start, end in zip(starts, np.r_[starts[1:], len(ids)]):
+                series[int(ids[start])] = (dates[start:end], closes[start:end])
+
+    if not series:
+        return np.array([], dtype='datetime64[D]'), np.empty((len(stocks), 0))
+    days = np.unique(np.concatenate([dates for dates, _ in series.values()]))
+    matrix = np.full((len(stocks), len(days)), np.nan)
+    for row, stock in enumerate(stocks):
+        if stock.pk in series:
+            dates, closes = series[stock.pk]
+            matrix[row, np.searchsorted(days, dates)] = closes
+    known = ~np.isnan(matrix)
+    last_known = np.maximum.accumulate(np.where(known, np.arange(len(days)), 0), axis=1)
+    filled = np.take_along_axis(matrix, last_known, axis=1)
+    started = np.maximum.accumulate(known, axis=1)
+    return days, np.where(started, filled, np.nan)
+
+
+def run_backtest(strategy, stocks, start=None, end=None, initial_capital=DEFAULT_CAPITAL,
+                 commission=DEFAULT_COMMISSION, points=DEFAULT_POINTS, params=None):
+    """Simulate ``strategy`` over ``stocks`` and summarize the equity curve.
+
+    Capital is split equally between the symbols. Signals are taken on each
+    close and traded on it, earning the next day's return; commission is
+    charged on the value traded. Results are cached per parameters and price
+    versions. Returns a dict with the metrics and the (downsampled) curve.
+    """
+    params = {**STRATEGIES[strategy], **(params or {})}
+    versions = chart_versions([stock.pk for stock in stocks])
+    request = {
+        'strategy': strategy, 'symbols': [stock.symbol for stock in stocks],
+        'start': str(start) if start else None, 'end': str(end) if end else None,
+        'initial_capital': initial_capital, 'commission': commission, 'points': points, 'params': params,
+    }
+    digest = hashlib.sha1(json.dumps([request, versions], sort_keys=True).encode()).hexdigest()
+    key = f'backtests:{digest}'
+    result = cache.get(key)
+    if result is None:
+        result = _simulate(request, stocks, versions)
+        cache.set(key, result, settings.BACKTEST_CACHE_TTL)
+    return result
+
+
+def _simulate(request, stocks, versions):
+    days, closes = price_matrix_cache.get(stocks, versions)
+    strategy, params, commission = request['strategy'], request['params'], request['commission']
+    # Indicators see the full history so signals are warmed up by ``start``
+    if strategy == 'sma_crossover':
+        positions = np.where(sma(closes, params['fast']) > sma(closes, params['slow']), 1.0, 0.0)
+    elif strategy == 'rsi':
+        positions = _hysteresis(rsi(closes, params['period']), params['lower'], params['upper'])
+
+    lo = np.searchsorted(days, np.datetime64(request['start'], 'D')) if request['start'] else 0
+    hi = np.searchsorted(days, np.datetime64(request['end'], 'D'), side='right') if request['end'] else len(days)
+    days, closes = days[lo:hi], closes[:, lo:hi]
+    if len(days) < 2:
+        return {**request, 'detail': 'Not enough price history in the requested range'}
+
+    if strategy == 'buy_and_hold':
+        growth, trades = _buy_and_hold(closes, commission)
+    elif strategy == 'rebalance':
+        growth, trades = _rebalance(closes, params['rebalance_days'], commission)
+    else:
+        growth, trades = _sleeves(closes, positions[:, lo:hi], commission)
+    equity = request['initial_capital'] * growth
+    return {**request, 'trades': trades, **_metrics(days, equity, request['points'])}
+
+
+def _buy_and_hold(closes, commission):
+    """Equal-weight purchase of every symbol on its first close in range"""
+    first = closes[np.arange(len(closes)), np.argmax(~np.isnan(closes), axis=1)]
+    with np.errstate(invalid='ignore'):
+        relative = np.where(np.isnan(closes), 1.0, closes / first[:, None])
+    return relative.mean(axis=0) * (1 - commission), int((~np.isnan(first)).sum())
+
+
+def _rebalance(closes, every, commission):
+    """Equal weights restored every ``every`` trading days.
+
+    Between rebalances each slice drifts with its prices; at a rebalance the
+    value traded is the drift away from equal weights.
+    """
+    days = closes.shape[1]
+    anchors = np.arange(days) // every * every
+    boundaries = np.arange(every, days, every)
+    with np.errstate(invalid='ignore'):
+        relative = closes / closes[:, anchors]
+        completed = closes[:, boundaries] / closes[:, boundaries - every]
+    # Symbols without prices yet sit in cash
+    relative = np.where(np.isnan(relative), 1.0, relative)
+    completed = np.where(np.isnan(completed), 1.0, completed)
+
+    drifted = completed / completed.sum(axis=0)
+    turnover = np.abs(drifted - 1.0 / len(closes)).sum(axis=0)
+    segments = completed.mean(axis=0) * (1 - commission * turnover)
+    base = (1 - commission) * np.r_[1.0, np.cumprod(segments)]
+    return base[anchors // every] * relative.mean(axis=0), len(boundaries) + 1
+
+
+def _sleeves(closes, positions, commission):
+    """Each symbol trades its own equal slice of capital, in or out of the market"""
+    with np.errstate(invalid='ignore'):
+        returns = np.diff(closes, axis=1, prepend=np.nan) / np.roll(closes, 1, axis=1)
+    returns = np.nan_to_num(returns)
+    positions = np.where(np.isnan(closes), 0.0, positions)
+    held = np.roll(positions, 1, axis=1)
+    held[:, 0] = 0.0
+    changes = np.abs(positions - held)
+    factors = (1 + held * returns) * (1 - commission * changes)
+    return np.cumprod(factors, axis=1).mean(axis=0), int(changes.sum())
+
+
+def _hysteresis(values, lower, upper):
+    """1 from a reading below ``lower`` until one above ``upper``, else 0"""
+    events = np.where(values < lower, 1.0, np.where(values > upper, 0.0, np.nan))
+    index = np.where(np.isnan(events), 0, np.arange(events.shape[1]))
+    latest = np.maximum.accumulate(index, axis=1)
+    state = np.take_along_axis(events, latest, axis=1)
+    return np.nan_to_num(state)
+
+
+def _metrics(days, equity, points):
+    """Returns, CAGR, volatility, Sharpe ratio, drawdown and the equity curve"""
+    daily = equity[1:] / equity[:-1] - 1
+    deviation = daily.std(ddof=1) if len(daily) > 1 else 0.0
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    years = (days[-1] - days[0]).astype(np.int64) / 365.25
+    cagr = (equity[-1] / equity[0]) ** (1 / years) - 1 if years > 0 else 0.0
+    indices = lttb_indices(days.astype(np.int64).astype(float), equity, points) if points else np.arange(len(days))
+    return {
+        'start': str(days[0]),
+        'end': str(days[-1]),
+        'final_value': round(float(equity[-1]), 2),
+        'total_return': round(float(equity[-1] / equity[0] - 1) * 100, 2),
+        'cagr': round(float(cagr) * 100, 2),
+        'volatility': round(float(deviation * np.sqrt(TRADING_DAYS)) * 100, 2),
+        'sharpe_ratio': round(float(daily.mean() / deviation * np.sqrt(TRADING_DAYS)), 2) if deviation else 0.0,
+        'max_drawdown': round(float(drawdown.min()) * 100, 2),
+        'equity_curve': [
+            {'date': str(day), 'value': round(value, 2), 'drawdown': round(dd * 100, 2)}
+            for day, value, dd in zip(
+                days[indices].astype(str).tolist(), equity[indices].tolist(), drawdown[indices].tolist()
+            )
+        ],
+    }
@@ -0,0 +1,126 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .ohlcv_store import OHLCV_DTYPE, bars_to_rows, price_bars
+
+
+INTERVALS = ('daily', 'weekly', 'monthly')
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+# Fewest points each method can thin to: both endpoints plus one bucket
+MIN_POINTS = {'lttb': 3, 'minmax': 4}
+
+
+def resample(bars, interval):
+    """Aggregate daily bars into weekly (Monday-based) or monthly candles.
+
+    Each candle is dated by its first trading day.
+    """
+    if interval == 'daily' or not len(bars):
+        return bars
+    if interval == 'weekly':
+        days = bars['date'].astype(np.int64)
+        keys = days - (days + 3) % 7  # Day 0 (1970-01-01) is a Thursday
+    else:
+        keys = bars['date'].astype('datetime64[M]').astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(bars)] - 1
+
+    candles = np.empty(len(starts), dtype=OHLCV_DTYPE)
+    candles['date'] = bars['date'][starts]
+    candles['open'] = bars['open'][starts]
+    candles['high'] = np.maximum.reduceat(bars['high'], starts)
+    candles['low'] = np.minimum.reduceat(bars['low'], starts)
+    candles['close'] = bars['close'][ends]
+    candles['volume'] = np.add.reduceat(bars['volume'], starts)
+    return candles
+
+
+def lttb_indices(x, y, points):
+    """Largest-Triangle-Three-Buckets selection of ``points`` indices"""
+    n = len(y)
+    if points >= n or points < 3:
+        return np.arange(n)
+    # Interior buckets split indices 1..n-2; bucket i+1's centroid anchors bucket i
+    edges = (np.arange(points - 1) * (n - 2) / (points - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    avg_x = np.r_[avg_x[1:], x[-1]]
+    avg_y = np.r_[avg_y[1:], y[-1]]
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, points):
+    """Keep the endpoints plus the lowest and highest point of each bucket"""
+    n = len(y)
+    if points >= n or points < 4:
+        return np.arange(n)
+    buckets = (points - 2) // 2
+    bucket_of = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket_of))  # By bucket, then by value
+    starts = np.flatnonzero(np.r_[True, bucket_of[order][1:] != bucket_of[order][:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.r_[0, order[starts], order[ends], n - 1])
+
+
+def downsample(bars, points, method='lttb'):
+    """Thin ``bars`` to about ``points`` rows, preserving the close-price shape"""
+    if not points or len(bars) <= points:
+        return bars
+    closes = bars['close'].astype(float)
+    if method == 'minmax':
+        indices = minmax_indices(closes, points)
+    else:
+        indices = lttb_indices(bars['date'].astype(np.int64).astype(float), closes, points)
+    return bars[indices]
+
+
+def _version_key(stock_id):
+    return f'charts:version:{stock_id}'
+
+
+def invalidate_charts(stock_id):
+    """Make every cached chart of ``stock_id`` stale"""
+    cache.set(_version_key(stock_id), time.time_ns(), None)
+
+
+def chart_versions(stock_ids):
+    """Current cache versions of ``stock_ids``, for other caches derived from their bars"""
+    keys = [_version_key(stock_id) for stock_id in stock_ids]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def chart_rows(stock, start, interval='daily', points=None, method='lttb'):
+    """price_history rows for ``stock`` since ``start``, resampled and downsampled.
+
+    Results are cached per (symbol, interval, range, points, method) until the
+    TTL runs out or a new bar invalidates the symbol.
+    """
+    version = cache.get_or_set(_version_key(stock.pk), time.time_ns(), None)
+    key = f'charts:{stock.symbol}:{version}:{interval}:{start}:{points}:{method}'
+    rows = cache.get(key)
+    if rows is None:
+        bars = downsample(resample(price_bars(stock, start), interval), points, method)
+        rows = bars_to_rows(stock, bars)
+        cache.set(key, rows, settings.CHART_CACHE_TTL)
+    return rows
@@ -0,0 +1,221 @@
+from collections import Counter, deque
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Notification, Order, Portfolio, PortfolioHolding, PositionLot, Trade
+from .leaderboard import record_portfolios
+from .lots import consume_lots, load_lots, remaining_basis
+from .performance import realized_pnl, record_trades
+from .trade_stats import record_trade_stats
+
+
+COMMISSION_RATE = Decimal('0.001')  # 0.1% commission
+CENT = Decimal('0.01')
+DEFAULT_FILL_PRICE = Decimal('150.00')  # Used when a stock has no market data
+
+
+def apply_fills(fills):
+    """Execute pending orders in a single transaction.
+
+    ``fills`` maps order id to fill price. Orders are filled in full at that
+    price; orders that are no longer pending are skipped, and orders the user
+    can't cover (cash for a BUY, shares for a SELL) are rejected. Trades and
+    notifications are bulk-created and holdings are written in batches.
+
+    Every BUY opens a PositionLot; a SELL consumes lots by the portfolio's
+    cost basis method and books the realized P&L on the holding, the
+    portfolio and the trade.
+
+    The order, portfolio and holding rows are locked for the whole unit, and
+    portfolio totals are moved by each fill's delta rather than re-aggregated
+    over every holding. Touched users' leaderboard entries are updated in the
+    same transaction, as are their TradingPerformance statistics. Returns
+    the list of filled orders.
+    """
+    if not fills:
+        return []
+
+    now = timezone.now()
+    with transaction.atomic():
+        orders = list(
+            Order.objects.select_for_update()
+            .filter(pk__in=list(fills), status='PENDING')
+            .select_related('stock')
+            .order_by('created_at', 'pk')
+        )
+        if not orders:
+            return []
+
+        user_ids = {order.user_id for order in orders}
+        stock_ids = {order.stock_id for order in orders}
+        missing = user_ids - set(
+            Portfolio.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True)
+        )
+        Portfolio.objects.bulk_create([Portfolio(user_id=user_id) for user_id in missing])
+        # Lock in primary-key order so concurrent batches can't deadlock
+        portfolios = {
+            p.user_id: p
+            for p in Portfolio.objects.select_for_update().filter(user_id__in=user_ids).order_by('pk')
+        }
+        holdings = {
+            (h.portfolio_id, h.stock_id): h
+            for h in PortfolioHolding.objects.select_for_update().filter(
+                portfolio__in=portfolios.values(), stock_id__in=stock_ids
+            ).order_by('pk')
+        }
+        # Only holdings something is sold from need their lots
+        sold = {(portfolios[order.user_id].pk, order.stock_id) for order in orders if order.side == 'SELL'}
+        books = load_lots({key: holding for key, holding in holdings.items() if key in sold})
+        for portfolio in portfolios.values():
+            if not portfolio.total_invested:
+                # Nothing invested yet, so the portfolio is worth exactly its cash
+                portfolio.total_value = portfolio.cash_balance
+
+        filled, rejected, trades, notifications = [], [], [], []
+        new_holdings, changed_holdings, emptied_holdings = {}, {}, {}
+        new_lots, changed_lots = [], {}
+        for order in orders:
+            price = fills[order.pk]
+            total_amount = order.quantity * price
+            portfolio = portfolios[order.user_id]
+            key = (portfolio.pk, order.stock_id)
+            holding = holdings.get(key)
+            invested_before = holding.total_invested if holding is not None else Decimal('0.00')
+            value_before = holding.market_value if holding is not None else Decimal('0.00')
+            realized = None
+
+            if order.side == 'BUY':
+                if portfolio.cash_balance < total_amount:
+                    rejected.append(order)
+                    continue
+                portfolio.cash_balance -= total_amount
+                if holding is None:
+                    holding = PortfolioHolding(
+                        portfolio=portfolio, stock_id=order.stock_id,
+                        quantity=0, average_price=price, total_invested=Decimal('0.00'),
+                        realized_pnl=Decimal('0.00'),
+                    )
+                    holdings[key] = holding
+                    new_holdings[key] = holding
+                elif key in emptied_holdings:
+                    del emptied_holdings[key]
+                    changed_holdings[key] = holding
+                elif key not in new_holdings:
+                    changed_holdings[key] = holding
+                holding.quantity += order.quantity
+                holding.total_invested += total_amount
+                holding.average_price = (holding.total_invested / holding.quantity).quantize(CENT)
+                lot = PositionLot(holding=holding, quantity=order.quantity, price=price, acquired_at=now)
+                new_lots.append(lot)
+                if key in sold:
+                    books.setdefault(key, deque()).append(lot)
+            else:
+                if holding is None or key in emptied_holdings or holding.quantity < order.quantity:
+                    rejected.append(order)
+                    continue
+                portfolio.cash_balance += total_amount
+                method = portfolio.cost_basis_method
+                lot_cost, consumed = consume_lots(books[key], order.quantity, method, holding.average_price)
+                changed_lots.update((id(lot), lot) for lot in consumed)
+                remaining = holding.quantity - order.quantity
+                holding.total_invested = remaining_basis(
+                    method, holding.total_invested, holding.quantity, order.quantity, lot_cost
+                )
+                holding.quantity = remaining
+                if remaining and method != 'AVERAGE':
+                    holding.average_price = (holding.total_invested / remaining).quantize(CENT)
+                realized = realized_pnl(total_amount, invested_before, holding.total_invested)
+                holding.realized_pnl += realized
+                portfolio.realized_pnl += realized
+                if remaining == 0:
+                    if key in new_holdings:
+                        del new_holdings[key]
+                        del holdings[key]
+                    else:
+                        changed_holdings.pop(key, None)
+                        emptied_holdings[key] = holding
+                elif key not in new_holdings:
+                    changed_holdings[key] = holding
+
+            holding.current_price = price
+            holding.market_value = holding.quantity * price
+            holding.unrealized_pnl = holding.market_value - holding.total_invested
+
+            cash_delta = total_amount if order.side == 'SELL' else -total_amount
+            portfolio.total_invested += holding.total_invested - invested_before
+            portfolio.total_value += (holding.market_value - value_before) + cash_delta
+            portfolio.total_profit_loss = portfolio.total_value - portfolio.total_invested
+
+            order.status = 'FILLED'
+            order.filled_quantity = order.quantity
+            order.average_fill_price = price
+            order.total_amount = total_amount
+            order.filled_at = now
+            order.updated_at = now
+            filled.append(order)
+            trades.append(Trade(
+                order=order,
+                user_id=order.user_id,
+                stock_id=order.stock_id,
+                side=order.side,
+                quantity=order.quantity,
+                price=price,
+                total_amount=total_amount,
+                commission=(total_amount * COMMISSION_RATE).quantize(CENT),
+                net_amount=total_amount,
+                realized_pnl=realized,
+            ))
+            notifications.append(Notification(
+                user_id=order.user_id,
+                title='Order Executed',
+                message=f'{order.side} {order.quantity} {order.stock.symbol} @ ₹{price}',
+                notification_type='trading',
+            ))
+
+        for order in rejected:
+            order.status = 'REJECTED'
+            order.updated_at = now
+            notifications.append(Notification(
+                user_id=order.user_id,
+                title='Order Rejected',
+                message=f'{order.side} {order.quantity} {order.stock.symbol}: insufficient '
+                        f'{"cash" if order.side == "BUY" else "shares"}',
+                notification_type='trading',
+            ))
+
+        Order.objects.bulk_update(
+            filled + rejected,
+            ['status', 'filled_quantity', 'average_fill_price', 'total_amount', 'filled_at', 'updated_at'],
+        )
+        Trade.objects.bulk_create(trades)
+        PortfolioHolding.objects.bulk_create(new_holdings.values())
+        PortfolioHolding.objects.bulk_update(
+            changed_holdings.values(),
+            ['quantity', 'average_price', 'total_invested', 'current_price', 'market_value', 'unrealized_pnl',
+             'realized_pnl'],
+        )
+        PositionLot.objects.bulk_create([lot for lot in new_lots if lot.quantity])
+        spent_lots = [lot.pk for lot in changed_lots.values() if lot.pk and not lot.quantity]
+        if spent_lots:
+            PositionLot.objects.filter(pk__in=spent_lots).delete()
+        PositionLot.objects.bulk_update(
+            [lot for lot in changed_lots.values() if lot.pk and lot.quantity], ['quantity']
+        )
+        if emptied_holdings:
+            PortfolioHolding.objects.filter(pk__in=[h.pk for h in emptied_holdings.values()]).delete()
+        Notification.objects.bulk_create(notifications)
+
+        touched = {portfolios[order.user_id].pk: portfolios[order.user_id] for order in filled}
+        for portfolio in touched.values():
+            portfolio.updated_at = now
+        Portfolio.objects.bulk_update(
+            touched.values(),
+            ['cash_balance', 'total_invested', 'total_value', 'total_profit_loss', 'realized_pnl', 'updated_at'],
+        )
+        record_portfolios(touched.values(), Counter(order.user_id for order in filled))
+        record_trades(trades, portfolios)
+        record_trade_stats(trades)
+
+    return filled
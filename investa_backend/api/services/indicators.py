@@ -0,0 +1,203 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import connection
+from django.db.models import Max
+
+from ..models import StockPrice, TechnicalIndicator
+
+
+RSI_PERIOD = 14
+SMA_PERIOD = 20
+EMA_PERIOD = 20
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_PERIOD, BOLLINGER_WIDTH = 20, 2.0
+ATR_PERIOD = 14
+
+# Bars loaded per symbol; long enough for the EMAs to converge
+DEFAULT_LOOKBACK = 300
+
+
+# Vectorized indicators. Every function takes (symbols x days) float arrays
+# whose missing leading days are NaN, and returns an array of the same shape.
+
+def sma(values, period):
+    """Simple moving average along the time axis"""
+    filled = np.nan_to_num(values)
+    valid = (~np.isnan(values)).astype(np.int64)
+    sums = np.cumsum(filled, axis=1)
+    counts = np.cumsum(valid, axis=1)
+    sums[:, period:] = sums[:, period:] - sums[:, :-period]
+    counts[:, period:] = counts[:, period:] - counts[:, :-period]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts == period, sums / period, np.nan)
+
+
+def rolling_std(values, period):
+    """Population standard deviation over a moving window"""
+    mean = sma(values, period)
+    mean_sq = sma(values * values, period)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def ema(values, period=None, alpha=None):
+    """Exponential moving average, seeded with each symbol's first value.
+
+    The recursion runs along time but every step updates all symbols at once.
+    """
+    if alpha is None:
+        alpha = 2.0 / (period + 1)
+    result = np.empty_like(values)
+    current = np.full(values.shape[0], np.nan)
+    for t in range(values.shape[1]):
+        column = values[:, t]
+        blended = alpha * column + (1 - alpha) * current
+        current = np.where(np.isnan(current), column, np.where(np.isnan(column), current, blended))
+        result[:, t] = current
+    return result
+
+
+def rsi(closes, period=RSI_PERIOD):
+    """Relative Strength Index with Wilder smoothing"""
+    deltas = np.diff(closes, axis=1, prepend=np.nan)
+    gains = ema(np.where(deltas > 0, deltas, np.where(np.isnan(deltas), np.nan, 0.0)), alpha=1.0 / period)
+    losses = ema(np.where(deltas < 0, -deltas, np.where(np.isnan(deltas), np.nan, 0.0)), alpha=1.0 / period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = 100.0 - 100.0 / (1.0 + gains / losses)
+    return np.where(losses == 0, np.where(gains == 0, 50.0, 100.0), result)
+
+
+def macd(closes, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    """Return the MACD line and its signal line"""
+    line = ema(closes, fast) - ema(closes, slow)
+    return line, ema(line, signal)
+
+
+def bollinger_percent_b(closes, period=BOLLINGER_PERIOD, width=BOLLINGER_WIDTH):
+    """Position of the close inside the Bollinger Bands (0 = lower, 100 = upper)"""
+    middle = sma(closes, period)
+    band = width * rolling_std(closes, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent_b = (closes - (middle - band)) / (2 * band) * 100.0
+    return np.where(band > 0, percent_b, np.where(np.isnan(band), np.nan, 50.0))
+
+
+def atr(highs, lows, closes, period=ATR_PERIOD):
+    """Average True Range with Wilder smoothing"""
+    previous = np.roll(closes, 1, axis=1)
+    previous[:, 0] = np.nan
+    true_range = np.fmax(highs - lows, np.fmax(np.abs(highs - previous), np.abs(lows - previous)))
+    return ema(true_range, alpha=1.0 / period)
+
+
+def compute_indicators(highs, lows, closes):
+    """Latest value and signal of every indicator for each symbol row.
+
+    Returns a list (one dict per row) of ``{name: (value, signal, period)}``.
+    """
+    last = closes[:, -1]
+    rsi_values = rsi(closes)[:, -1]
+    macd_line, macd_signal = macd(closes)
+    sma_values = sma(closes, SMA_PERIOD)[:, -1]
+    ema_values = ema(closes, EMA_PERIOD)[:, -1]
+    percent_b = bollinger_percent_b(closes)[:, -1]
+    atr_values = atr(highs, lows, closes)[:, -1]
+
+    results = []
+    for i in range(closes.shape[0]):
+        row = {
+            'RSI': (rsi_values[i], _rsi_signal(rsi_values[i]), RSI_PERIOD),
+            'MACD': (macd_line[i, -1], _cross_signal(macd_line[i, -1], macd_signal[i, -1]), None),
+            'Moving Average': (sma_values[i], _cross_signal(last[i], sma_values[i]), SMA_PERIOD),
+            'EMA': (ema_values[i], _cross_signal(last[i], ema_values[i]), EMA_PERIOD),
+            'Bollinger Bands': (percent_b[i], _band_signal(percent_b[i]), BOLLINGER_PERIOD),
+            'ATR': (atr_values[i], '', ATR_PERIOD),
+        }
+        results.append({name: item for name, item in row.items() if not np.isnan(item[0])})
+    return results
+
+
+def _rsi_signal(value):
+    if value >= 70:
+        return 'Bearish'  # Overbought
+    if value <= 30:
+        return 'Bullish'  # Oversold
+    return 'Neutral'
+
+
+def _cross_signal(value, reference):
+    if np.isnan(reference) or value == reference:
+        return 'Neutral'
+    return 'Bullish' if value > reference else 'Bearish'
+
+
+def _band_signal(percent_b):
+    if percent_b > 100:
+        return 'Bearish'
+    if percent_b < 0:
+        return 'Bullish'
+    return 'Neutral'
+
+
+def load_price_matrix(stock_ids=None, lookback=DEFAULT_LOOKBACK):
+    """Load recent bars into right-aligned (symbols x days) arrays.
+
+    Returns ``(stock_ids, highs, lows, closes)``; each row's latest bar is in
+    the last column and shorter histories are NaN-padded on the left.
+    """
+    prices = StockPrice.objects.all()
+    if stock_ids is not None:
+        prices = prices.filter(stock_id__in=stock_ids)
+    latest = prices.aggregate(latest=Max('date'))['latest']
+    if latest is None:
+        return [], np.empty((0, 0)), np.empty((0, 0)), np.empty((0, 0))
+    # Calendar window comfortably wider than ``lookback`` trading days
+    cutoff = latest - timedelta(days=lookback * 2)
+    rows = (
+        prices.filter(date__gte=cutoff)
+        .order_by('stock_id', 'date')
+        .values_list('stock_id', 'high_price', 'low_price', 'close_price')
+    )
+    # Raw rows skip Django's per-value Decimal converters; numpy takes them as floats
+    with connection.cursor() as cursor:
+        cursor.execute(*rows.query.sql_with_params())
+        data = np.array(cursor.fetchall(), dtype=float).reshape(-1, 4)
+    ids, starts, counts = np.unique(data[:, 0].astype(np.int64), return_index=True, return_counts=True)
+    width = int(min(counts.max(), lookback))
+    matrices = [np.full((len(ids), width), np.nan) for _ in range(3)]
+    for row, (start, count) in enumerate(zip(starts, counts)):
+        take = min(count, width)
+        block = data[start + count - take:start + count]
+        for column, matrix in enumerate(matrices, start=1):
+            matrix[row, width - take:] = block[:, column]
+    return ids.tolist(), *matrices
+
+
+def refresh_indicators(stock_ids=None, lookback=DEFAULT_LOOKBACK):
+    """Recompute indicators for ``stock_ids`` (default all) and upsert them.
+
+    All symbols are computed in one vectorized pass and written with a single
+    bulk upsert on (stock, indicator_name). Returns the number of rows written.
+    """
+    ids, highs, lows, closes = load_price_matrix(stock_ids, lookback)
+    if not ids:
+        return 0
+    rows = []
+    for stock_id, indicators in zip(ids, compute_indicators(highs, lows, closes)):
+        for name, (value, signal, period) in indicators.items():
+            rows.append(TechnicalIndicator(
+                stock_id=stock_id,
+                indicator_name=name,
+                value=Decimal(f'{value:.4f}'),
+                signal=signal,
+                period=period,
+            ))
+    TechnicalIndicator.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['stock', 'indicator_name'],
+        update_fields=['value', 'signal', 'period', 'updated_at'],
+    )
+    return len(rows)
+
@@ -0,0 +1,261 @@
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import chain
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, Count, DecimalField, F, FloatField, Max, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Round
+from django.utils import timezone
+
+from ..models import LeaderboardEntry, Portfolio, Trade
+
+
+TIMEFRAMES = ('all', 'monthly', 'weekly')
+ALL_TIME_START = date(2000, 1, 1)
+STARTING_BALANCE = Decimal('10000.00')  # Portfolio.cash_balance default
+CENT = Decimal('0.01')
+REBUILD_BATCH_SIZE = 2000
+RERANK_BATCH_SIZE = 2000  # Rank updates per write transaction
+
+# Cash until something is invested; apply_fills keeps total_value current after that
+PORTFOLIO_VALUE = Case(When(total_invested=0, then=F('cash_balance')), default=F('total_value'))
+
+
+def period_start(timeframe, today=None):
+    """First day of the current week (Monday), month, or the all-time epoch"""
+    today = today or timezone.localdate()
+    if timeframe == 'weekly':
+        return today - timedelta(days=today.weekday())
+    if timeframe == 'monthly':
+        return today.replace(day=1)
+    return ALL_TIME_START
+
+
+def portfolio_value(portfolio):
+    return portfolio.cash_balance if not portfolio.total_invested else portfolio.total_value
+
+
+def growth_percentage(value, start_value):
+    if not start_value:
+        return Decimal('0.00')
+    return ((value - start_value) / start_value * 100).quantize(CENT)
+
+
+def _new_entry(timeframe, user_id, start, value):
+    start_value = STARTING_BALANCE if timeframe == 'all' else value
+    return LeaderboardEntry(
+        timeframe=timeframe, user_id=user_id, period_start=start,
+        start_value=start_value, portfolio_value=value,
+    )
+
+
+def _save_entries(entries):
+    """Upsert entries on (timeframe, user), leaving their rank alone"""
+    now = timezone.now()
+    for entry in entries:
+        entry.portfolio_growth_percentage = growth_percentage(entry.portfolio_value, entry.start_value)
+        entry.updated_at = now
+    LeaderboardEntry.objects.bulk_create(
+        entries,
+        batch_size=REBUILD_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['timeframe', 'user'],
+        update_fields=['period_start', 'start_value', 'portfolio_value',
+                       'portfolio_growth_percentage', 'total_trades', 'updated_at'],
+    )
+
+
+def record_portfolios(portfolios, trade_counts=None):
+    """Fold fresh portfolio valuations, and any new trades, into every timeframe.
+
+    ``trade_counts`` maps user id to the number of trades just executed.
+    Entries from a past week or month roll over first, starting the new
+    period from their last known value. Ranks are left to the next rerank.
+    """
+    by_user = {portfolio.user_id: portfolio for portfolio in portfolios}
+    if not by_user:
+        return
+    trade_counts = trade_counts or {}
+    today = timezone.localdate()
+    existing = {
+        (entry.timeframe, entry.user_id): entry
+        for entry in LeaderboardEntry.objects.filter(user_id__in=list(by_user))
+    }
+    entries = []
+    for timeframe in TIMEFRAMES:
+        start = period_start(timeframe, today)
+        for user_id, portfolio in by_user.items():
+            value = portfolio_value(portfolio)
+            entry = existing.get((timeframe, user_id))
+            if entry is None:
+                entry = _new_entry(timeframe, user_id, start, value)
+            elif entry.period_start < start:
+                entry.period_start = start
+                entry.start_value = entry.portfolio_value
+                entry.total_trades = 0
+            entry.portfolio_value = value
+            entry.total_trades += trade_counts.get(user_id, 0)
+            entries.append(entry)
+    _save_entries(entries)
+
+
+def sync_portfolio_values(portfolio_ids):
+    """Copy the current value of ``portfolio_ids`` into their users' entries.
+
+    The set-based counterpart of ``record_portfolios`` for revaluation runs:
+    a couple of UPDATEs per call however many portfolios are involved.
+    Trade counts and ranks are left alone.
+    """
+    money = DecimalField(max_digits=15, decimal_places=2)
+    entries = LeaderboardEntry.objects.filter(user__portfolio__in=list(portfolio_ids))
+    for timeframe in TIMEFRAMES:
+        _roll_over(entries, timeframe)
+    value = Subquery(
+        Portfolio.objects.filter(user_id=OuterRef('user_id'))
+        .annotate(value=PORTFOLIO_VALUE).values('value'),
+        output_field=money,
+    )
+    entries.update(
+        portfolio_value=value,
+        portfolio_growth_percentage=Case(
+            When(start_value=0, then=Value(Decimal('0.00'))),
+            default=Round((value - F('start_value')) * 100 / Cast('start_value', FloatField()), 2),
+            output_field=DecimalField(max_digits=9, decimal_places=2),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def _roll_over(entries, timeframe):
+    """Start a new period for ``entries`` of ``timeframe`` whose period has ended"""
+    start = period_start(timeframe)
+    entries.filter(timeframe=timeframe, period_start__lt=start).update(
+        period_start=start, start_value=F('portfolio_value'),
+        portfolio_growth_percentage=0, total_trades=0,
+    )
+
+
+def rebuild_leaderboard(timeframes=TIMEFRAMES):
+    """Recompute every user's entries from Portfolio and Trade, then rerank.
+
+    Entries already in the current period keep their starting value, since
+    it can't be recovered from current balances. Returns the entries written.
+    """
+    today = timezone.localdate()
+    written = 0
+    for timeframe in timeframes:
+        start = period_start(timeframe, today)
+        trades = Trade.objects.all()
+        if timeframe != 'all':
+            trades = trades.filter(executed_at__gte=timezone.make_aware(datetime.combine(start, datetime.min.time())))
+        trade_counts = dict(trades.values('user_id').annotate(count=Count('pk')).values_list('user_id', 'count'))
+        start_values = dict(
+            LeaderboardEntry.objects.filter(timeframe=timeframe, period_start=start)
+            .values_list('user_id', 'start_value')
+        )
+        batch = []
+        rows = Portfolio.objects.annotate(value=PORTFOLIO_VALUE).values_list('user_id', 'value')
+        for user_id, value in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            entry = _new_entry(timeframe, user_id, start, value)
+            if user_id in start_values:
+                entry.start_value = start_values[user_id]
+            entry.total_trades = trade_counts.get(user_id, 0)
+            batch.append(entry)
+            if len(batch) == REBUILD_BATCH_SIZE:
+                with transaction.atomic():
+                    _save_entries(batch)
+                written += len(batch)
+                batch = []
+        with transaction.atomic():
+            _save_entries(batch)
+        written += len(batch)
+        rerank(timeframe)
+    return written
+
+
+def rerank(timeframe):
+    """Roll over a finished period and renumber the ranks of ``timeframe``.
+
+    New positions come from one read of the (timeframe, growth, user) index
+    with a window function; only rows whose rank moved are written, in
+    transactions of RERANK_BATCH_SIZE so order fills never wait on the whole
+    rerank (pages read mid-rerank may briefly mix old and new ranks). Ties on
+    growth are broken by user id so ranks are unique and stable. Returns the
+    number of rows renumbered.
+    """
+    table = connection.ops.quote_name(LeaderboardEntry._meta.db_table)
+    entries = LeaderboardEntry.objects.all()
+    # Finding rows to roll over scans the timeframe, so look before taking the write lock
+    if entries.filter(timeframe=timeframe, period_start__lt=period_start(timeframe)).exists():
+        with transaction.atomic():
+            _roll_over(entries, timeframe)
+    moved = 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT id, position FROM ('
+            f'  SELECT id, "rank", ROW_NUMBER() OVER (ORDER BY portfolio_growth_percentage DESC, user_id) AS position'
+            f'  FROM {table} WHERE timeframe = %s'
+            f') WHERE "rank" IS DISTINCT FROM position',
+            [timeframe],
+        )
+        ids, ranks = array('q'), array('q')
+        while rows := cursor.fetchmany(RERANK_BATCH_SIZE):
+            for pk, rank in rows:
+                ids.append(pk)
+                ranks.append(rank)
+    for offset in range(0, len(ids), RERANK_BATCH_SIZE):
+        batch = list(zip(ids[offset:offset + RERANK_BATCH_SIZE], ranks[offset:offset + RERANK_BATCH_SIZE]))
+        # One joined UPDATE per batch; bulk_update's CASE over the batch grows quadratically
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET "rank" = moved.column2 FROM (VALUES '
+                + ', '.join(['(%s, %s)'] * len(batch))
+                + f') AS moved WHERE {table}.id = moved.column1',
+                list(chain.from_iterable(batch)),
+            )
+        moved += len(batch)
+    cache.set(_version_key(timeframe), time.time_ns(), None)
+    return moved
+
+
+def pending_entry(timeframe, portfolio):
+    """Unsaved, unranked entry for a portfolio the leaderboard hasn't recorded yet"""
+    entry = _new_entry(timeframe, portfolio.user_id, period_start(timeframe), portfolio_value(portfolio))
+    entry.portfolio_growth_percentage = growth_percentage(entry.portfolio_value, entry.start_value)
+    return entry
+
+
+def _version_key(timeframe):
+    return f'leaderboard:{timeframe}:version'
+
+
+def ranked_entries(timeframe, first_rank, last_rank):
+    """Entries ranked ``first_rank``..``last_rank`` via the (timeframe, rank) index"""
+    return (
+        LeaderboardEntry.objects.filter(timeframe=timeframe, rank__gte=first_rank, rank__lte=last_rank)
+        .select_related('user')
+        .only('id', 'timeframe', 'period_start', 'start_value', 'portfolio_value',
+              'portfolio_growth_percentage', 'total_trades', 'rank',
+              'user__id', 'user__username', 'user__first_name', 'user__last_name')
+        .order_by('rank')
+    )
+
+
+def top_entries(timeframe, serialize):
+    """Cached ``(ranked count, serialized top LEADERBOARD_TOP_N entries)``.
+
+    Cached until the next rerank or LEADERBOARD_CACHE_TTL seconds, whichever
+    comes first.
+    """
+    version = cache.get_or_set(_version_key(timeframe), time.time_ns(), None)
+    key = f'leaderboard:{timeframe}:top:{version}'
+    top = cache.get(key)
+    if top is None:
+        count = LeaderboardEntry.objects.filter(timeframe=timeframe).aggregate(count=Max('rank'))['count'] or 0
+        top = (count, list(serialize(ranked_entries(timeframe, 1, settings.LEADERBOARD_TOP_N))))
+        cache.set(key, top, settings.LEADERBOARD_CACHE_TTL)
+    return top
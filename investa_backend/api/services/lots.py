@@ -0,0 +1,60 @@
+from collections import deque
+from decimal import Decimal
+
+from ..models import PositionLot
+
+
+CENT = Decimal('0.01')
+
+
+def load_lots(holdings):
+    """Lock and load the open lots of ``holdings`` as one deque per holding.
+
+    ``holdings`` maps keys to holdings and the deques come back under the
+    same keys. Each deque runs oldest to newest, so FIFO takes from the left
+    and LIFO from the right; a sell only touches the lots it consumes.
+    """
+    books = {key: deque() for key in holdings}
+    by_holding = {holding.pk: books[key] for key, holding in holdings.items()}
+    if by_holding:
+        for lot in (
+            PositionLot.objects.select_for_update()
+            .filter(holding_id__in=list(by_holding))
+            .order_by('holding_id', 'acquired_at', 'pk')
+        ):
+            by_holding[lot.holding_id].append(lot)
+    return books
+
+
+def consume_lots(lots, quantity, method, fallback_price):
+    """Take ``quantity`` shares off a holding's ``lots`` deque.
+
+    FIFO and LIFO shares are priced at their lots; average cost consumes
+    lots oldest first only to keep them in step with the holding. Shares
+    the lots don't cover (holdings older than the ledger) are priced at
+    ``fallback_price``. Returns the lot cost of the shares and the lots
+    changed, emptied ones included.
+    """
+    from_newest = method == 'LIFO'
+    cost = Decimal('0.00')
+    changed = []
+    while quantity and lots:
+        lot = lots[-1] if from_newest else lots[0]
+        used = min(lot.quantity, quantity)
+        lot.quantity -= used
+        quantity -= used
+        cost += used * lot.price
+        changed.append(lot)
+        if not lot.quantity:
+            lots.pop() if from_newest else lots.popleft()
+    return cost + quantity * fallback_price, changed
+
+
+def remaining_basis(method, invested, held, sold, lot_cost):
+    """Cost basis left on a holding of ``held`` shares after selling ``sold``"""
+    if sold == held:
+        return Decimal('0.00')
+    if method == 'AVERAGE':
+        # Reduce cost basis proportionally to the shares sold
+        return ((invested / held) * (held - sold)).quantize(CENT)
+    return max(invested - lot_cost, Decimal('0.00')).quantize(CENT)
@@ -0,0 +1,246 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Order
+from .execution import apply_fills
+
+
+# Lightweight view of a resting order kept in the book
+RestingOrder = namedtuple('RestingOrder', ['id', 'side', 'order_type', 'price', 'stop_price'])
+
+
+class OrderBook:
+    """Resting LIMIT, STOP and STOP_LIMIT orders for one stock.
+
+    Limits sit in price-priority heaps (highest bid / lowest ask first) and
+    stops in trigger heaps ordered by how soon the price reaches them, so a
+    price update only pops the orders it actually crosses. Cancelled orders
+    are dropped lazily when they surface at the top of a heap.
+    """
+
+    def __init__(self):
+        self.buy_limits = []   # (-price, seq, order_id): fills when price <= limit
+        self.sell_limits = []  # (price, seq, order_id): fills when price >= limit
+        self.buy_stops = []    # (stop, seq, order_id): triggers when price >= stop
+        self.sell_stops = []   # (-stop, seq, order_id): triggers when price <= stop
+        self.orders = {}
+        self.last_price = None
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.orders)
+
+    def add(self, resting):
+        if resting.id in self.orders:
+            return
+        self.orders[resting.id] = resting
+        seq = next(self._seq)
+        if resting.order_type == 'LIMIT':
+            self._push_limit(resting, seq)
+        elif resting.side == 'BUY':
+            heapq.heappush(self.buy_stops, (resting.stop_price, seq, resting.id))
+        else:
+            heapq.heappush(self.sell_stops, (-resting.stop_price, seq, resting.id))
+
+    def remove(self, order_id):
+        return self.orders.pop(order_id, None)
+
+    def cross(self, price):
+        """Pop every order the new price crosses.
+
+        Returns the crossed orders and the ids of the stop-limits the price
+        triggered, which now rest as limits.
+        """
+        self.last_price = price
+        crossed, triggered = [], []
+
+        # Triggered stops become market orders; stop-limits rest as limits
+        for order_id in itertools.chain(
+            self._pop_while(self.buy_stops, lambda key: key <= price),
+            self._pop_while(self.sell_stops, lambda key: -key >= price),
+        ):
+            resting = self.orders[order_id]
+            if resting.order_type == 'STOP':
+                del self.orders[order_id]
+                crossed.append(resting)
+            else:
+                resting = resting._replace(order_type='LIMIT')
+                self.orders[order_id] = resting
+                self._push_limit(resting, next(self._seq))
+                triggered.append(order_id)
+
+        for order_id in itertools.chain(
+            self._pop_while(self.buy_limits, lambda key: -key >= price),
+            self._pop_while(self.sell_limits, lambda key: key <= price),
+        ):
+            crossed.append(self.orders.pop(order_id))
+        return crossed, triggered
+
+    def _push_limit(self, resting, seq):
+        if resting.side == 'BUY':
+            heapq.heappush(self.buy_limits, (-resting.price, seq, resting.id))
+        else:
+            heapq.heappush(self.sell_limits, (resting.price, seq, resting.id))
+
+    def _pop_while(self, heap, crosses):
+        popped = []
+        while heap:
+            key, _, order_id = heap[0]
+            if order_id not in self.orders:
+                heapq.heappop(heap)
+                continue
+            if not crosses(key):
+                break
+            heapq.heappop(heap)
+            popped.append(order_id)
+        return popped
+
+
+class MatchingEngine:
+    """Per-process order books that fill resting orders on price changes.
+
+    Books are loaded from PENDING orders on first use and reloaded every
+    ``MATCHING_BOOK_RELOAD_INTERVAL`` seconds, which picks up orders rested
+    by other worker processes; in between, new orders are added by
+    ``submit`` and removed by ``cancel``. Triggered stop-limits are stamped
+    with ``triggered_at`` so a reload rests them as limits. Fills are applied
+    through ``apply_fills``, which re-checks each order's status under a row
+    lock, so an order crossed in two processes is still only filled once;
+    crossed orders it leaves PENDING go back into their book.
+    """
+
+    def __init__(self, reload_interval=None):
+        self._books = {}
+        self._lock = threading.RLock()
+        self._in_flight = {}  # Crossed, awaiting fill: order id -> (stock id, entry)
+        self._loaded_at = None
+        self.reload_interval = (
+            settings.MATCHING_BOOK_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        )
+
+    def book(self, stock_id):
+        with self._lock:
+            self._ensure_loaded()
+            return self._books.setdefault(stock_id, OrderBook())
+
+    def rest(self, order, current_price=None):
+        """Add a committed non-market order to its book.
+
+        Returns the ``{order_id: price}`` fills for whatever the current price
+        already crosses, for the caller to pass to ``fill``.
+        """
+        resting = RestingOrder(order.pk, order.side, order.order_type, order.price, order.stop_price)
+        with self._lock:
+            self._ensure_loaded()
+            book = self._books.setdefault(order.stock_id, OrderBook())
+            book.add(resting)
+            if current_price is None:
+                current_price = book.last_price
+            crossed, triggered = book.cross(current_price) if current_price is not None else ([], [])
+            self._record_triggers(triggered)
+            self._in_flight.update((entry.id, (order.stock_id, entry)) for entry in crossed)
+        return {entry.id: current_price for entry in crossed}
+
+    def submit(self, orders):
+        """Rest committed non-market ``(order, current_price)`` pairs and fill the marketable ones"""
+        fills = {}
+        for order, current_price in orders:
+            fills.update(self.rest(order, current_price))
+        return self.fill(fills)
+
+    def submit_on_commit(self, orders):
+        """``submit`` once the current transaction commits.
+
+        Resting an uncommitted order would let a concurrent ``on_price`` pop
+        it before ``apply_fills`` can see the row.
+        """
+        orders = list(orders)
+        if orders:
+            transaction.on_commit(lambda: self.submit(orders))
+
+    def cancel(self, order):
+        with self._lock:
+            book = self._books.get(order.stock_id)
+            if book is not None:
+                book.remove(order.pk)
+
+    def on_price(self, stock_id, price):
+        """Fill every resting order crossed by a new price for ``stock_id``"""
+        with self._lock:
+            self._ensure_loaded()
+            book = self._books.get(stock_id)
+            if book is None or book.last_price == price:
+                return []
+            crossed, triggered = book.cross(price)
+            self._record_triggers(triggered)
+            self._in_flight.update((entry.id, (stock_id, entry)) for entry in crossed)
+        return self.fill({entry.id: price for entry in crossed})
+
+    def fill(self, fills):
+        """``apply_fills`` for crossed orders, putting the ones it leaves PENDING back in their books"""
+        with self._lock:
+            crossed = {order_id: self._in_flight.pop(order_id) for order_id in fills if order_id in self._in_flight}
+        try:
+            filled = apply_fills(fills)
+        except Exception:
+            self._restore(crossed)
+            raise
+        for order in filled:
+            crossed.pop(order.pk, None)
+        self._restore(crossed)
+        return filled
+
+    def reset(self):
+        with self._lock:
+            self._books.clear()
+            self._in_flight.clear()
+            self._loaded_at = None
+
+    def _record_triggers(self, order_ids):
+        # Under the lock, so a reload can't read the order as an untriggered stop meanwhile
+        if order_ids:
+            Order.objects.filter(pk__in=order_ids, triggered_at__isnull=True).update(triggered_at=timezone.now())
+
+    def _restore(self, crossed):
+        if not crossed:
+            return
+        # Orders rejected or cancelled meanwhile stay out
+        pending = Order.objects.filter(pk__in=list(crossed), status='PENDING').values_list('pk', flat=True)
+        with self._lock:
+            for order_id in pending:
+                stock_id, entry = crossed[order_id]
+                self._books.setdefault(stock_id, OrderBook()).add(entry)
+
+    def _ensure_loaded(self):
+        now = time.monotonic()
+        if self._loaded_at is not None and (
+            self.reload_interval <= 0 or now - self._loaded_at < self.reload_interval
+        ):
+            return
+        pending = (
+            Order.objects.filter(status='PENDING')
+            .exclude(order_type='MARKET')
+            .order_by('created_at', 'pk')
+            .values_list('pk', 'stock_id', 'side', 'order_type', 'price', 'stop_price', 'triggered_at')
+        )
+        books = {}
+        for pk, stock_id, side, order_type, price, stop_price, triggered_at in pending:
+            if triggered_at is not None:
+                order_type = 'LIMIT'
+            book = books.setdefault(stock_id, OrderBook())
+            book.add(RestingOrder(pk, side, order_type, price, stop_price))
+        # A reload keeps each book's last price, so an unchanged price is still a no-op
+        for stock_id, old in self._books.items():
+            books.setdefault(stock_id, OrderBook()).last_price = old.last_price
+        self._books = books
+        self._loaded_at = now
+
+
+matching_engine = MatchingEngine()
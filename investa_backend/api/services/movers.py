@@ -0,0 +1,114 @@
+import bisect
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+
+from ..models import MarketData
+
+
+# What the index keeps per stock
+MoverEntry = namedtuple('MoverEntry', ['change_percentage', 'volume', 'sector'])
+
+RANKINGS = ('change', 'volume')
+
+
+class MoversIndex:
+    """Stocks kept sorted by change percentage and by volume.
+
+    Each ranking is a list of ``(value, stock_id)`` tuples in ascending order,
+    kept both market-wide and per sector, so the top/bottom ``k`` is a slice
+    and a quote update is a binary search plus a list insert/delete. Loaded
+    from MarketData on first use and reloaded after ``MOVERS_INDEX_TTL``
+    seconds to pick up writes made by other processes.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._rankings = defaultdict(list)  # (ranking, sector key) -> sorted list
+        self._loaded_at = None
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else settings.MOVERS_INDEX_TTL
+
+    def update(self, stock_id, change_percentage, volume, sector):
+        with self._lock:
+            if self._loaded_at is None:
+                return  # Picked up by the first load
+            self._remove(stock_id)
+            self._insert(stock_id, MoverEntry(change_percentage, volume, sector))
+
+    def update_quote(self, market_data):
+        """Index a MarketData row (with its stock loaded)"""
+        self.update(market_data.stock_id, market_data.change_percentage,
+                    market_data.volume, market_data.stock.sector)
+
+    def remove(self, stock_id):
+        with self._lock:
+            self._remove(stock_id)
+
+    def top(self, ranking='change', limit=10, sector=None, ascending=False):
+        """Stock ids of the ``limit`` highest (or lowest) ranked stocks"""
+        with self._lock:
+            self._ensure_fresh()
+            ranked = self._rankings.get((ranking, _sector_key(sector)), [])
+            if ascending:
+                window = ranked[:limit]
+            else:
+                window = ranked[len(ranked) - limit:][::-1] if limit else []
+            return [stock_id for _, stock_id in window]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._rankings.clear()
+            self._loaded_at = None
+
+    def _keys(self, stock_id, entry):
+        sector = _sector_key(entry.sector)
+        for key in (None, sector) if sector is not None else (None,):
+            yield ('change', key), (entry.change_percentage, stock_id)
+            yield ('volume', key), (entry.volume, stock_id)
+
+    def _insert(self, stock_id, entry):
+        self._entries[stock_id] = entry
+        for ranking, item in self._keys(stock_id, entry):
+            bisect.insort(self._rankings[ranking], item)
+
+    def _remove(self, stock_id):
+        entry = self._entries.pop(stock_id, None)
+        if entry is None:
+            return
+        for ranking, item in self._keys(stock_id, entry):
+            ranked = self._rankings[ranking]
+            index = bisect.bisect_left(ranked, item)
+            if index < len(ranked) and ranked[index] == item:
+                del ranked[index]
+
+    def _ensure_fresh(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        rows = MarketData.objects.values_list(
+            'stock_id', 'change_percentage', 'volume', 'stock__sector'
+        )
+        self._entries.clear()
+        self._rankings.clear()
+        for stock_id, change_percentage, volume, sector in rows:
+            entry = MoverEntry(change_percentage, volume, sector)
+            self._entries[stock_id] = entry
+            for ranking, item in self._keys(stock_id, entry):
+                self._rankings[ranking].append(item)
+        for ranked in self._rankings.values():
+            ranked.sort()
+        self._loaded_at = time.monotonic()
+
+
+def _sector_key(sector):
+    return sector.strip().lower() if sector else None
+
+
+movers_index = MoversIndex()
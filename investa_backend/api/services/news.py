@@ -0,0 +1,93 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, Exists, OuterRef, Q
+from django.db.models.expressions import RawSQL
+
+from ..models import StockNews
+
+
+NEWS_TABLE = StockNews._meta.db_table
+NEWS_FTS_TABLE = f'{NEWS_TABLE}_fts'  # SQLite FTS5 table, see migration 0018
+# Must match the PostgreSQL GIN index expression from migration 0018
+NEWS_SEARCH_VECTOR = "to_tsvector('english', title || ' ' || summary)"
+TERMS = re.compile(r'\w+')
+SYMBOLS_ATTR = '_linked_symbols'  # Set by attach_symbols, read by linked_symbols
+# Up to this many matches (of a search, or of a stock's links) are fetched
+# and sorted; beyond it the feed's own (published_at, id) index is walked and
+# each story checked against them
+SORTED_MATCHES = 1000
+
+
+def search_news(queryset, query):
+    """Narrow a StockNews queryset to items whose title or summary match ``query``.
+
+    Every word must appear and the last may be a prefix, so partial input
+    already matches. SQLite reads the FTS5 index and PostgreSQL the GIN
+    full-text index; other backends fall back to ``icontains``. Matches are
+    an ``id IN (...)`` filter, so ordering and pagination stay the caller's.
+
+    SQLite has no statistics to tell a rare term from a common one, so a
+    capped count picks the plan: few matches are read by rowid and sorted,
+    many are probed while scanning the feed in order, which stops as soon
+    as a page is full.
+    """
+    terms = TERMS.findall(query)
+    if not terms:
+        return queryset
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        matches = f'SELECT rowid FROM {NEWS_FTS_TABLE} WHERE {NEWS_FTS_TABLE} MATCH %s'
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM ({matches} LIMIT %s)', [match, SORTED_MATCHES + 1])
+            sparse = cursor.fetchone()[0] <= SORTED_MATCHES
+        if sparse:
+            return queryset.filter(pk__in=RawSQL(matches, [match]))
+        # Unary + keeps SQLite from driving the query off the id IN list
+        return queryset.filter(RawSQL(
+            f'+"{NEWS_TABLE}"."id" IN ({matches})', [match], output_field=BooleanField()
+        ))
+    if connection.vendor == 'postgresql':
+        match = ' & '.join(terms) + ':*'
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT id FROM {NEWS_TABLE} WHERE {NEWS_SEARCH_VECTOR} @@ to_tsquery('english', %s)", [match]
+        ))
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(summary__icontains=term)
+    return queryset.filter(condition)
+
+
+def filter_stock(queryset, stock_id):
+    """Narrow a StockNews queryset to stories linked to ``stock_id``.
+
+    As in ``search_news``, a capped count picks the SQLite plan: a stock with
+    few stories is read through the link table and sorted, one with many is
+    probed per story while walking the feed index in order.
+    """
+    links = StockNews.stocks.through.objects.filter(stock_id=stock_id)
+    if connection.vendor == 'sqlite' and links[:SORTED_MATCHES + 1].count() > SORTED_MATCHES:
+        return queryset.filter(Exists(links.filter(stocknews_id=OuterRef('pk'))))
+    return queryset.filter(stocks=stock_id)
+
+
+def attach_symbols(stories):
+    """Preload the linked symbols of ``stories`` in one query so serializers look none up"""
+    symbols = {story.pk: [] for story in stories}
+    links = (
+        StockNews.stocks.through.objects.filter(stocknews_id__in=symbols)
+        .order_by('stock__symbol').values_list('stocknews_id', 'stock__symbol')
+    )
+    for story_id, symbol in links:
+        symbols[story_id].append(symbol)
+    for story in stories:
+        setattr(story, SYMBOLS_ATTR, symbols[story.pk])
+    return stories
+
+
+def linked_symbols(story):
+    """Symbols of every stock ``story`` is linked to, preloaded or queried"""
+    symbols = getattr(story, SYMBOLS_ATTR, None)
+    if symbols is None:
+        symbols = list(story.stocks.order_by('symbol').values_list('symbol', flat=True))
+    return symbols
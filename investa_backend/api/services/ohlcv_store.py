@@ -0,0 +1,173 @@
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from ..models import StockPrice
+
+
+# One fixed-size record per trading day, stored date-ascending
+OHLCV_DTYPE = np.dtype([
+    ('date', 'datetime64[D]'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'i8'),
+])
+
+STOCK_PRICE_COLUMNS = ('date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
+
+
+class OHLCVStore:
+    """Columnar OHLCV history, one memory-mapped record file per symbol.
+
+    Each ``<SYMBOL>.ohlcv`` file is a headerless array of ``OHLCV_DTYPE``
+    records sorted by date, so new bars are appended in place and range
+    queries are a binary search plus a slice of the mapped file. Symbols
+    without a file are served from ``StockPrice`` by the callers.
+    """
+
+    suffix = '.ohlcv'
+
+    def __init__(self, root=None):
+        self._root = root
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    @property
+    def root(self):
+        return Path(self._root or settings.OHLCV_STORE_DIR)
+
+    def path(self, symbol):
+        return self.root / f'{symbol.upper()}{self.suffix}'
+
+    def exists(self, symbol):
+        return self.path(symbol).exists()
+
+    def symbols(self):
+        if not self.root.exists():
+            return []
+        return sorted(p.stem for p in self.root.glob(f'*{self.suffix}'))
+
+    def read(self, symbol):
+        """Return the whole mapped history for ``symbol`` or None if absent"""
+        path = self.path(symbol)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if stat.st_size == 0:
+            return np.empty(0, dtype=OHLCV_DTYPE)
+        key = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is None or cached[0] != key:
+                cached = (key, np.memmap(path, dtype=OHLCV_DTYPE, mode='r'))
+                self._maps[path] = cached
+        return cached[1]
+
+    def range(self, symbol, start=None, end=None):
+        """Return the bars with ``start <= date <= end`` without copying"""
+        bars = self.read(symbol)
+        if bars is None:
+            return None
+        dates = bars['date']
+        lo = np.searchsorted(dates, np.datetime64(start, 'D'), side='left') if start else 0
+        hi = np.searchsorted(dates, np.datetime64(end, 'D'), side='right') if end else len(bars)
+        return bars[lo:hi]
+
+    def tail(self, symbol, count):
+        """Return the latest ``count`` bars"""
+        bars = self.read(symbol)
+        if bars is None:
+            return None
+        return bars[max(len(bars) - count, 0):]
+
+    def write(self, symbol, bars):
+        """Replace the history for ``symbol`` atomically"""
+        bars = np.sort(np.asarray(bars, dtype=OHLCV_DTYPE), order='date')
+        # Keep the last row for any repeated date
+        _, last = np.unique(bars['date'][::-1], return_index=True)
+        bars = bars[len(bars) - 1 - last]
+        path = self.path(symbol)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        bars.tofile(tmp)
+        os.replace(tmp, path)
+        self._forget(path)
+
+    def append(self, symbol, bars):
+        """Add bars for ``symbol``.
+
+        Bars newer than the stored history are appended to the file; any bar
+        that would land inside it (a correction or backfill) forces a rewrite.
+        Does nothing when the symbol has no store file yet.
+        """
+        bars = np.asarray(bars, dtype=OHLCV_DTYPE)
+        if not len(bars):
+            return
+        current = self.read(symbol)
+        if current is None:
+            return
+        bars = np.sort(bars, order='date')
+        if len(current) and bars['date'][0] <= current['date'][-1]:
+            self.write(symbol, np.concatenate([np.asarray(current), bars]))
+            return
+        path = self.path(symbol)
+        with open(path, 'ab') as handle:
+            bars.tofile(handle)
+        self._forget(path)
+
+    def build(self, stock):
+        """Write the store file for ``stock`` from its StockPrice rows"""
+        rows = stock.prices.order_by('date').values_list(*STOCK_PRICE_COLUMNS)
+        bars = np.array(list(rows), dtype=OHLCV_DTYPE)
+        self.write(stock.symbol, bars)
+        return len(bars)
+
+    def _forget(self, path):
+        with self._lock:
+            self._maps.pop(path, None)
+
+
+ohlcv_store = OHLCVStore()
+
+
+def bars_from_prices(prices):
+    """Convert StockPrice instances to store records"""
+    return np.array(
+        [(p.date, p.open_price, p.high_price, p.low_price, p.close_price, p.volume) for p in prices],
+        dtype=OHLCV_DTYPE,
+    )
+
+
+def bars_to_rows(stock, bars):
+    """Render store records like StockPriceSerializer rows, without ``id`` and ``created_at``"""
+    return [
+        {
+            'stock': stock.pk,
+            'date': str(date),
+            'open_price': f'{open_:.2f}',
+            'high_price': f'{high:.2f}',
+            'low_price': f'{low:.2f}',
+            'close_price': f'{close:.2f}',
+            'volume': int(volume),
+        }
+        for date, open_, high, low, close, volume in bars.tolist()
+    ]
+
+
+def price_bars(stock, start=None, end=None):
+    """Return ``stock``'s bars in [start, end] from the store, or the ORM"""
+    bars = ohlcv_store.range(stock.symbol, start, end)
+    if bars is not None:
+        return bars
+    prices = StockPrice.objects.filter(stock=stock).order_by('date')
+    if start:
+        prices = prices.filter(date__gte=start)
+    if end:
+        prices = prices.filter(date__lte=end)
+    return np.array(list(prices.values_list(*STOCK_PRICE_COLUMNS)), dtype=OHLCV_DTYPE)
@@ -0,0 +1,251 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.utils import timezone
+
+from ..models import Portfolio, Trade, TradingPerformance
+from .leaderboard import PORTFOLIO_VALUE, STARTING_BALANCE, growth_percentage, portfolio_value
+
+
+CENT = Decimal('0.01')
+ZERO = Decimal('0.00')
+REBUILD_CHUNK_SIZE = 1000
+TRADE_STATS = (
+    'total_trades', 'successful_trades', 'total_profit_loss', 'best_trade_profit', 'worst_trade_loss',
+    'total_commission_paid', 'total_trade_value', 'average_trade_size', 'largest_position',
+)
+PERFORMANCE_TABLE = TradingPerformance._meta.db_table
+# Folds one batch of a user's trades into the running statistics; every
+# right-hand side reads the pre-update row, so the average uses the old sums
+APPLY_TRADES_SQL = (
+    f'UPDATE {PERFORMANCE_TABLE} SET '
+    'total_trades = total_trades + %(count)s, '
+    'successful_trades = successful_trades + %(successful)s, '
+    'total_profit_loss = total_profit_loss + %(realized)s, '
+    'best_trade_profit = CASE WHEN best_trade_profit < %(best)s THEN %(best)s ELSE best_trade_profit END, '
+    'worst_trade_loss = CASE WHEN worst_trade_loss > %(worst)s THEN %(worst)s ELSE worst_trade_loss END, '
+    'total_commission_paid = total_commission_paid + %(commission)s, '
+    'total_trade_value = total_trade_value + %(traded)s, '
+    'average_trade_size = ROUND((total_trade_value + %(traded)s) * 1.0 / (total_trades + %(count)s), 2), '
+    'largest_position = CASE WHEN largest_position < %(largest)s THEN %(largest)s ELSE largest_position END, '
+    'portfolio_value = %(value)s, portfolio_growth_percentage = %(growth)s, updated_at = %(now)s '
+    'WHERE user_id = %(user_id)s'
+)
+SET_STATS_SQL = (
+    f'UPDATE {PERFORMANCE_TABLE} SET '
+    + ', '.join(f'{field} = %({field})s' for field in TRADE_STATS + ('portfolio_value', 'portfolio_growth_percentage'))
+    + ', updated_at = %(now)s WHERE user_id = %(user_id)s'
+)
+SET_REALIZED_SQL = f'UPDATE {Trade._meta.db_table} SET realized_pnl = %s WHERE id = %s'
+
+
+def realized_pnl(total_amount, invested_before, invested_after):
+    """Profit of a SELL fill: proceeds less the cost basis it removed"""
+    return total_amount - (invested_before - invested_after)
+
+
+def record_trades(trades, portfolios):
+    """Fold freshly executed trades into their users' TradingPerformance rows.
+
+    Must run inside the transaction that created ``trades``. Each trade costs
+    O(1): trades are summed per user in memory, then every user's row is
+    moved by its deltas in one statement, in user order so concurrent
+    batches can't deadlock. ``portfolios`` maps user id to the portfolio
+    after the fills and supplies the value and growth columns.
+    """
+    deltas = {}
+    for trade in trades:
+        delta = deltas.get(trade.user_id)
+        if delta is None:
+            delta = deltas[trade.user_id] = {
+                'count': 0, 'successful': 0, 'realized': ZERO, 'best': ZERO, 'worst': ZERO,
+                'commission': ZERO, 'traded': ZERO, 'largest': ZERO,
+            }
+        delta['count'] += 1
+        delta['commission'] += trade.commission
+        delta['traded'] += trade.total_amount
+        delta['largest'] = max(delta['largest'], trade.total_amount)
+        if trade.realized_pnl is not None:
+            delta['realized'] += trade.realized_pnl
+            delta['successful'] += trade.realized_pnl > 0
+            delta['best'] = max(delta['best'], trade.realized_pnl)
+            delta['worst'] = min(delta['worst'], trade.realized_pnl)
+    if not deltas:
+        return
+
+    TradingPerformance.objects.bulk_create(
+        [TradingPerformance(user_id=user_id) for user_id in deltas], ignore_conflicts=True
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    params = []
+    for user_id in sorted(deltas):
+        delta = deltas[user_id]
+        value = portfolio_value(portfolios[user_id])
+        delta.update(
+            user_id=user_id, now=now,
+            value=value, growth=growth_percentage(value, STARTING_BALANCE),
+        )
+        params.append(delta)
+    with connection.cursor() as cursor:
+        cursor.executemany(APPLY_TRADES_SQL, params)
+
+
+class RebuildReport:
+    """Outcome of a verifying rebuild"""
+
+    def __init__(self):
+        self.users = 0
+        self.realized_filled = 0
+        self.drifted = {}  # user id -> {field: (stored, recomputed)}
+
+
+def rebuild_performance(user_ids=None, chunk_size=REBUILD_CHUNK_SIZE, fix=True):
+    """Recompute TradingPerformance from the trade log and report drift.
+
+    Users are walked in primary-key chunks; each chunk's trade statistics come
+    from one grouped query over Trade, with portfolio values alongside. SELL
+    trades recorded before realized P&L was stored get it replayed first.
+    Rows whose trade statistics differ from the stored ones are listed in the
+    report; with ``fix`` those and stale valuations are overwritten. Returns a
+    RebuildReport.
+    """
+    report = RebuildReport()
+    users = User.objects.order_by('pk').values_list('pk', flat=True)
+    if user_ids is not None:
+        users = users.filter(pk__in=list(user_ids))
+
+    last_pk = 0
+    while True:
+        chunk = list(users.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1]
+        with transaction.atomic():
+            if fix:
+                report.realized_filled += backfill_realized_pnl(chunk)
+            expected = _recompute(chunk)
+            stored = {
+                row['user_id']: row
+                for row in TradingPerformance.objects.filter(user_id__in=chunk)
+                .values('user_id', *TRADE_STATS, 'portfolio_value', 'portfolio_growth_percentage')
+            }
+            # Only trade statistics count as drift; valuations just follow the portfolio
+            stale = []
+            for user_id in chunk:
+                row = stored.get(user_id)
+                if row is None:
+                    if expected[user_id]['total_trades']:
+                        report.drifted[user_id] = {'total_trades': (None, expected[user_id]['total_trades'])}
+                        stale.append(user_id)
+                    continue
+                differences = {
+                    field: (row[field], value)
+                    for field, value in expected[user_id].items() if row[field] != value
+                }
+                if differences.keys() & set(TRADE_STATS):
+                    report.drifted[user_id] = {
+                        field: change for field, change in differences.items() if field in TRADE_STATS
+                    }
+                if differences:
+                    stale.append(user_id)
+            if fix and stale:
+                _write(stale, expected)
+        report.users += len(chunk)
+    return report
+
+
+def _recompute(user_ids):
+    """Expected statistics for every user in ``user_ids``"""
+    stats = {
+        row.pop('user_id'): row
+        for row in Trade.objects.filter(user_id__in=user_ids).values('user_id').annotate(
+            total_trades=Count('pk'),
+            successful_trades=Count('pk', filter=Q(realized_pnl__gt=0)),
+            total_profit_loss=Sum('realized_pnl'),
+            best_trade_profit=Max('realized_pnl'),
+            worst_trade_loss=Min('realized_pnl'),
+            total_commission_paid=Sum('commission'),
+            total_trade_value=Sum('total_amount'),
+            largest_position=Max('total_amount'),
+        )
+    }
+    values = dict(
+        Portfolio.objects.filter(user_id__in=user_ids).annotate(value=PORTFOLIO_VALUE).values_list('user_id', 'value')
+    )
+    expected = {}
+    for user_id in user_ids:
+        row = stats.get(user_id, {})
+        count = row.get('total_trades', 0)
+        traded = _cents(row.get('total_trade_value'))
+        value = _cents(values.get(user_id))
+        expected[user_id] = {
+            'total_trades': count,
+            'successful_trades': row.get('successful_trades', 0),
+            'total_profit_loss': _cents(row.get('total_profit_loss')),
+            'best_trade_profit': max(_cents(row.get('best_trade_profit')), ZERO),
+            'worst_trade_loss': min(_cents(row.get('worst_trade_loss')), ZERO),
+            'total_commission_paid': _cents(row.get('total_commission_paid')),
+            'total_trade_value': traded,
+            'average_trade_size': (traded / count).quantize(CENT) if count else ZERO,
+            'largest_position': _cents(row.get('largest_position')),
+            'portfolio_value': value,
+            'portfolio_growth_percentage': growth_percentage(value, STARTING_BALANCE) if user_id in values else ZERO,
+        }
+    return expected
+
+
+def _write(user_ids, expected):
+    TradingPerformance.objects.bulk_create(
+        [TradingPerformance(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.executemany(SET_STATS_SQL, [
+            {**expected[user_id], 'user_id': user_id, 'now': now} for user_id in user_ids
+        ])
+
+
+def backfill_realized_pnl(user_ids):
+    """Replay average-cost basis to fill ``realized_pnl`` on older SELL trades.
+
+    Only users with such trades are replayed, following ``apply_fills``;
+    sells that already carry realized P&L move the basis by what it implies.
+    Sells the log can't cover (more shares than were bought) stay empty.
+    Returns the number of trades filled.
+    """
+    pending = set(
+        Trade.objects.filter(user_id__in=list(user_ids), side='SELL', realized_pnl__isnull=True)
+        .values_list('user_id', flat=True)
+    )
+    if not pending:
+        return 0
+    held, basis = defaultdict(int), defaultdict(lambda: ZERO)
+    updates = []
+    for pk, user_id, stock_id, side, quantity, total_amount, realized in (
+        Trade.objects.filter(user_id__in=pending).order_by('executed_at', 'pk')
+        .values_list('pk', 'user_id', 'stock_id', 'side', 'quantity', 'total_amount', 'realized_pnl')
+    ):
+        key = (user_id, stock_id)
+        if side == 'BUY':
+            held[key] += quantity
+            basis[key] += total_amount
+            continue
+        if held[key] < quantity:
+            continue
+        remaining = held[key] - quantity
+        if realized is None:
+            invested_after = ((basis[key] / held[key]) * remaining).quantize(CENT)
+            updates.append((realized_pnl(total_amount, basis[key], invested_after), pk))
+        else:
+            invested_after = basis[key] - (total_amount - realized)
+        held[key], basis[key] = remaining, invested_after
+    with connection.cursor() as cursor:
+        cursor.executemany(SET_REALIZED_SQL, updates)
+    return len(updates)
+
+
+def _cents(value):
+    return Decimal(value or 0).quantize(CENT)
@@ -0,0 +1,206 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from ..models import MarketData
+
+
+# Attribute the preloaded MarketData row list is stored under on each Stock
+QUOTE_SNAPSHOT_ATTR = 'quote_snapshot'
+
+# Columns of the batched quote payload and the MarketData fields behind them
+QUOTE_COLUMNS = {
+    'price': 'current_price',
+    'change': 'change_amount',
+    'change_percentage': 'change_percentage',
+    'volume': 'volume',
+    'high': 'high_24h',
+    'low': 'low_24h',
+    'open': 'open_24h',
+    'previous_close': 'previous_close',
+}
+
+
+class QuoteCache:
+    """Process-wide LRU cache of MarketData rows keyed by stock id.
+
+    Every entry expires ``ttl`` seconds after it was stored, and the least
+    recently used entry is evicted once ``max_entries`` is exceeded. Cached
+    rows are detached copies and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is None:
+            return getattr(settings, 'QUOTE_CACHE_MAX_ENTRIES', 5000)
+        return self._max_entries
+
+    @property
+    def ttl(self):
+        if self._ttl is None:
+            return getattr(settings, 'QUOTE_CACHE_TTL', 30)
+        return self._ttl
+
+    def get(self, stock_id):
+        """Return the cached row for ``stock_id`` or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(stock_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, quote = entry
+            if expires_at <= now:
+                del self._entries[stock_id]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(stock_id)
+            self.hits += 1
+            return quote
+
+    def get_many(self, stock_ids):
+        """Return a dict of cached rows for whichever ``stock_ids`` are present"""
+        found = {}
+        for stock_id in stock_ids:
+            quote = self.get(stock_id)
+            if quote is not None:
+                found[stock_id] = quote
+        return found
+
+    def put(self, market_data):
+        """Store a detached copy of ``market_data`` and return it"""
+        quote = copy.copy(market_data)
+        quote._state.fields_cache = {}
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[quote.stock_id] = (expires_at, quote)
+            self._entries.move_to_end(quote.stock_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return quote
+
+    def put_many(self, rows):
+        for market_data in rows:
+            self.put(market_data)
+
+    def invalidate(self, stock_id):
+        with self._lock:
+            self._entries.pop(stock_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        """Counters used to size the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+quote_cache = QuoteCache()
+
+
+def with_quote_snapshot(queryset, lookup='market_data'):
+    """Preload each stock's MarketData row in one batched query.
+
+    ``lookup`` is the path from the queryset's model to ``Stock.market_data``,
+    e.g. ``'stock__market_data'`` for holdings, orders or trades. The snapshot
+    is only consulted when the quote cache misses.
+    """
+    return queryset.prefetch_related(
+        Prefetch(lookup, queryset=MarketData.objects.all(), to_attr=QUOTE_SNAPSHOT_ATTR)
+    )
+
+
+def get_quote(stock):
+    """Return the stock's MarketData row from the quote cache.
+
+    On a miss the row comes from the preloaded snapshot when there is one,
+    otherwise from the database, and is stored in the cache.
+    """
+    quote = quote_cache.get(stock.pk)
+    if quote is not None:
+        return quote
+    snapshot = getattr(stock, QUOTE_SNAPSHOT_ATTR, None)
+    if snapshot is not None:
+        market_data = snapshot[0] if snapshot else None
+    else:
+        market_data = stock.market_data.first()
+    if market_data is None:
+        return None
+    return quote_cache.put(market_data)
+
+
+def get_quotes(stock_ids):
+    """MarketData rows of ``stock_ids`` keyed by stock id.
+
+    Served from the quote cache, with every miss fetched in one query and
+    cached; stocks without market data are left out.
+    """
+    quotes = quote_cache.get_many(stock_ids)
+    missing = [stock_id for stock_id in stock_ids if stock_id not in quotes]
+    if missing:
+        for market_data in MarketData.objects.filter(stock_id__in=missing):
+            quotes[market_data.stock_id] = quote_cache.put(market_data)
+    return quotes
+
+
+def attach_quotes(stocks):
+    """Preload ``stocks``' quotes through ``get_quotes`` so serializers look none up"""
+    quotes = get_quotes([stock.pk for stock in stocks])
+    for stock in stocks:
+        quote = quotes.get(stock.pk)
+        setattr(stock, QUOTE_SNAPSHOT_ATTR, [quote] if quote is not None else [])
+    return quotes
+
+
+def quote_version(quotes, *extra):
+    """Digest that changes whenever any of ``quotes`` (or ``extra``) does, for ETags"""
+    digest = hashlib.sha1(repr(extra).encode())
+    for quote in quotes:
+        if quote is not None:
+            stamp = f'{quote.stock_id}:{quote.updated_at.timestamp()}:{quote.current_price}:{quote.volume};'
+            digest.update(stamp.encode())
+    return digest.hexdigest()
+
+
+def quote_columns(symbols, quotes):
+    """Columnar payload for ``quotes`` aligned with ``symbols`` (None where missing).
+
+    One list per QUOTE_COLUMNS name plus ``updated_at``, which keeps repeated
+    field names out of large responses. Prices are strings like the row API.
+    """
+    columns = {'symbols': list(symbols)}
+    for column, field in QUOTE_COLUMNS.items():
+        values = [getattr(quote, field) if quote is not None else None for quote in quotes]
+        columns[column] = values if field == 'volume' else [None if value is None else str(value) for value in values]
+    columns['updated_at'] = [quote.updated_at.isoformat() if quote is not None else None for quote in quotes]
+    return columns
@@ -0,0 +1,133 @@
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import Portfolio, PortfolioHolding
+from .leaderboard import sync_portfolio_values
+
+
+REVALUE_CHUNK_SIZE = 5000
+PORTFOLIO_CHUNK_SIZE = 500
+HOLDING_COLUMNS = (
+    'pk', 'portfolio_id', 'quantity', 'total_invested',
+    'current_price', 'market_value', 'unrealized_pnl', 'stock__market_data__current_price',
+)
+# Positional updates by primary key. bulk_update resolves a When/Case expression per row
+# and column (about 1 ms a row at any batch_size, 60x slower on 200k holdings)
+UPDATE_HOLDING_SQL = (
+    f'UPDATE {PortfolioHolding._meta.db_table} '
+    'SET current_price = %s, market_value = %s, unrealized_pnl = %s, updated_at = %s WHERE id = %s'
+)
+
+
+class RevaluationReport:
+    """Counters for one revaluation run"""
+
+    def __init__(self):
+        self.holdings = 0
+        self.updated = 0
+        self.portfolios = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.holdings / self.seconds if self.seconds else 0.0
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+
+def _money(cents):
+    return Decimal(cents).scaleb(-2)
+
+
+def revalue_holdings(stock_ids=None, chunk_size=REVALUE_CHUNK_SIZE, report=None):
+    """Mark holdings (all, or those in ``stock_ids``) to their latest MarketData price.
+
+    Holdings are read in primary-key chunks already joined with their quote,
+    the new values are computed on int64 cent arrays, and only rows whose
+    numbers moved are written back, one batched statement per chunk. Totals of the
+    touched portfolios are refreshed afterwards. Returns a RevaluationReport.
+    """
+    report = report or RevaluationReport()
+    holdings = PortfolioHolding.objects.filter(stock__market_data__isnull=False)
+    if stock_ids is not None:
+        holdings = holdings.filter(stock_id__in=list(stock_ids))
+    holdings = holdings.order_by('pk').values_list(*HOLDING_COLUMNS)
+
+    touched = set()
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            # Raw rows skip Django's per-value Decimal converters; numpy takes them as floats
+            chunk = holdings.select_for_update(of=('self',)).filter(pk__gt=last_pk)[:chunk_size]
+            with connection.cursor() as cursor:
+                cursor.execute(*chunk.query.sql_with_params())
+                rows = cursor.fetchall()
+            if not rows:
+                break
+            data = np.array(rows, dtype=float)
+            pks, portfolio_ids, quantities = data[:, :3].astype(np.int64).T
+            invested, old_price, old_value, old_pnl, price = np.rint(data[:, 3:] * 100).astype(np.int64).T
+            last_pk = int(pks[-1])
+
+            market_value = quantities * price
+            unrealized_pnl = market_value - invested
+            changed = np.flatnonzero(
+                (price != old_price) | (market_value != old_value) | (unrealized_pnl != old_pnl)
+            )
+            now = connection.ops.adapt_datetimefield_value(timezone.now())
+            with connection.cursor() as cursor:
+                cursor.executemany(UPDATE_HOLDING_SQL, [
+                    (_money(p), _money(v), _money(u), now, pk)
+                    for p, v, u, pk in zip(
+                        price[changed].tolist(), market_value[changed].tolist(),
+                        unrealized_pnl[changed].tolist(), pks[changed].tolist(),
+                    )
+                ])
+        touched.update(portfolio_ids[changed].tolist())
+        report.holdings += len(rows)
+        report.updated += len(changed)
+
+    report.portfolios = refresh_portfolio_totals(touched)
+    return report.finish()
+
+
+def refresh_portfolio_totals(portfolio_ids):
+    """Recompute ``total_value`` and ``total_profit_loss`` from the holdings.
+
+    Each chunk is one UPDATE whose holdings market value comes from a grouped
+    ``SUM`` per portfolio; as in ``apply_fills``, total value is cash plus
+    holdings and profit/loss is that less the cost basis. Leaderboard entries
+    follow the new valuations. Returns the number of portfolios refreshed.
+    """
+    money = DecimalField(max_digits=15, decimal_places=2)
+    holdings_value = Coalesce(
+        Subquery(
+            PortfolioHolding.objects.filter(portfolio=OuterRef('pk'))
+            .values('portfolio')
+            .annotate(total=Sum('market_value'))
+            .values('total'),
+            output_field=money,
+        ),
+        Value(Decimal('0.00')),
+        output_field=money,
+    )
+    ids = sorted(portfolio_ids)
+    for start in range(0, len(ids), PORTFOLIO_CHUNK_SIZE):
+        chunk = ids[start:start + PORTFOLIO_CHUNK_SIZE]
+        with transaction.atomic():
+            Portfolio.objects.filter(pk__in=chunk).update(
+                total_value=F('cash_balance') + holdings_value,
+                total_profit_loss=F('cash_balance') + holdings_value - F('total_invested'),
+                updated_at=timezone.now(),
+            )
+            sync_portfolio_values(chunk)
+    return len(ids)
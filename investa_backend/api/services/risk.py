@@ -0,0 +1,149 @@
+import hashlib
+import json
+from statistics import NormalDist
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import MarketIndexValue
+from .backtest import TRADING_DAYS, price_matrix_cache
+from .charts import chart_versions
+
+
+DEFAULT_LOOKBACK = TRADING_DAYS
+MAX_LOOKBACK = TRADING_DAYS * 10
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_BENCHMARK = 'NIFTY 50'
+
+
+def return_statistics(stocks, lookback=DEFAULT_LOOKBACK):
+    """Daily returns, covariance and correlation of ``stocks`` over ``lookback`` days.
+
+    The window ends on the last day every priced symbol has a close; symbols
+    without any price history count as flat. Entries are shared by every
+    portfolio holding the same symbol set and cached per day and chart
+    versions, so a new bar recomputes them. ``stocks`` must be in pk order.
+    """
+    versions = chart_versions([stock.pk for stock in stocks])
+    digest = hashlib.sha1(json.dumps([[stock.pk for stock in stocks], versions, lookback]).encode()).hexdigest()
+    key = f'risk:{timezone.localdate().isoformat()}:{digest}'
+    entry = cache.get(key)
+    if entry is None:
+        days, closes = price_matrix_cache.get(stocks, versions)
+        priced = ~np.isnan(closes).all(axis=1)
+        complete = ~np.isnan(closes[priced]).any(axis=0)
+        days, closes = days[complete][-(lookback + 1):], closes[:, complete][:, -(lookback + 1):]
+        with np.errstate(invalid='ignore'):
+            returns = np.nan_to_num(closes[:, 1:] / closes[:, :-1] - 1)
+            covariance = np.atleast_2d(np.cov(returns)) if returns.shape[1] > 1 else None
+            if covariance is not None:
+                deviation = np.sqrt(np.diag(covariance))
+                correlation = covariance / np.outer(deviation, deviation)
+        entry = {
+            'days': days,
+            'returns': returns,
+            'covariance': covariance,
+            'correlation': correlation if covariance is not None else None,
+        }
+        cache.set(key, entry, settings.RISK_CACHE_TTL)
+    return entry
+
+
+def benchmark_returns(name, days):
+    """Daily returns of the ``name`` index between consecutive ``days``, NaN where unknown.
+
+    Cached per day and window like the return statistics, since past index
+    closes don't change once recorded.
+    """
+    window = f'{name}:{days[0]}:{days[-1]}:{len(days)}'
+    key = f'risk:benchmark:{timezone.localdate().isoformat()}:{hashlib.sha1(window.encode()).hexdigest()}'
+    returns = cache.get(key)
+    if returns is None:
+        returns = _benchmark_returns(name, days)
+        cache.set(key, returns, settings.RISK_CACHE_TTL)
+    return returns
+
+
+def _benchmark_returns(name, days):
+    history = list(
+        MarketIndexValue.objects.filter(index__name=name, date__lte=days[-1].item())
+        .order_by('date').values_list('date', 'value')
+    )
+    if not history:
+        return np.full(len(days) - 1, np.nan)
+    dates = np.array([day for day, _ in history], dtype='datetime64[D]')
+    values = np.array([value for _, value in history], dtype=float)
+    # Carry the latest close on or before each day
+    latest = np.searchsorted(dates, days, side='right') - 1
+    levels = np.where(latest >= 0, values[np.maximum(latest, 0)], np.nan)
+    return levels[1:] / levels[:-1] - 1
+
+
+def portfolio_risk(portfolio, lookback=DEFAULT_LOOKBACK, confidence=DEFAULT_CONFIDENCE, benchmark=DEFAULT_BENCHMARK):
+    """Volatility, beta, one-day value at risk and correlations of a portfolio's holdings.
+
+    Holdings are weighted by market value. Volatility is annualized; VaR is
+    the one-day loss not exceeded with ``confidence``, both from the
+    portfolio's own return history and from a normal fit of the covariance.
+    Beta is measured against the ``benchmark`` index where its history
+    overlaps. Returns a dict, with ``detail`` when there is too little history.
+    """
+    holdings = list(portfolio.holdings.select_related('stock').order_by('stock_id'))
+    summary = {'lookback_days': lookback, 'confidence': confidence, 'benchmark': benchmark}
+    if not holdings:
+        return {**summary, 'value': 0.0, 'holdings': []}
+
+    stocks = [holding.stock for holding in holdings]
+    values = np.array([float(holding.market_value or holding.total_invested) for holding in holdings])
+    weights = values / values.sum() if values.sum() else np.full(len(values), 1 / len(values))
+    stats = return_statistics(stocks, lookback)
+    returns, covariance = stats['returns'], stats['covariance']
+    if covariance is None:
+        return {**summary, 'detail': 'Not enough price history for the held symbols'}
+
+    daily = weights @ returns
+    deviation = float(np.sqrt(weights @ covariance @ weights))
+    tail = 1 - confidence
+    historical = -float(np.quantile(daily, tail))
+    parametric = -(float(daily.mean()) + NormalDist().inv_cdf(tail) * deviation)
+
+    market = benchmark_returns(benchmark, stats['days'])
+    known = ~np.isnan(market)
+    betas = np.full(len(stocks), np.nan)
+    if known.sum() > 1:
+        centered = market[known] - market[known].mean()
+        spread = centered @ centered
+        if spread:
+            symbol_returns = returns[:, known]
+            betas = (symbol_returns - symbol_returns.mean(axis=1, keepdims=True)) @ centered / spread
+    beta = float(weights @ betas)
+
+    total = float(values.sum())
+    symbol_volatility = np.sqrt(np.diag(covariance) * TRADING_DAYS)
+    return {
+        **summary,
+        'as_of': str(stats['days'][-1]),
+        'observations': returns.shape[1],
+        'value': round(total, 2),
+        'volatility': round(deviation * np.sqrt(TRADING_DAYS) * 100, 2),
+        'beta': None if np.isnan(beta) else round(beta, 3),
+        'value_at_risk': {
+            'historical': {'percentage': round(historical * 100, 2), 'amount': round(historical * total, 2)},
+            'parametric': {'percentage': round(parametric * 100, 2), 'amount': round(parametric * total, 2)},
+        },
+        'holdings': [
+            {
+                'symbol': stock.symbol,
+                'weight': round(float(weight) * 100, 2),
+                'volatility': round(float(volatility) * 100, 2),
+                'beta': None if np.isnan(symbol_beta) else round(float(symbol_beta), 3),
+            }
+            for stock, weight, volatility, symbol_beta in zip(stocks, weights, symbol_volatility, betas)
+        ],
+        'correlation': [
+            [None if np.isnan(value) else round(value, 4) for value in row]
+            for row in stats['correlation'].tolist()
+        ],
+    }
@@ -0,0 +1,143 @@
+from collections import deque
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+
+from ..models import Stock, StockRollingStats
+from .ohlcv_store import price_bars
+
+
+SMA_WINDOWS = (20, 50, 200)
+VOLUME_WINDOW = 20
+HIGH_LOW_DAYS = 365  # 52 weeks of calendar days
+
+
+class RollingWindow:
+    """Incremental 52W high/low, moving averages and average volume.
+
+    Highs and lows live in monotonic deques of ``(ordinal, value)`` pairs, so
+    each bar is pushed and expired in amortized O(1). Moving averages keep
+    running sums over the last 200 closes.
+    """
+
+    def __init__(self):
+        self.last_date = None
+        self.highs = deque()  # Decreasing highs; the front is the window max
+        self.lows = deque()   # Increasing lows; the front is the window min
+        self.closes = deque(maxlen=max(SMA_WINDOWS))
+        self.volumes = deque(maxlen=VOLUME_WINDOW)
+        self.sums = {window: 0.0 for window in SMA_WINDOWS}
+        self.volume_sum = 0
+
+    def push(self, day, high, low, close, volume):
+        """Add the next bar; ``day`` must be later than the previous bar"""
+        ordinal = day.toordinal()
+        high, low, close, volume = float(high), float(low), float(close), int(volume)
+
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((ordinal, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((ordinal, low))
+        cutoff = ordinal - HIGH_LOW_DAYS
+        while self.highs[0][0] <= cutoff:
+            self.highs.popleft()
+        while self.lows[0][0] <= cutoff:
+            self.lows.popleft()
+
+        for window in SMA_WINDOWS:
+            if len(self.closes) >= window:
+                self.sums[window] -= self.closes[-window]
+            self.sums[window] += close
+        self.closes.append(close)
+
+        if len(self.volumes) == VOLUME_WINDOW:
+            self.volume_sum -= self.volumes[0]
+        self.volumes.append(volume)
+        self.volume_sum += volume
+
+        self.last_date = day
+
+    def values(self):
+        """Field values for StockRollingStats"""
+        values = {
+            'as_of': self.last_date,
+            'high_52w': _money(self.highs[0][1]),
+            'low_52w': _money(self.lows[0][1]),
+            'avg_volume': self.volume_sum // len(self.volumes),
+        }
+        for window in SMA_WINDOWS:
+            values[f'sma_{window}'] = (
+                _money(self.sums[window] / window) if len(self.closes) >= window else None
+            )
+        return values
+
+    def to_state(self):
+        return {
+            'last_date': self.last_date.isoformat(),
+            'highs': list(self.highs),
+            'lows': list(self.lows),
+            'closes': list(self.closes),
+            'volumes': list(self.volumes),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        window = cls()
+        window.last_date = date.fromisoformat(state['last_date'])
+        window.highs = deque(tuple(item) for item in state['highs'])
+        window.lows = deque(tuple(item) for item in state['lows'])
+        window.closes.extend(state['closes'])
+        window.volumes.extend(state['volumes'])
+        closes = list(window.closes)
+        window.sums = {w: sum(closes[-w:]) for w in SMA_WINDOWS}
+        window.volume_sum = sum(window.volumes)
+        return window
+
+
+def _money(value):
+    return Decimal(f'{value:.2f}')
+
+
+def rebuild_rolling_stats(stock):
+    """Recompute a stock's stats from its price history"""
+    bars = price_bars(stock)
+    if len(bars):
+        # Only the last 52 weeks and the longest average window matter
+        dates = bars['date']
+        in_52w = np.searchsorted(dates, dates[-1] - np.timedelta64(HIGH_LOW_DAYS, 'D'), side='right')
+        bars = bars[min(in_52w, max(len(bars) - max(SMA_WINDOWS), 0)):]
+    window = RollingWindow()
+    for day, _, high, low, close, volume in bars.tolist():
+        window.push(day, high, low, close, volume)
+    if window.last_date is None:
+        StockRollingStats.objects.filter(stock=stock).delete()
+        return None
+    stats, _ = StockRollingStats.objects.update_or_create(
+        stock=stock, defaults={**window.values(), 'window_state': window.to_state()}
+    )
+    return stats
+
+
+def apply_bars(stock_id, bars):
+    """Fold new ``(date, high, low, close, volume)`` bars into a stock's stats.
+
+    Bars newer than the stored state are applied incrementally; a bar dated
+    at or before it (a correction) triggers a rebuild from history.
+    """
+    bars = sorted(bars)
+    with transaction.atomic():
+        stats = StockRollingStats.objects.select_for_update().filter(stock_id=stock_id).first()
+        if stats is None or not stats.window_state or bars[0][0] <= stats.as_of:
+            return rebuild_rolling_stats(Stock.objects.get(pk=stock_id))
+        window = RollingWindow.from_state(stats.window_state)
+        for day, high, low, close, volume in bars:
+            window.push(day, high, low, close, volume)
+        for field, value in window.values().items():
+            setattr(stats, field, value)
+        stats.window_state = window.to_state()
+        stats.save()
+        return stats
@@ -0,0 +1,160 @@
+import re
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+
+from ..models import Stock
+
+
+# What a search result carries per stock
+SearchEntry = namedtuple('SearchEntry', ['id', 'symbol', 'name', 'exchange', 'sector'])
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MIN_SIMILARITY = 0.3  # Share of the query's trigrams a name must contain to match
+SHORTLIST = 5  # Name candidates ranked in full per requested result
+WORDS = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    return ' '.join(WORDS.findall(text.lower()))
+
+
+def trigrams(text):
+    """Trigrams of each word padded like pg_trgm, so word starts weigh more"""
+    grams = set()
+    for word in WORDS.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _TrieNode:
+    __slots__ = ('children', 'ids')
+
+    def __init__(self):
+        self.children = {}
+        self.ids = []  # Entries whose symbol runs through this node, best first
+
+
+class StockSearchIndex:
+    """Autocomplete over active stocks: a prefix trie on symbols and trigrams on names.
+
+    A query ranks exact symbols first, then symbol prefixes (shorter symbols
+    first), then names containing it, then names sharing enough trigrams to
+    survive typos. Built from Stock on first use, dropped by ``reset`` when a
+    stock changes and rebuilt after ``SEARCH_INDEX_TTL`` seconds to pick up
+    writes made by other processes.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = []
+        self._by_symbol = {}
+        self._keys = []
+        self._names = []
+        self._gram_counts = np.array([], dtype=np.int32)
+        self._trie = _TrieNode()
+        self._postings = {}  # trigram -> entry positions
+        self._loaded_at = None
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else settings.SEARCH_INDEX_TTL
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """The ``limit`` best matching stocks for ``query`` as SearchEntry tuples"""
+        text = normalize(query)
+        if not text or limit <= 0:
+            return []
+        with self._lock:
+            self._ensure_fresh()
+            entries, keys, trie, postings = self._entries, self._keys, self._trie, self._postings
+            names, gram_counts = self._names, self._gram_counts
+
+        scores = {}
+        compact = text.replace(' ', '')
+        node = trie
+        for char in compact:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            # Node ids are pre-ranked, and symbol matches outrank every name match
+            prefixed = node.ids[:limit]
+            if len(prefixed) == limit:
+                return [entries[position] for position in prefixed]
+            for position in prefixed:
+                length = len(keys[position])
+                scores[position] = 3.0 if length == len(compact) else 2.0 + 1.0 / length
+
+        grams = trigrams(text)
+        matched = [postings[gram] for gram in grams if gram in postings]
+        if matched:
+            shared = np.bincount(np.concatenate(matched), minlength=len(entries))
+            candidates = np.flatnonzero(shared >= MIN_SIMILARITY * len(grams))
+            if len(candidates) > limit * SHORTLIST:
+                best = np.argpartition(-shared[candidates], limit * SHORTLIST)[:limit * SHORTLIST]
+                candidates = candidates[best]
+            for position, count, total in zip(
+                candidates.tolist(), shared[candidates].tolist(), gram_counts[candidates].tolist()
+            ):
+                if position in scores:
+                    continue
+                if text in names[position]:
+                    scores[position] = 1.5 + count / total
+                else:
+                    scores[position] = count / (len(grams) + total - count)
+
+        ranked = sorted(scores, key=lambda position: (-scores[position], entries[position].symbol))
+        return [entries[position] for position in ranked[:limit]]
+
+    def resolve(self, symbols):
+        """SearchEntry per active stock among ``symbols`` (exact, upper-case), keyed by symbol"""
+        with self._lock:
+            self._ensure_fresh()
+            by_symbol = self._by_symbol
+        return {symbol: by_symbol[symbol] for symbol in symbols if symbol in by_symbol}
+
+    def reset(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_fresh(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        entries = [
+            SearchEntry(*row) for row in
+            Stock.objects.filter(is_active=True).order_by('symbol')
+            .values_list('pk', 'symbol', 'name', 'exchange', 'sector')
+        ]
+        keys = [normalize(entry.symbol).replace(' ', '') for entry in entries]
+        trie, postings, names, gram_counts = _TrieNode(), {}, [], []
+        for position, entry in enumerate(entries):
+            node = trie
+            for char in keys[position]:
+                node = node.children.setdefault(char, _TrieNode())
+                node.ids.append(position)
+            grams = trigrams(entry.name)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+            names.append(normalize(entry.name))
+            gram_counts.append(len(grams) or 1)
+        # Shorter symbols first, so an exact match heads its own node
+        nodes = [trie]
+        while nodes:
+            node = nodes.pop()
+            node.ids.sort(key=lambda position: (len(keys[position]), keys[position]))
+            nodes.extend(node.children.values())
+        self._entries, self._keys, self._trie = entries, keys, trie
+        self._by_symbol = {entry.symbol: entry for entry in entries}
+        self._postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        self._names, self._gram_counts = names, np.array(gram_counts, dtype=np.int32)
+        self._loaded_at = time.monotonic()
+
+
+stock_search_index = StockSearchIndex()
@@ -0,0 +1,224 @@
+from collections import defaultdict
+from itertools import repeat
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Portfolio, PortfolioSnapshot, StockPrice, Trade
+from .charts import lttb_indices, minmax_indices
+from .ingestion import sqlite_bulk_load, upsert
+from .leaderboard import PORTFOLIO_VALUE
+
+
+SNAPSHOT_FIELDS = ['portfolio', 'date', 'total_value', 'cash_balance', 'total_invested', 'total_profit_loss']
+SNAPSHOT_CHUNK_SIZE = 5000
+BACKFILL_CHUNK_SIZE = 200  # Portfolios replayed per vectorized block
+
+
+def take_snapshots(day=None):
+    """Upsert ``day``'s (default today) snapshot of every portfolio from its current totals.
+
+    Profit/loss follows the Portfolio convention of total value less cost
+    basis. Returns the number of snapshots written.
+    """
+    day = (day or timezone.localdate()).isoformat()
+    portfolios = Portfolio.objects.annotate(value=PORTFOLIO_VALUE).values_list(
+        'pk', 'value', 'cash_balance', 'total_invested'
+    )
+    written = 0
+    with sqlite_bulk_load(), transaction.atomic():
+        rows = (
+            (pk, day, value, cash, invested, value - invested)
+            for pk, value, cash, invested in portfolios.iterator(chunk_size=SNAPSHOT_CHUNK_SIZE)
+        )
+        for chunk in _chunks(rows, SNAPSHOT_CHUNK_SIZE):
+            _write(chunk)
+            written += len(chunk)
+    return written
+
+
+def backfill_snapshots(portfolio_ids=None, start=None, end=None, chunk_size=BACKFILL_CHUNK_SIZE):
+    """Reconstruct daily snapshots from Trade and StockPrice.
+
+    For each block of portfolios the trades are bucketed by trading day, so
+    per-stock quantities, cash and cost basis become cumulative sums over
+    (position x day) arrays and holdings are valued against the
+    forward-filled close matrix in one product. Only the cost basis is
+    replayed trade by trade: a SELL removes what its stored realized P&L
+    implies, or the average cost for trades older than that column. Cash is
+    anchored to the current balance. Snapshots start at each portfolio's
+    first trade. Returns the number of snapshots written.
+    """
+    end = end or timezone.localdate()
+    portfolios = Portfolio.objects.order_by('pk')
+    if portfolio_ids is not None:
+        portfolios = portfolios.filter(pk__in=list(portfolio_ids))
+    portfolios = list(portfolios.values_list('pk', 'user_id', 'cash_balance'))
+
+    written = 0
+    with sqlite_bulk_load():
+        for block in _chunks(iter(portfolios), chunk_size):
+            rows = _replay(block, start, end)
+            with transaction.atomic():
+                for chunk in _chunks(iter(rows), SNAPSHOT_CHUNK_SIZE):
+                    _write(chunk)
+            written += len(rows)
+    return written
+
+
+def _replay(portfolios, start, end):
+    """Snapshot rows for one block of ``(pk, user_id, cash_balance)`` portfolios"""
+    index_of = {user_id: i for i, (_, user_id, _) in enumerate(portfolios)}
+    trades = list(
+        Trade.objects.filter(user_id__in=list(index_of))
+        .order_by('executed_at', 'pk')
+        .values_list('user_id', 'stock_id', 'side', 'quantity', 'total_amount', 'executed_at', 'realized_pnl')
+    )
+    if not trades:
+        return []
+    trade_days = np.array([timezone.localdate(trade[5]) for trade in trades], dtype='datetime64[D]')
+    first_day = np.datetime64(start) if start else trade_days.min()
+    stock_ids = sorted({stock_id for _, stock_id, *_ in trades})
+    days, closes = _close_matrix(stock_ids, first_day, np.datetime64(end))
+    if not len(days):
+        return []
+
+    # One row per (portfolio, stock) position; trades land on the first trading
+    # day on or after they executed, trades after ``end`` in an overflow column
+    positions = {}
+    trade_position = np.empty(len(trades), dtype=np.int64)
+    for t, (user_id, stock_id, *_) in enumerate(trades):
+        trade_position[t] = positions.setdefault((index_of[user_id], stock_id), len(positions))
+    trade_column = np.searchsorted(days, trade_days)
+    signed = np.array([1 if side == 'BUY' else -1 for _, _, side, *_ in trades], dtype=np.int64)
+    quantities = np.array([quantity for _, _, _, quantity, *_ in trades], dtype=np.int64)
+    amounts = np.array([float(trade[4]) for trade in trades])
+
+    # Cost basis moves depend on the running position, so replay them
+    invested_delta = np.empty(len(trades))
+    held, basis = defaultdict(int), defaultdict(float)
+    for t, trade in enumerate(trades):
+        position = trade_position[t]
+        if signed[t] > 0:
+            change = amounts[t]
+        elif trade[6] is not None:
+            change = float(trade[6]) - amounts[t]
+        else:
+            remaining = held[position] - quantities[t]
+            change = round(basis[position] / held[position] * remaining, 2) - basis[position] if held[position] else 0.0
+        held[position] += signed[t] * quantities[t]
+        basis[position] += change
+        invested_delta[t] = change
+
+    columns = len(days) + 1
+    held_by_day = np.zeros((len(positions), columns), dtype=np.int64)
+    np.add.at(held_by_day, (trade_position, trade_column), signed * quantities)
+    held_by_day = np.cumsum(held_by_day, axis=1)[:, :-1]
+    stock_row = {stock_id: row for row, stock_id in enumerate(stock_ids)}
+    position_stock = np.empty(len(positions), dtype=np.int64)
+    position_owner = np.empty(len(positions), dtype=np.int64)
+    for (owner, stock_id), position in positions.items():
+        position_owner[position] = owner
+        position_stock[position] = stock_row[stock_id]
+    holdings_value = np.zeros((len(portfolios), len(days)))
+    np.add.at(holdings_value, position_owner, held_by_day * closes[position_stock])
+
+    trade_owner = np.array([index_of[user_id] for user_id, *_ in trades], dtype=np.int64)
+    cash_moves = np.zeros((len(portfolios), columns))
+    np.add.at(cash_moves, (trade_owner, trade_column), -signed * amounts)
+    invested_moves = np.zeros((len(portfolios), columns))
+    np.add.at(invested_moves, (trade_owner, trade_column), invested_delta)
+    current_cash = np.array([float(cash) for *_, cash in portfolios])
+    cash = current_cash[:, None] - cash_moves.sum(axis=1, keepdims=True) + np.cumsum(cash_moves, axis=1)[:, :-1]
+    invested = np.round(np.cumsum(invested_moves, axis=1)[:, :-1], 2)
+    total_value = np.round(cash + holdings_value, 2)
+    cash = np.round(cash, 2)
+
+    first_column = np.full(len(portfolios), columns)
+    np.minimum.at(first_column, trade_owner, trade_column)
+    date_strings = days.astype(str).tolist()
+    rows = []
+    for owner, (pk, _, _) in enumerate(portfolios):
+        span = slice(first_column[owner], len(days))
+        rows.extend(zip(
+            repeat(pk), date_strings[span],
+            total_value[owner, span].tolist(), cash[owner, span].tolist(), invested[owner, span].tolist(),
+            np.round(total_value[owner, span] - invested[owner, span], 2).tolist(),
+        ))
+    return rows
+
+
+def _close_matrix(stock_ids, start, end):
+    """Trading days in [start, end] and a (stocks x days) close matrix.
+
+    ``end`` itself is always a day, so the latest snapshot exists before its
+    bar does. Gaps carry the previous close forward; days before a stock's
+    first bar use that first close.
+    """
+    prices = np.array(
+        list(
+            StockPrice.objects.filter(stock_id__in=stock_ids, date__lte=end.item())
+            .order_by('date')
+            .values_list('stock_id', 'date', 'close_price')
+        ),
+        dtype=object,
+    ).reshape(-1, 3)
+    if not len(prices):
+        return np.array([], dtype='datetime64[D]'), np.empty((len(stock_ids), 0))
+    all_days, column = np.unique(np.append(prices[:, 1].astype('datetime64[D]'), end), return_inverse=True)
+    column = column[:-1]
+    row = np.searchsorted(np.array(stock_ids), prices[:, 0].astype(np.int64))
+    matrix = np.full((len(stock_ids), len(all_days)), np.nan)
+    matrix[row, column] = prices[:, 2].astype(float)
+
+    known = ~np.isnan(matrix)
+    last_known = np.maximum.accumulate(np.where(known, np.arange(len(all_days)), 0), axis=1)
+    matrix = np.take_along_axis(matrix, last_known, axis=1)
+    first_close = matrix[np.arange(len(stock_ids)), known.argmax(axis=1)]
+    matrix = np.where(np.isnan(matrix), first_close[:, None], matrix)
+
+    in_range = all_days >= start
+    return all_days[in_range], np.nan_to_num(matrix[:, in_range])
+
+
+def history_rows(portfolio, start=None, points=None, method='lttb'):
+    """Snapshots of ``portfolio`` since ``start``, thinned to about ``points`` rows"""
+    snapshots = portfolio.snapshots.order_by('date')
+    if start:
+        snapshots = snapshots.filter(date__gte=start)
+    rows = list(snapshots.values_list('date', 'total_value', 'cash_balance', 'total_invested', 'total_profit_loss'))
+    if points and len(rows) > points:
+        values = np.array([float(row[1]) for row in rows])
+        if method == 'minmax':
+            indices = minmax_indices(values, points)
+        else:
+            ordinals = np.array([row[0].toordinal() for row in rows], dtype=float)
+            indices = lttb_indices(ordinals, values, points)
+        rows = [rows[i] for i in indices.tolist()]
+    return [
+        {
+            'date': str(day),
+            'total_value': f'{value:.2f}',
+            'cash_balance': f'{cash:.2f}',
+            'total_invested': f'{invested:.2f}',
+            'total_profit_loss': f'{profit_loss:.2f}',
+        }
+        for day, value, cash, invested, profit_loss in rows
+    ]
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write(rows):
+    upsert(PortfolioSnapshot, SNAPSHOT_FIELDS, rows,
+           unique_fields=['portfolio', 'date'], update_fields=SNAPSHOT_FIELDS[2:])
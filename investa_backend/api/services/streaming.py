@@ -0,0 +1,199 @@
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict, namedtuple
+
+from asgiref.sync import sync_to_async
+
+from ..models import Stock
+from .quotes import get_quote, with_quote_snapshot
+
+
+# One published quote, encoded once for every transport
+Frame = namedtuple('Frame', ['symbol', 'text', 'sse'])
+
+
+def encode_frame(payload):
+    text = json.dumps(payload, separators=(',', ':'), default=str)
+    return Frame(payload['symbol'], text, f'event: quote\ndata: {text}\n\n'.encode())
+
+
+def quote_payload(symbol, market_data):
+    """Compact streaming representation of a MarketData row"""
+    return {
+        'symbol': symbol,
+        'price': str(market_data.current_price),
+        'change': str(market_data.change_amount),
+        'change_percentage': str(market_data.change_percentage),
+        'volume': market_data.volume,
+        'high': str(market_data.high_24h),
+        'low': str(market_data.low_24h),
+        'ts': time.time(),
+    }
+
+
+class Subscription:
+    """A client's symbol set and its coalesced queue of pending frames.
+
+    Only the latest frame per symbol is kept, so a slow client skips
+    intermediate ticks instead of building a backlog. Lives on the hub's
+    event loop and is not thread-safe.
+    """
+
+    def __init__(self):
+        self.symbols = set()
+        self.delivered = 0
+        self.coalesced = 0
+        self.closed = False
+        self._pending = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, frame):
+        if frame.symbol in self._pending:
+            self.coalesced += 1
+        self._pending[frame.symbol] = frame
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def get(self):
+        """Wait for and return the pending frames (empty once closed)"""
+        while not self._pending and not self.closed:
+            self._ready.clear()
+            await self._ready.wait()
+        frames = list(self._pending.values())
+        self._pending.clear()
+        self.delivered += len(frames)
+        return frames
+
+
+class QuoteHub:
+    """In-process fan-out of quote updates to per-symbol subscribers.
+
+    Subscriptions are managed on the ASGI event loop. ``publish`` may be
+    called from any thread (signal handlers run in Django's sync threads);
+    the frame is encoded there once and handed to the loop in a single
+    callback that offers it to every subscriber of the symbol.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._loop = None
+        self.connections = 0
+        self.published = 0
+
+    def subscribe(self, symbols):
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription()
+        self.update(subscription, add=symbols)
+        self.connections += 1
+        return subscription
+
+    def update(self, subscription, add=(), remove=()):
+        for symbol in remove:
+            subscription.symbols.discard(symbol)
+            subscribers = self._subscribers.get(symbol)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[symbol]
+        for symbol in add:
+            subscription.symbols.add(symbol)
+            self._subscribers[symbol].add(subscription)
+
+    def unsubscribe(self, subscription):
+        self.update(subscription, remove=list(subscription.symbols))
+        subscription.close()
+        self.connections -= 1
+
+    def publish(self, payload):
+        """Encode ``payload`` once and deliver it to the symbol's subscribers"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or payload['symbol'] not in self._subscribers:
+            return
+        frame = encode_frame(payload)
+        self.published += 1
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(frame)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, frame)
+
+    def _fan_out(self, frame):
+        for subscription in self._subscribers.get(frame.symbol, ()):
+            subscription.offer(frame)
+
+    def stats(self):
+        return {
+            'connections': self.connections,
+            'symbols': len(self._subscribers),
+            'published': self.published,
+        }
+
+
+quote_hub = QuoteHub()
+
+
+def snapshot_frames(symbols):
+    """Current quotes for ``symbols`` as frames, sent when a client subscribes"""
+    stocks = with_quote_snapshot(Stock.objects.filter(symbol__in=symbols, is_active=True))
+    frames = []
+    for stock in stocks:
+        quote = get_quote(stock)
+        if quote is not None:
+            frames.append(encode_frame(quote_payload(stock.symbol, quote)))
+    return frames
+
+
+class TickGenerator:
+    """Local stand-in for a market feed: random-walk quotes published to the hub.
+
+    Ticks are published straight to the hub without touching the database.
+    """
+
+    def __init__(self, hub=quote_hub, interval=1.0, volatility=0.002):
+        self.hub = hub
+        self.interval = interval
+        self.volatility = volatility
+        self.prices = {}
+
+    async def load(self):
+        self.prices = await sync_to_async(self._load_prices)()
+
+    def _load_prices(self):
+        stocks = with_quote_snapshot(Stock.objects.filter(is_active=True))
+        prices = {}
+        for stock in stocks:
+            quote = get_quote(stock)
+            prices[stock.symbol] = float(quote.current_price) if quote else 100.0
+        return prices
+
+    def tick(self):
+        """Move every price one step and publish it"""
+        for symbol, price in self.prices.items():
+            previous = price
+            price = max(round(price * (1 + random.gauss(0, self.volatility)), 2), 0.01)
+            self.prices[symbol] = price
+            change = price - previous
+            self.hub.publish({
+                'symbol': symbol,
+                'price': f'{price:.2f}',
+                'change': f'{change:.2f}',
+                'change_percentage': f'{change / previous * 100:.2f}',
+                'volume': 0,
+                'high': f'{max(price, previous):.2f}',
+                'low': f'{min(price, previous):.2f}',
+                'ts': time.time(),
+            })
+
+    async def run(self):
+        await self.load()
+        while True:
+            self.tick()
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,263 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from ..models import Stock, Trade, UserTradeStats
+
+
+CENT = Decimal('0.01')
+ZERO = Decimal('0.00')
+REBUILD_CHUNK_SIZE = 1000
+TRADE_COUNTERS = ('total_trades', 'buy_trades', 'sell_trades', 'total_volume', 'total_amount')
+BREAKDOWNS = (UserTradeStats.SYMBOL, UserTradeStats.MONTH)
+MONTH_FORMAT = '%Y-%m'
+STATS_TABLE = UserTradeStats._meta.db_table
+ROW_FILTER = 'WHERE user_id = %(user_id)s AND dimension = %(dimension)s AND bucket = %(bucket)s'
+# Moves one stats row by a batch's deltas; the row exists beforehand
+APPLY_STATS_SQL = (
+    f'UPDATE {STATS_TABLE} SET '
+    + ', '.join(f'{field} = {field} + %({field})s' for field in TRADE_COUNTERS)
+    + f', updated_at = %(now)s {ROW_FILTER}'
+)
+SET_STATS_SQL = (
+    f'UPDATE {STATS_TABLE} SET '
+    + ', '.join(f'{field} = %({field})s' for field in TRADE_COUNTERS)
+    + f', updated_at = %(now)s {ROW_FILTER}'
+)
+
+
+def counters():
+    """The trade counters as conditional aggregates, for one pass over Trade"""
+    return {
+        'total_trades': Count('pk'),
+        'buy_trades': Count('pk', filter=Q(side='BUY')),
+        'sell_trades': Count('pk', filter=Q(side='SELL')),
+        'total_volume': Sum('quantity', default=0),
+        'total_amount': Sum('total_amount', default=ZERO),
+    }
+
+
+def month_bucket(moment):
+    return timezone.localtime(moment).strftime(MONTH_FORMAT)
+
+
+def record_trade_stats(trades):
+    """Fold freshly executed trades into their users' UserTradeStats rows.
+
+    Must run inside the transaction that created ``trades``. Trades are
+    summed per (user, dimension, bucket) in memory; missing rows are first
+    seeded from the user's earlier trades (from before the stats existed, or
+    written elsewhere), and every row is then moved by its deltas in one
+    statement, in sorted order so concurrent batches can't deadlock.
+    """
+    if not trades:
+        return
+    symbols = dict(Stock.objects.filter(pk__in={trade.stock_id for trade in trades}).values_list('pk', 'symbol'))
+    deltas = {}
+    for trade in trades:
+        for dimension, bucket in (
+            (UserTradeStats.TOTAL, ''),
+            (UserTradeStats.SYMBOL, symbols[trade.stock_id]),
+            (UserTradeStats.MONTH, month_bucket(trade.executed_at)),
+        ):
+            delta = deltas.get((trade.user_id, dimension, bucket))
+            if delta is None:
+                delta = deltas[trade.user_id, dimension, bucket] = dict.fromkeys(TRADE_COUNTERS, 0)
+            delta['total_trades'] += 1
+            delta['buy_trades'] += trade.side == 'BUY'
+            delta['sell_trades'] += trade.side == 'SELL'
+            delta['total_volume'] += trade.quantity
+            delta['total_amount'] += trade.total_amount
+    _seed_missing(deltas, [trade.pk for trade in trades])
+    _write(deltas, APPLY_STATS_SQL)
+
+
+def _seed_missing(keys, exclude):
+    """Create the stats rows of ``keys`` that don't exist yet from the trade log, leaving out ``exclude``.
+
+    A user without a total row gets every bucket of their earlier trades,
+    the others only the missing buckets among ``keys``.
+    """
+    stored = set(
+        UserTradeStats.objects.filter(user_id__in={key[0] for key in keys}, bucket__in={key[2] for key in keys})
+        .values_list('user_id', 'dimension', 'bucket')
+    )
+    missing = [key for key in keys if key not in stored]
+    if not missing:
+        return
+    fresh = {user_id for user_id, dimension, _ in missing if dimension == UserTradeStats.TOTAL}
+    trades = Trade.objects.exclude(pk__in=exclude)
+    rows = []
+    for dimension in (UserTradeStats.TOTAL, *BREAKDOWNS):
+        wanted = {
+            (user_id, bucket) for user_id, key_dimension, bucket in missing
+            if key_dimension == dimension and user_id not in fresh
+        }
+        scope = Q(user_id__in=fresh)
+        for bucket in {bucket for _, bucket in wanted}:
+            users = Q(user_id__in={user_id for user_id, other in wanted if other == bucket})
+            scope |= users & _bucket_filter(dimension, bucket)
+        grouped = _grouped(trades.filter(scope), dimension, by_user=True)
+        for user_id, key_dimension, bucket in missing:
+            if key_dimension == dimension:
+                grouped.setdefault((user_id, bucket), {})
+        rows.extend(
+            UserTradeStats(
+                user_id=user_id, dimension=dimension, bucket=bucket,
+                **{field: row.get(field) or 0 for field in TRADE_COUNTERS},
+            )
+            for (user_id, bucket), row in grouped.items()
+        )
+    UserTradeStats.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def _bucket_filter(dimension, bucket):
+    """Trades falling in ``bucket`` of a symbol or month breakdown"""
+    if dimension == UserTradeStats.SYMBOL:
+        return Q(stock__symbol=bucket)
+    start = datetime.strptime(bucket, MONTH_FORMAT)
+    end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    return Q(executed_at__gte=timezone.make_aware(start), executed_at__lt=timezone.make_aware(end))
+
+
+def trade_summary(user, breakdowns=()):
+    """Trade counters of ``user``, with ``by_symbol``/``by_month`` lists for the requested ``breakdowns``.
+
+    Reads the user's UserTradeStats rows in one query. A user without a
+    total row (no trades yet, or only trades older than the stats) is
+    served from Trade: one conditional aggregate, plus one grouped query
+    per breakdown.
+    """
+    rows = list(
+        UserTradeStats.objects.filter(user=user, dimension__in=[UserTradeStats.TOTAL, *breakdowns])
+        .values('dimension', 'bucket', *TRADE_COUNTERS)
+    )
+    total = next((row for row in rows if row['dimension'] == UserTradeStats.TOTAL), None)
+    if total is None:
+        trades = Trade.objects.filter(user=user)
+        summary = _summary(trades.aggregate(**counters()))
+        for dimension in breakdowns:
+            summary[f'by_{dimension}'] = _breakdown(dimension, _grouped(trades, dimension).values())
+        return summary
+
+    summary = _summary(total)
+    for dimension in breakdowns:
+        summary[f'by_{dimension}'] = _breakdown(dimension, [row for row in rows if row['dimension'] == dimension])
+    return summary
+
+
+def _grouped(trades, dimension, by_user=False):
+    """Counter rows of ``trades`` keyed by ([user id,] bucket) like UserTradeStats rows of ``dimension``"""
+    fields = ['user_id'] if by_user else []
+    if dimension == UserTradeStats.TOTAL:
+        rows = trades.values(*fields, group=F('user_id')).annotate(**counters())
+    elif dimension == UserTradeStats.SYMBOL:
+        rows = trades.values(*fields, group=F('stock__symbol')).annotate(**counters())
+    else:
+        rows = trades.annotate(group=TruncMonth('executed_at')).values(*fields, 'group').annotate(**counters())
+    grouped = {}
+    for row in rows:
+        group = row.pop('group')
+        if dimension == UserTradeStats.TOTAL:
+            row['bucket'] = ''
+        else:
+            row['bucket'] = group.strftime(MONTH_FORMAT) if dimension == UserTradeStats.MONTH else group
+        grouped[(row.pop('user_id'), row['bucket']) if by_user else row['bucket']] = row
+    return grouped
+
+
+def _summary(row):
+    count = row['total_trades'] or 0
+    amount = _cents(row['total_amount'])
+    return {
+        'total_trades': count,
+        'buy_trades': row['buy_trades'] or 0,
+        'sell_trades': row['sell_trades'] or 0,
+        'total_volume': row['total_volume'] or 0,
+        'total_amount': amount,
+        'average_trade_size': (amount / count).quantize(CENT) if count else ZERO,
+    }
+
+
+def _breakdown(dimension, rows):
+    """Summaries labelled by ``symbol`` or ``month``, in bucket order"""
+    return [{dimension: row['bucket'], **_summary(row)} for row in sorted(rows, key=lambda row: row['bucket'])]
+
+
+class RebuildReport:
+    """Outcome of a verifying UserTradeStats rebuild"""
+
+    def __init__(self):
+        self.users = 0
+        self.drifted = {}  # user id -> {'dimension bucket field': (stored, recomputed)}
+
+
+def rebuild_trade_stats(user_ids=None, chunk_size=REBUILD_CHUNK_SIZE, fix=True):
+    """Recompute UserTradeStats from the trade log and report drift.
+
+    Users are walked in primary-key chunks with one grouped query per
+    dimension. With ``fix`` drifted rows are overwritten and rows of buckets
+    the log no longer has are removed. Returns a RebuildReport.
+    """
+    report = RebuildReport()
+    users = User.objects.order_by('pk').values_list('pk', flat=True)
+    if user_ids is not None:
+        users = users.filter(pk__in=list(user_ids))
+
+    last_pk = 0
+    while True:
+        chunk = list(users.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1]
+        with transaction.atomic():
+            trades = Trade.objects.filter(user_id__in=chunk)
+            expected = {}
+            for dimension in (UserTradeStats.TOTAL, *BREAKDOWNS):
+                for (user_id, bucket), row in _grouped(trades, dimension, by_user=True).items():
+                    row.pop('bucket')
+                    row['total_amount'] = _cents(row['total_amount'])
+                    expected[user_id, dimension, bucket] = row
+            stored = {
+                (row.pop('user_id'), row.pop('dimension'), row.pop('bucket')): row
+                for row in UserTradeStats.objects.filter(user_id__in=chunk)
+                .values('user_id', 'dimension', 'bucket', *TRADE_COUNTERS)
+            }
+            stale = {key: row for key, row in expected.items() if stored.get(key) != row}
+            gone = [key for key in stored if key not in expected]
+            for key in [*stale, *gone]:
+                before, after = stored.get(key, {}), expected.get(key, {})
+                label = ' '.join(filter(None, key[1:]))
+                report.drifted.setdefault(key[0], {}).update(
+                    (f'{label} {field}', (before.get(field, 0), after.get(field, 0)))
+                    for field in TRADE_COUNTERS if before.get(field, 0) != after.get(field, 0)
+                )
+            if fix:
+                for user_id, dimension, bucket in gone:
+                    UserTradeStats.objects.filter(user_id=user_id, dimension=dimension, bucket=bucket).delete()
+                _write(stale, SET_STATS_SQL)
+        report.users += len(chunk)
+    return report
+
+
+def _write(rows, sql):
+    """Run ``sql`` for every (user id, dimension, bucket) in ``rows``, creating missing rows first"""
+    UserTradeStats.objects.bulk_create(
+        [UserTradeStats(user_id=user_id, dimension=dimension, bucket=bucket) for user_id, dimension, bucket in rows],
+        ignore_conflicts=True,
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            {**rows[key], 'user_id': key[0], 'dimension': key[1], 'bucket': key[2], 'now': now}
+            for key in sorted(rows)
+        ])
+
+
+def _cents(value):
+    return Decimal(value or 0).quantize(CENT)
@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MarketData, Stock, StockPrice
+from .services.charts import invalidate_charts
+from .services.indicators import refresh_indicators
+from .services.matching import matching_engine
+from .services.movers import movers_index
+from .services.ohlcv_store import bars_from_prices, ohlcv_store
+from .services.quotes import quote_cache
+from .services.rolling_stats import apply_bars
+from .services.search import stock_search_index
+from .services.streaming import quote_hub, quote_payload
+
+
+@receiver(post_save, sender=MarketData)
+def cache_market_data(sender, instance, **kwargs):
+    """Feed committed MarketData writes into the quote cache"""
+    transaction.on_commit(lambda: quote_cache.put(instance))
+
+
+@receiver(post_save, sender=MarketData)
+def match_resting_orders(sender, instance, **kwargs):
+    """Fill resting orders crossed by a committed price change"""
+    transaction.on_commit(lambda: matching_engine.on_price(instance.stock_id, instance.current_price))
+
+
+@receiver(post_save, sender=MarketData)
+def stream_market_data(sender, instance, **kwargs):
+    """Push committed quote changes to streaming subscribers"""
+    symbol = instance.stock.symbol
+    transaction.on_commit(lambda: quote_hub.publish(quote_payload(symbol, instance)))
+
+
+@receiver(post_save, sender=MarketData)
+def rank_market_data(sender, instance, **kwargs):
+    """Re-rank the stock in the movers index after a committed quote change"""
+    sector = instance.stock.sector
+    transaction.on_commit(lambda: movers_index.update(
+        instance.stock_id, instance.change_percentage, instance.volume, sector
+    ))
+
+
+@receiver(post_delete, sender=MarketData)
+def evict_market_data(sender, instance, **kwargs):
+    """Drop deleted MarketData rows from the quote cache and movers index"""
+    def evict():
+        quote_cache.invalidate(instance.stock_id)
+        movers_index.remove(instance.stock_id)
+    transaction.on_commit(evict)
+
+
+@receiver(post_save, sender=StockPrice)
+def append_price_bar(sender, instance, **kwargs):
+    """Append committed daily bars to the symbol's columnar store, if it has one"""
+    symbol = instance.stock.symbol
+    transaction.on_commit(lambda: ohlcv_store.append(symbol, bars_from_prices([instance])))
+
+
+@receiver(post_save, sender=StockPrice)
+def expire_price_charts(sender, instance, **kwargs):
+    """Drop cached price_history charts once a new bar is committed"""
+    transaction.on_commit(lambda: invalidate_charts(instance.stock_id))
+
+
+@receiver(post_save, sender=StockPrice)
+def update_rolling_stats(sender, instance, **kwargs):
+    """Fold committed daily bars into the stock's rolling statistics"""
+    bar = (instance.date, instance.high_price, instance.low_price, instance.close_price, instance.volume)
+    transaction.on_commit(lambda: apply_bars(instance.stock_id, [bar]))
+
+
+@receiver(post_save, sender=StockPrice)
+def update_technical_indicators(sender, instance, **kwargs):
+    """Recompute the stock's technical indicators when a daily bar is committed"""
+    transaction.on_commit(lambda: refresh_indicators([instance.stock_id]))
+
+
+@receiver(post_save, sender=Stock)
+@receiver(post_delete, sender=Stock)
+def reindex_stocks(sender, instance, **kwargs):
+    """Rebuild the stock search index after a committed stock change"""
+    transaction.on_commit(stock_search_index.reset)
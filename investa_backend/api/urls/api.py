@@ -5,10 +5,11 @@ from .. import views
 from ..views.trading import (
     StockViewSet, UserWatchlistViewSet, PortfolioViewSet, OrderViewSet,
     TradeViewSet, TradingPerformanceViewSet, MarketDataViewSet, MarketIndexViewSet,
-    AchievementViewSet
+    AchievementViewSet, BacktestViewSet
 )
 from ..views.auth import PingView, ForgotPasswordView, ResetPasswordView
 from ..views.ai import AISettingsViewSet, TestConnectionView
+from ..views.streaming import quote_stream
 
 router = DefaultRouter()
 router.register(r'languages', views.LanguageViewSet)
@@ -42,6 +43,7 @@ router.register(r'trading-performance', TradingPerformanceViewSet, basename='tra
 router.register(r'market-data', MarketDataViewSet, basename='market')
 router.register(r'market-indices', MarketIndexViewSet, basename='market-index')
 router.register(r'achievements', AchievementViewSet, basename='achievement')
+router.register(r'backtests', BacktestViewSet, basename='backtest')
 router.register(r'news', views.NewsFeedViewSet, basename='news')
 
 urlpatterns = [
@@ -58,4 +60,5 @@ urlpatterns = [
     path('ai/tutor/', views.TutorView.as_view(), name='ai_tutor'),
     path('ai/settings/', AISettingsViewSet.as_view({'get': 'list', 'post': 'create', 'put': 'update', 'patch': 'update'}), name='ai_settings'),
     path('ai/test/', TestConnectionView.as_view(), name='ai_test'),
+    path('stream/quotes/', quote_stream, name='quote_stream'),
 ]
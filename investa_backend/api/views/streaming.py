@@ -0,0 +1,175 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from ..models import PortfolioHolding, Stock, UserWatchlist
+from ..services.streaming import quote_hub, snapshot_frames
+
+
+class StreamRequestError(Exception):
+    def __init__(self, detail, status=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+
+
+def _authenticate(authorization, token):
+    """Resolve a DRF token from the Authorization header or ``token`` parameter"""
+    if authorization.startswith('Token '):
+        token = authorization[len('Token '):].strip()
+    if not token:
+        return None
+    try:
+        user, _ = TokenAuthentication().authenticate_credentials(token)
+    except exceptions.AuthenticationFailed as exc:
+        raise StreamRequestError(str(exc.detail), status=401)
+    return user
+
+
+def _resolve_symbols(params, user):
+    """Symbols from ``symbols=A,B`` and/or ``source=watchlist|holdings``"""
+    symbols = {
+        symbol.strip().upper()
+        for value in params.get('symbols', [])
+        for symbol in value.split(',')
+        if symbol.strip()
+    }
+    for source in params.get('source', []):
+        if user is None:
+            raise StreamRequestError('Authentication is required to stream a watchlist or holdings.', 401)
+        if source == 'watchlist':
+            rows = UserWatchlist.objects.filter(user=user)
+        elif source == 'holdings':
+            rows = PortfolioHolding.objects.filter(portfolio__user=user)
+        else:
+            raise StreamRequestError('source must be watchlist or holdings.')
+        symbols.update(rows.values_list('stock__symbol', flat=True))
+    if not symbols:
+        raise StreamRequestError('Provide symbols=... or source=watchlist|holdings.')
+    if len(symbols) > settings.QUOTE_STREAM_MAX_SYMBOLS:
+        raise StreamRequestError(f'At most {settings.QUOTE_STREAM_MAX_SYMBOLS} symbols per stream.')
+    known = set(Stock.objects.filter(symbol__in=symbols, is_active=True).values_list('symbol', flat=True))
+    return sorted(known)
+
+
+def _open_stream(authorization, params):
+    user = _authenticate(authorization, params.get('token', [''])[0])
+    symbols = _resolve_symbols(params, user)
+    return symbols, snapshot_frames(symbols)
+
+
+async def quote_stream(request):
+    """Server-sent events stream of quote updates for a set of symbols.
+
+    ``GET /api/stream/quotes/?symbols=TCS,INFY`` or ``?source=watchlist``
+    (``holdings``) with a token. Sends the current quotes first, then one
+    ``quote`` event per update, coalesced per symbol for slow clients.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Quote streaming requires the ASGI server (investa_backend.asgi).'},
+                            status=501)
+    params = {key: request.GET.getlist(key) for key in request.GET}
+    try:
+        symbols, snapshot = await sync_to_async(_open_stream)(request.headers.get('Authorization', ''), params)
+    except StreamRequestError as exc:
+        return JsonResponse({'detail': exc.detail}, status=exc.status)
+
+    subscription = quote_hub.subscribe(symbols)
+
+    async def events():
+        try:
+            yield b'retry: 3000\n\n' + b''.join(frame.sse for frame in snapshot)
+            while True:
+                try:
+                    frames = await asyncio.wait_for(subscription.get(), settings.QUOTE_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b': keepalive\n\n'
+                    continue
+                if subscription.closed:
+                    return
+                yield b''.join(frame.sse for frame in frames)
+        finally:
+            quote_hub.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def quote_websocket(scope, receive, send):
+    """WebSocket quote stream (ASGI app mounted at ``/ws/quotes/`` by asgi.py).
+
+    Accepts the same query parameters as ``quote_stream``. Clients may send
+    ``{"action": "subscribe"|"unsubscribe", "symbols": [...]}`` to change the
+    set; each update batch is sent as one JSON array of quotes.
+    """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    params = parse_qs(scope.get('query_string', b'').decode())
+    headers = dict(scope.get('headers', []))
+    try:
+        symbols, snapshot = await sync_to_async(_open_stream)(
+            headers.get(b'authorization', b'').decode(), params
+        )
+    except StreamRequestError as exc:
+        await send({'type': 'websocket.close', 'code': 4000 + exc.status, 'reason': exc.detail})
+        return
+
+    await send({'type': 'websocket.accept'})
+    subscription = quote_hub.subscribe(symbols)
+
+    async def send_quotes(frames):
+        await send({'type': 'websocket.send', 'text': '[' + ','.join(frame.text for frame in frames) + ']'})
+
+    async def sender():
+        if snapshot:
+            await send_quotes(snapshot)
+        while True:
+            frames = await subscription.get()
+            if subscription.closed:
+                return
+            await send_quotes(frames)
+
+    sending = asyncio.ensure_future(sender())
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            if message['type'] == 'websocket.receive' and message.get('text'):
+                await _handle_command(subscription, message['text'], send)
+    finally:
+        quote_hub.unsubscribe(subscription)
+        sending.cancel()
+
+
+async def _handle_command(subscription, text, send):
+    try:
+        command = json.loads(text)
+        action = command['action']
+        symbols = [str(symbol).strip().upper() for symbol in command['symbols']]
+    except (ValueError, KeyError, TypeError):
+        await send({'type': 'websocket.send', 'text': json.dumps({'error': 'Invalid command'})})
+        return
+    if action == 'subscribe':
+        if len(subscription.symbols | set(symbols)) > settings.QUOTE_STREAM_MAX_SYMBOLS:
+            await send({'type': 'websocket.send', 'text': json.dumps({'error': 'Too many symbols'})})
+            return
+        known = await sync_to_async(list)(
+            Stock.objects.filter(symbol__in=symbols, is_active=True).values_list('symbol', flat=True)
+        )
+        quote_hub.update(subscription, add=known)
+        snapshot = await sync_to_async(snapshot_frames)(known)
+        for frame in snapshot:
+            subscription.offer(frame)
+    elif action == 'unsubscribe':
+        quote_hub.update(subscription, remove=symbols)
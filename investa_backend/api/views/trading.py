@@ -1,29 +1,45 @@
+import copy
+
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
-from django.db.models import Sum, Avg
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum, Count, Prefetch, Q
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.http import parse_etags, quote_etag
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 from ..models import (
-    Stock, StockPrice, StockNews, MarketIndex, UserWatchlist, Portfolio, PortfolioHolding,
-    Order, Trade, TradingPerformance, TradingSession, MarketData,
-    TechnicalIndicator, Achievement, UserAchievement, Notification
+    Stock, StockPrice, StockNews, MarketIndex, UserWatchlist, Portfolio, PositionLot,
+    Order, Trade, TradingPerformance, LeaderboardEntry, TradingSession, MarketData,
+    TechnicalIndicator, Achievement, UserAchievement
 )
-
-def _create_notification(user, title, message, notif_type):
-    """Helper to create notifications"""
-    Notification.objects.create(
-        user=user,
-        title=title,
-        message=message,
-        notification_type=notif_type
-    )
+from ..pagination import NewsCursorPagination, OrderHistoryPagination
+from ..services.backtest import STRATEGIES, run_backtest
+from ..services.charts import DOWNSAMPLE_METHODS, INTERVALS, MIN_POINTS, chart_rows
+from ..services.execution import DEFAULT_FILL_PRICE, apply_fills
+from ..services.leaderboard import (
+    TIMEFRAMES, pending_entry, ranked_entries, top_entries
+)
+from ..services.matching import matching_engine
+from ..services.movers import RANKINGS, movers_index
+from ..services.news import attach_symbols, filter_stock, search_news
+from ..services.quotes import (
+    with_quote_snapshot, get_quote, get_quotes, attach_quotes, quote_cache, quote_columns, quote_version
+)
+from ..services.risk import DEFAULT_BENCHMARK, DEFAULT_CONFIDENCE, DEFAULT_LOOKBACK, MAX_LOOKBACK, portfolio_risk
+from ..services.search import DEFAULT_LIMIT, MAX_LIMIT, stock_search_index
+from ..services.snapshots import history_rows
+from ..services.streaming import quote_hub
+from ..services.trade_stats import BREAKDOWNS, trade_summary
 from ..serializers.trading import (
-    StockSerializer, StockDetailSerializer, StockPriceSerializer, UserWatchlistSerializer, StockWatchlistSerializer,
+    StockSerializer, StockDetailSerializer, UserWatchlistSerializer, StockWatchlistSerializer,
     PortfolioSerializer, PortfolioSummarySerializer, PortfolioHoldingSerializer,
-    OrderSerializer, OrderHistorySerializer, TradeSerializer,
+    OrderSerializer, BulkOrderSerializer, OrderHistorySerializer, TradeSerializer, BacktestSerializer,
     TradingPerformanceSerializer, TradingSessionSerializer,
     MarketDataSerializer, TechnicalIndicatorSerializer,
     AchievementSerializer, UserAchievementSerializer, LeaderboardSerializer,
@@ -31,6 +47,18 @@ from ..serializers.trading import (
 )
 
 
+def conditional_response(request, version, build):
+    """304 when If-None-Match already holds ``version``, else ``build()``'s data; both carry the ETag"""
+    etag = quote_etag(version)
+    known = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in known or '*' in known:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(build())
+    response['ETag'] = etag
+    return response
+
+
 class StockViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for stock information"""
     serializer_class = StockSerializer
@@ -38,7 +66,7 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
     throttle_classes = [AnonRateThrottle]
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'price_history']:
+        if self.action in ['list', 'retrieve', 'price_history', 'search']:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
@@ -47,20 +75,39 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['symbol', 'name', 'market_cap', 'created_at']
     
     def get_queryset(self):
-        return Stock.objects.filter(is_active=True)
+        queryset = Stock.objects.filter(is_active=True)
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('rolling_stats')
+        return with_quote_snapshot(queryset)
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return StockDetailSerializer
         return StockSerializer
     
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Autocomplete stocks by symbol prefix or (fuzzy) company name.
+
+        Served from the in-process search index; ``limit`` caps the results.
+        """
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            return Response({'detail': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        matches = stock_search_index.search(request.query_params.get('q', ''), limit)
+        return Response({'results': [entry._asdict() for entry in matches]})
+
     @action(detail=True, methods=['get'])
     def market_data(self, request, pk=None):
         """Get market data for a specific stock"""
         stock = self.get_object()
-        market_data = stock.market_data.first()
+        market_data = get_quote(stock)
         
         if market_data:
+            # Cached rows are shared, so attach the stock to a private copy
+            market_data = copy.copy(market_data)
+            market_data.stock = stock
             serializer = MarketDataSerializer(market_data)
             return Response(serializer.data)
         return Response({'detail': 'Market data not available'}, status=status.HTTP_404_NOT_FOUND)
@@ -75,21 +122,44 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=True, methods=['get'])
     def price_history(self, request, pk=None):
-        """Get price history for a specific stock"""
+        """Get price history for a specific stock.
+
+        ``interval`` (daily/weekly/monthly) aggregates candles and ``points``
+        thins the series for line charts (``method`` lttb or minmax). Rows
+        are bars rather than StockPrice records, so they carry no ``id`` or
+        ``created_at``.
+        """
         stock = self.get_object()
-        days = int(request.query_params.get('days', 30))
-        start_date = timezone.now().date() - timedelta(days=days)
+        interval = request.query_params.get('interval', 'daily')
+        method = request.query_params.get('method', 'lttb')
+        if interval not in INTERVALS:
+            return Response({'detail': f"interval must be one of: {', '.join(INTERVALS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if method not in DOWNSAMPLE_METHODS:
+            return Response({'detail': f"method must be one of: {', '.join(DOWNSAMPLE_METHODS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            days = int(request.query_params.get('days', 30))
+            points = request.query_params.get('points')
+            points = int(points) if points else None
+        except ValueError:
+            return Response({'detail': 'days and points must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if points is not None and points < MIN_POINTS[method]:
+            return Response({'detail': f'points must be at least {MIN_POINTS[method]} for {method}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            start_date = timezone.now().date() - timedelta(days=days)
+        except OverflowError:
+            return Response({'detail': 'days is out of range'}, status=status.HTTP_400_BAD_REQUEST)
 
-        prices = stock.prices.filter(date__gte=start_date).order_by('date')
-        serializer = StockPriceSerializer(prices, many=True)
-        return Response(serializer.data)
+        return Response(chart_rows(stock, start_date, interval, points, method))
 
     @action(detail=True, methods=['get'])
     def news(self, request, pk=None):
         """Get latest news for a specific stock"""
         stock = self.get_object()
         limit = int(request.query_params.get('limit', 10))
-        latest = stock.news.all()[:limit]
+        latest = attach_symbols(list(stock.linked_news.select_related('stock')[:limit]))
         serializer = StockNewsSerializer(latest, many=True)
         return Response({'results': serializer.data})
 
@@ -109,17 +179,27 @@ class UserWatchlistViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return UserWatchlist.objects.filter(user=self.request.user)
+        queryset = UserWatchlist.objects.filter(user=self.request.user).select_related('user', 'stock')
+        return with_quote_snapshot(queryset, 'stock__market_data')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
     @action(detail=False, methods=['get'])
     def my_watchlist(self, request):
-        """Get current user's watchlist with stock details"""
-        watchlist = self.get_queryset().select_related('stock')
-        serializer = StockWatchlistSerializer(watchlist, many=True, context={'request': request})
-        return Response(serializer.data)
+        """Get current user's watchlist with stock details.
+
+        Quotes come from the batched quote path and the response carries an
+        ETag, so an unchanged watchlist answers If-None-Match with a 304.
+        """
+        watchlist = list(UserWatchlist.objects.filter(user=request.user).select_related('user', 'stock'))
+        quotes = attach_quotes([item.stock for item in watchlist])
+        version = quote_version(
+            quotes.values(), [(item.pk, item.stock.updated_at.timestamp()) for item in watchlist]
+        )
+        return conditional_response(request, version, lambda: StockWatchlistSerializer(
+            watchlist, many=True, context={'request': request}
+        ).data)
     
     @action(detail=False, methods=['post'])
     def add_stock(self, request):
@@ -171,14 +251,96 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=['get'])
     def holdings(self, request):
-        """Get portfolio holdings"""
+        """Get portfolio holdings with their open lots and realized/unrealized P&L.
+
+        Realized P&L is kept running on each holding and the portfolio (which
+        also counts closed positions), so no trade history is read.
+        """
         portfolio = self.get_queryset().first()
         if not portfolio:
             return Response({'holdings': []})
         
-        holdings = portfolio.holdings.select_related('stock').order_by('-market_value')
+        holdings = with_quote_snapshot(
+            portfolio.holdings.select_related('stock').prefetch_related(
+                Prefetch('lots', queryset=PositionLot.objects.order_by('acquired_at', 'pk'))
+            ).order_by('-market_value'),
+            'stock__market_data'
+        )
         serializer = PortfolioHoldingSerializer(holdings, many=True)
-        return Response({'holdings': serializer.data})
+        unrealized_pnl = sum((Decimal(row['unrealized_pnl']) for row in serializer.data), Decimal('0.00'))
+        return Response({
+            'holdings': serializer.data,
+            'cost_basis_method': portfolio.cost_basis_method,
+            'realized_pnl': str(portfolio.realized_pnl),
+            'unrealized_pnl': str(unrealized_pnl),
+        })
+
+    @action(detail=False, methods=['post'])
+    def cost_basis(self, request):
+        """Choose how sells consume lots: ``method`` AVERAGE, FIFO or LIFO"""
+        method = request.data.get('method')
+        methods = [choice for choice, _ in Portfolio.COST_BASIS_METHODS]
+        if method not in methods:
+            return Response({'detail': f"method must be one of: {', '.join(methods)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            portfolio, _ = Portfolio.objects.select_for_update().get_or_create(user=request.user)
+            if method != portfolio.cost_basis_method and portfolio.holdings.exists():
+                # Lot prices and average-cost basis disagree once shares have been sold
+                return Response({'detail': 'The cost basis method can only change while nothing is held'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            portfolio.cost_basis_method = method
+            portfolio.save(update_fields=['cost_basis_method', 'updated_at'])
+        return Response({'cost_basis_method': method})
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """Get the portfolio's daily value history.
+
+        ``days`` limits the range (0 for all of it) and ``points`` thins the
+        series for line charts (``method`` lttb or minmax).
+        """
+        method = request.query_params.get('method', 'lttb')
+        if method not in DOWNSAMPLE_METHODS:
+            return Response({'detail': f"method must be one of: {', '.join(DOWNSAMPLE_METHODS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            days = int(request.query_params.get('days', 365))
+            points = request.query_params.get('points')
+            points = int(points) if points else None
+        except ValueError:
+            return Response({'detail': 'days and points must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        portfolio = self.get_queryset().first()
+        if not portfolio:
+            return Response([])
+        start_date = timezone.now().date() - timedelta(days=days) if days > 0 else None
+        return Response(history_rows(portfolio, start_date, points, method))
+
+    @action(detail=False, methods=['get'])
+    def risk(self, request):
+        """Get volatility, beta, value at risk and correlations of the holdings.
+
+        ``lookback`` sets the trading days of history, ``confidence`` the VaR
+        level and ``benchmark`` the market index used for beta.
+        """
+        try:
+            lookback = int(request.query_params.get('lookback', DEFAULT_LOOKBACK))
+            confidence = float(request.query_params.get('confidence', DEFAULT_CONFIDENCE))
+        except ValueError:
+            return Response({'detail': 'lookback must be an integer and confidence a number'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 2 <= lookback <= MAX_LOOKBACK or not 0.5 <= confidence < 1:
+            return Response({'detail': f'lookback must be within 2-{MAX_LOOKBACK} and confidence within 0.5-1'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        portfolio = self.get_queryset().first()
+        if not portfolio:
+            return Response({'detail': 'Portfolio not found'}, status=status.HTTP_404_NOT_FOUND)
+        result = portfolio_risk(
+            portfolio, lookback, confidence, request.query_params.get('benchmark', DEFAULT_BENCHMARK)
+        )
+        if 'detail' in result:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -189,7 +351,8 @@ class OrderViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'status', 'side']
     
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).select_related('stock')
+        queryset = Order.objects.filter(user=self.request.user).select_related('user', 'stock')
+        return with_quote_snapshot(queryset, 'stock__market_data')
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -197,112 +360,75 @@ class OrderViewSet(viewsets.ModelViewSet):
         return OrderSerializer
     
     def perform_create(self, serializer):
-        user = self.request.user
-        # Save the order
-        order = serializer.save(user=user)
-        
-        # Handle MARKET order execution
-        if order.order_type == 'MARKET':
-            stock = order.stock
-            market_data = stock.market_data.first()
-            
-            if not market_data:
-                # If no market data, use a default price or return error
-                # For now, let's assume market data exists or use a fallback
-                price = Decimal('150.00') 
+        # Saving the order and executing it is one atomic unit
+        with transaction.atomic():
+            order = serializer.save(user=self.request.user)
+            market_data = get_quote(order.stock)
+
+            if order.order_type == 'MARKET':
+                # Fall back to a default price when the stock has no market data
+                price = market_data.current_price if market_data else DEFAULT_FILL_PRICE
+                apply_fills({order.pk: price})
             else:
-                price = market_data.current_price
-                
-            # Update order status to FILLED
-            order.status = 'FILLED'
-            order.filled_quantity = order.quantity
-            order.average_fill_price = price
-            order.save()
-            
-            # Create a Trade record
-            total_amount = order.quantity * price
-            trade = Trade.objects.create(
-                user=user,
-                order=order,
-                stock=stock,
-                side=order.side,
-                quantity=order.quantity,
-                price=price,
-                total_amount=total_amount,
-                commission=total_amount * Decimal('0.001'), # 0.1% commission
-                net_amount=total_amount # Simplified for now
-            )
-            
-            # Update Portfolio
-            portfolio, _ = Portfolio.objects.get_or_create(user=user)
-            
-            if order.side == 'BUY':
-                # Deduct from cash balance
-                portfolio.cash_balance -= total_amount
-                
-                # Create or update PortfolioHolding
-                holding, created = PortfolioHolding.objects.get_or_create(
-                    portfolio=portfolio,
-                    stock=stock,
-                    defaults={
-                        'quantity': order.quantity,
-                        'average_price': price,
-                        'total_invested': total_amount,
-                        'current_price': price,
-                        'market_value': total_amount
-                    }
-                )
-                
-                if not created:
-                    # Update existing holding
-                    new_quantity = holding.quantity + order.quantity
-                    new_total_invested = holding.total_invested + total_amount
-                    holding.quantity = new_quantity
-                    holding.total_invested = new_total_invested
-                    holding.average_price = new_total_invested / new_quantity
-                    holding.current_price = price
-                    holding.market_value = new_quantity * price
-                    holding.save()
-            
-            elif order.side == 'SELL':
-                # Credit to cash balance
-                portfolio.cash_balance += total_amount
-                
-                # Update or remove PortfolioHolding
-                try:
-                    holding = PortfolioHolding.objects.get(portfolio=portfolio, stock=stock)
-                    if holding.quantity <= order.quantity:
-                        # Selling everything or more than owned (should be handled by validation usually)
-                        holding.delete()
-                    else:
-                        holding.quantity -= order.quantity
-                        # total_invested adjustment (simplified: reduce proportionally)
-                        holding.total_invested = (holding.total_invested / (holding.quantity + order.quantity)) * holding.quantity
-                        holding.market_value = holding.quantity * price
-                        holding.save()
-                except PortfolioHolding.DoesNotExist:
-                    # Selling something not owned - should be caught by validation
-                    pass
-            
-            # Recalculate portfolio totals
-            all_holdings = portfolio.holdings.all()
-            portfolio.total_invested = all_holdings.aggregate(total=Sum('total_invested'))['total'] or Decimal('0.00')
-            portfolio.total_value = (all_holdings.aggregate(total=Sum('market_value'))['total'] or Decimal('0.00')) + portfolio.cash_balance
-            portfolio.total_profit_loss = portfolio.total_value - portfolio.total_invested
-            portfolio.save()
-            
-            # Create trading notification
-            _create_notification(
-                user, 
-                'Order Executed', 
-                f'{order.side} {order.quantity} {order.stock.symbol}', 
-                'trading'
-            )
+                # Rest LIMIT/STOP/STOP_LIMIT orders in the book once committed; marketable ones fill then
+                matching_engine.submit_on_commit([(order, market_data.current_price if market_data else None)])
+        order.refresh_from_db()
     
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Validate and execute a batch of orders in one transaction"""
+        serializer = BulkOrderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['orders']
+
+        with transaction.atomic():
+            orders = Order.objects.bulk_create([
+                Order(
+                    user=request.user,
+                    stock=item['stock'],
+                    order_type=item['order_type'],
+                    side=item['side'],
+                    quantity=item['quantity'],
+                    price=item.get('price'),
+                    stop_price=item.get('stop_price'),
+                    notes=item['notes'],
+                    total_amount=item['quantity'] * item['price'] if item.get('price') else None,
+                )
+                for item in items
+            ])
+            fills, resting = {}, []
+            for order in orders:
+                cached = quote_cache.get(order.stock_id)
+                if cached is not None:
+                    price = cached.current_price
+                else:
+                    price = order.stock.quote_price
+                if order.order_type == 'MARKET':
+                    fills[order.pk] = price if price is not None else DEFAULT_FILL_PRICE
+                else:
+                    resting.append((order, price))
+            apply_fills(fills)
+            matching_engine.submit_on_commit(resting)
+
+        results = Order.objects.filter(pk__in=[order.pk for order in orders]).order_by('pk').values(
+            'id', 'stock_id', 'side', 'order_type', 'quantity', 'status',
+            'filled_quantity', 'average_fill_price', 'total_amount'
+        )
+        portfolio = Portfolio.objects.filter(user=request.user).select_related('user').first()
+        return Response({
+            'orders': list(results),
+            'portfolio': PortfolioSummarySerializer(portfolio).data if portfolio else None,
+        }, status=status.HTTP_201_CREATED)
+
     @action(detail=False, methods=['get'])
     def order_history(self, request):
-        """Get order history with filters"""
-        queryset = self.get_queryset().select_related('stock')
+        """Get a page of order history, newest first, with filters.
+
+        ``date_from``/``date_to`` (YYYY-MM-DD, inclusive) become a half-open
+        ``created_at`` range so the (user, ..., created_at, id) indexes
+        serve both the filter and the keyset page.
+        """
+        queryset = self.get_queryset()
 
         # Apply filters
         status_filter = request.query_params.get('status')
@@ -313,32 +439,40 @@ class OrderViewSet(viewsets.ModelViewSet):
         if side_filter:
             queryset = queryset.filter(side=side_filter)
 
-        # Date range filters (ISO format: YYYY-MM-DD)
-        date_from = request.query_params.get('date_from')
+        try:
+            date_from, date_to = (
+                date.fromisoformat(value) if value else None
+                for value in (request.query_params.get('date_from'), request.query_params.get('date_to'))
+            )
+        except ValueError:
+            return Response({'detail': 'date_from and date_to must be YYYY-MM-DD dates'},
+                            status=status.HTTP_400_BAD_REQUEST)
         if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
-
-        date_to = request.query_params.get('date_to')
+            start = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
+            queryset = queryset.filter(created_at__gte=start)
         if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
+            end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+            queryset = queryset.filter(created_at__lt=end)
 
-        # Order by most recent first
-        queryset = queryset.order_by('-created_at')
-
-        serializer = OrderHistorySerializer(queryset, many=True)
-        return Response(serializer.data)
+        paginator = OrderHistoryPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = OrderHistorySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def cancel_order(self, request, pk=None):
         """Cancel a pending order"""
         order = self.get_object()
         
-        if order.status != 'PENDING':
+        # Conditional update so a fill racing with the cancel can't be overwritten
+        cancelled = Order.objects.filter(pk=order.pk, status='PENDING').update(
+            status='CANCELLED', updated_at=timezone.now()
+        )
+        if not cancelled:
             return Response({'detail': 'Only pending orders can be cancelled'}, 
                           status=status.HTTP_400_BAD_REQUEST)
-        
-        order.status = 'CANCELLED'
-        order.save()
+        matching_engine.cancel(order)
+        order.refresh_from_db()
         
         serializer = OrderSerializer(order)
         return Response(serializer.data)
@@ -352,23 +486,24 @@ class TradeViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['executed_at', 'price', 'total_amount']
     
     def get_queryset(self):
-        return Trade.objects.filter(user=self.request.user)
+        queryset = Trade.objects.filter(user=self.request.user).select_related('user', 'stock')
+        return with_quote_snapshot(queryset, 'stock__market_data')
     
     @action(detail=False, methods=['get'])
     def trade_summary(self, request):
-        """Get trading summary statistics"""
-        trades = self.get_queryset()
-        
-        summary = {
-            'total_trades': trades.count(),
-            'buy_trades': trades.filter(side='BUY').count(),
-            'sell_trades': trades.filter(side='SELL').count(),
-            'total_volume': trades.aggregate(total=Sum('quantity'))['total'] or 0,
-            'total_amount': trades.aggregate(total=Sum('total_amount'))['total'] or 0,
-            'average_trade_size': trades.aggregate(avg=Avg('total_amount'))['avg'] or 0,
-        }
-        
-        return Response(summary)
+        """Get trading summary statistics, optionally ``breakdown=symbol,month``
+
+        Served from the user's materialized UserTradeStats rows in one query.
+        """
+        breakdowns = [name for name in request.query_params.get('breakdown', '').split(',') if name]
+        unknown = [name for name in breakdowns if name not in BREAKDOWNS]
+        if unknown:
+            return Response({'detail': f"breakdown must be a list of: {', '.join(BREAKDOWNS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(trade_summary(request.user, list(dict.fromkeys(breakdowns))))
+
+LEADERBOARD_PAGE_SIZE = 50
+LEADERBOARD_MAX_PAGE_SIZE = 200
 
 
 class TradingPerformanceViewSet(viewsets.ReadOnlyModelViewSet):
@@ -394,30 +529,56 @@ class TradingPerformanceViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=['get'])
     def leaderboard(self, request):
-        """Get leaderboard data"""
+        """Get a page of the ranked leaderboard for ``timeframe=all|monthly|weekly``"""
         timeframe = request.query_params.get('timeframe', 'all')
-        
-        # Get all trading performances
-        performances = TradingPerformance.objects.select_related('user').all()
-        
-        # Apply timeframe filtering if needed
-        if timeframe == 'weekly':
-            week_ago = timezone.now() - timedelta(days=7)
-            # This would need more complex logic for weekly performance
-            pass
-        elif timeframe == 'monthly':
-            month_ago = timezone.now() - timedelta(days=30)
-            # This would need more complex logic for monthly performance
-            pass
-        
-        # Calculate ranks
-        ranked_performances = []
-        for i, performance in enumerate(performances.order_by('-portfolio_growth_percentage'), 1):
-            performance.rank = i
-            ranked_performances.append(performance)
-        
-        serializer = LeaderboardSerializer(ranked_performances, many=True)
-        return Response(serializer.data)
+        if timeframe not in TIMEFRAMES:
+            return Response({'detail': f"timeframe must be one of: {', '.join(TIMEFRAMES)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = max(1, min(int(request.query_params.get('page_size', LEADERBOARD_PAGE_SIZE)),
+                                   LEADERBOARD_MAX_PAGE_SIZE))
+        except ValueError:
+            return Response({'detail': 'page and page_size must be integers'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        count, top = top_entries(timeframe, lambda rows: LeaderboardSerializer(rows, many=True).data)
+        first_rank, last_rank = (page - 1) * page_size + 1, page * page_size
+        if last_rank <= len(top) or len(top) < settings.LEADERBOARD_TOP_N:
+            results = top[first_rank - 1:last_rank]
+        else:
+            results = LeaderboardSerializer(ranked_entries(timeframe, first_rank, last_rank), many=True).data
+        return Response({
+            'timeframe': timeframe,
+            'count': count,
+            'page': page,
+            'page_size': page_size,
+            'results': results,
+        })
+
+    @action(detail=False, methods=['get'])
+    def my_rank(self, request):
+        """Get the current user's leaderboard entry for ``timeframe``"""
+        timeframe = request.query_params.get('timeframe', 'all')
+        if timeframe not in TIMEFRAMES:
+            return Response({'detail': f"timeframe must be one of: {', '.join(TIMEFRAMES)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        entry = LeaderboardEntry.objects.filter(timeframe=timeframe, user=request.user).select_related('user').first()
+        if entry is None:
+            portfolio = Portfolio.objects.filter(user=request.user).first()
+            if portfolio is None:
+                return Response({'detail': 'No portfolio yet'}, status=status.HTTP_404_NOT_FOUND)
+            # Not recorded until the portfolio's next fill, so unranked for now
+            entry = pending_entry(timeframe, portfolio)
+            entry.user = request.user
+        count, _ = top_entries(timeframe, lambda rows: LeaderboardSerializer(rows, many=True).data)
+        data = LeaderboardSerializer(entry).data
+        data['count'] = count
+        data['percentile'] = round((1 - (entry.rank - 1) / count) * 100, 2) if entry.rank and count else None
+        return Response(data)
+
+
+TOP_MOVERS_MAX_LIMIT = 100
 
 
 class MarketDataViewSet(viewsets.ReadOnlyModelViewSet):
@@ -426,33 +587,85 @@ class MarketDataViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
-        return MarketData.objects.all()
+        return MarketData.objects.select_related('stock')
+
+    @action(detail=False, methods=['get'])
+    def quotes(self, request):
+        """Get quotes for ``symbols`` (comma separated) as one column per field.
+
+        Symbols resolve through the in-process search index and quotes through
+        the quote cache, with misses in a single query. Unknown symbols are
+        listed apart; the ETag lets unchanged quotes answer with a 304.
+        """
+        symbols = list(dict.fromkeys(
+            symbol.strip().upper() for symbol in request.query_params.get('symbols', '').split(',') if symbol.strip()
+        ))
+        if not symbols:
+            return Response({'detail': 'symbols is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(symbols) > settings.QUOTES_MAX_SYMBOLS:
+            return Response({'detail': f'At most {settings.QUOTES_MAX_SYMBOLS} symbols per request'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        entries = stock_search_index.resolve(symbols)
+        known = [symbol for symbol in symbols if symbol in entries]
+        quotes = get_quotes([entries[symbol].id for symbol in known])
+        rows = [quotes.get(entries[symbol].id) for symbol in known]
+        unknown = [symbol for symbol in symbols if symbol not in entries]
+        return conditional_response(request, quote_version(rows, known, unknown), lambda: {
+            **quote_columns(known, rows), 'unknown': unknown,
+        })
 
     @action(detail=False, methods=['get'])
     def top_movers(self, request):
-        """Get top gainers and losers"""
-        top_gainers = self.get_queryset().order_by('-change_percentage')[:10]
-        top_losers = self.get_queryset().order_by('change_percentage')[:10]
+        """Get top gainers and losers, or the most active stocks with ``by=volume``.
+
+        Supports ``limit`` and ``sector`` filters; rankings come from the
+        in-memory movers index.
+        """
+        by = request.query_params.get('by', 'change')
+        if by not in RANKINGS:
+            return Response({'detail': f"by must be one of: {', '.join(RANKINGS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(0, min(int(request.query_params.get('limit', 10)), TOP_MOVERS_MAX_LIMIT))
+        except ValueError:
+            return Response({'detail': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        sector = request.query_params.get('sector')
 
+        if by == 'volume':
+            groups = {'most_active': movers_index.top('volume', limit, sector)}
+        else:
+            groups = {
+                'top_gainers': movers_index.top('change', limit, sector),
+                'top_losers': movers_index.top('change', limit, sector, ascending=True),
+            }
+        stock_ids = set().union(*groups.values())
+        rows = {row.stock_id: row for row in self.get_queryset().filter(stock_id__in=stock_ids)}
         return Response({
-            'top_gainers': MarketDataSerializer(top_gainers, many=True).data,
-            'top_losers': MarketDataSerializer(top_losers, many=True).data
+            name: MarketDataSerializer([rows[i] for i in ids if i in rows], many=True).data
+            for name, ids in groups.items()
         })
 
     @action(detail=False, methods=['get'])
     def market_summary(self, request):
         """Get overall market summary"""
-        market_data = self.get_queryset()
+        summary = MarketData.objects.aggregate(
+            total_stocks=Count('pk'),
+            advancing=Count('pk', filter=Q(change_percentage__gt=0)),
+            declining=Count('pk', filter=Q(change_percentage__lt=0)),
+            unchanged=Count('pk', filter=Q(change_percentage=0)),
+            total_volume=Coalesce(Sum('volume'), 0),
+        )
+        return Response(summary)
 
-        summary = {
-            'total_stocks': market_data.count(),
-            'advancing': market_data.filter(change_percentage__gt=0).count(),
-            'declining': market_data.filter(change_percentage__lt=0).count(),
-            'unchanged': market_data.filter(change_percentage=0).count(),
-            'total_volume': market_data.aggregate(total=Sum('volume'))['total'] or 0,
-        }
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def cache_stats(self, request):
+        """Get quote cache hit/miss/eviction counters for this process"""
+        return Response(quote_cache.stats())
 
-        return Response(summary)
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def stream_stats(self, request):
+        """Get quote streaming connection and publish counters for this process"""
+        return Response(quote_hub.stats())
 
     @action(detail=False, methods=['get'])
     def indices(self, request):
@@ -499,20 +712,52 @@ class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class NewsFeedViewSet(viewsets.ReadOnlyModelViewSet):
+    """News across all stocks, newest first.
+
+    ``q`` full-text searches titles and summaries, ``source`` and ``symbol``
+    filter, and pages follow the ``next`` cursor on (published_at, id).
+    """
     serializer_class = None  # imported below
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NewsCursorPagination
 
     def get_queryset(self):
         from ..models import StockNews
-        qs = StockNews.objects.select_related('stock').all()
+        qs = StockNews.objects.select_related('stock')
         source = self.request.query_params.get('source')
         if source:
             qs = qs.filter(source__iexact=source)
         symbol = self.request.query_params.get('symbol')
         if symbol:
-            qs = qs.filter(stock__symbol__iexact=symbol)
+            # Every story linked to the stock, not only those it is the primary stock of
+            stock_id = Stock.objects.filter(symbol=symbol.strip().upper()).values_list('pk', flat=True).first()
+            qs = filter_stock(qs, stock_id) if stock_id is not None else qs.none()
+        query = self.request.query_params.get('q')
+        if query:
+            qs = search_news(qs, query)
         return qs
 
+    def paginate_queryset(self, queryset):
+        return attach_symbols(super().paginate_queryset(queryset))
+
     def get_serializer_class(self):
         from ..serializers import StockNewsSerializer
         return StockNewsSerializer
+
+
+class BacktestViewSet(viewsets.ViewSet):
+    """Rule-based strategy backtests over daily price history"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        """Available strategies and their default parameters"""
+        return Response({'strategies': STRATEGIES})
+
+    def create(self, request):
+        """Run a backtest; identical requests are served from the result cache"""
+        serializer = BacktestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = run_backtest(**serializer.validated_data)
+        if 'detail' in result:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
@@ -2,15 +2,48 @@
 ASGI config for investa_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Besides Django's HTTP handling it serves the quote WebSocket at ``/ws/quotes/``
+and, when ``QUOTE_STREAM_TICK_INTERVAL`` is set, runs the local tick generator
+for the lifetime of the server.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from api.services.streaming import TickGenerator  # noqa: E402
+from api.views.streaming import quote_websocket  # noqa: E402
+
+
+async def lifespan(scope, receive, send):
+    ticker = None
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if settings.QUOTE_STREAM_TICK_INTERVAL > 0:
+                generator = TickGenerator(interval=settings.QUOTE_STREAM_TICK_INTERVAL)
+                ticker = asyncio.ensure_future(generator.run())
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if ticker is not None:
+                ticker.cancel()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket' and scope['path'].rstrip('/') == '/ws/quotes':
+        await quote_websocket(scope, receive, send)
+    elif scope['type'] == 'lifespan':
+        await lifespan(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
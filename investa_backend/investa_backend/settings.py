@@ -92,6 +92,14 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock when a transaction starts so concurrent order
+            # executions queue up instead of failing with "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+            # WAL lets readers run alongside bulk ingestion writes
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+        },
     }
 }
 
@@ -196,3 +204,52 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Ollama / AI settings
 OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
 OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'llama3')
+
+# Quote cache settings (process-wide MarketData cache, see api/services/quotes.py)
+QUOTE_CACHE_TTL = int(os.environ.get('INVESTA_QUOTE_CACHE_TTL', '30'))
+QUOTE_CACHE_MAX_ENTRIES = int(os.environ.get('INVESTA_QUOTE_CACHE_MAX_ENTRIES', '5000'))
+# Maximum symbols per GET /api/market-data/quotes/ request
+QUOTES_MAX_SYMBOLS = int(os.environ.get('INVESTA_QUOTES_MAX_SYMBOLS', '1000'))
+
+# Seconds before the matching engine reloads its order books from PENDING orders,
+# picking up orders rested by other worker processes (0 = load once; see api/services/matching.py)
+MATCHING_BOOK_RELOAD_INTERVAL = int(os.environ.get('INVESTA_MATCHING_BOOK_RELOAD_INTERVAL', '30'))
+
+# Columnar OHLCV store (one memory-mapped file per symbol, see api/services/ohlcv_store.py)
+OHLCV_STORE_DIR = Path(os.environ.get('INVESTA_OHLCV_STORE_DIR', BASE_DIR / 'data' / 'ohlcv'))
+
+# Maximum number of orders accepted by POST /api/orders/bulk/
+BULK_ORDER_MAX_ORDERS = int(os.environ.get('INVESTA_BULK_ORDER_MAX_ORDERS', '100'))
+
+# Seconds a resampled/downsampled price_history response stays cached (see api/services/charts.py)
+CHART_CACHE_TTL = int(os.environ.get('INVESTA_CHART_CACHE_TTL', '300'))
+
+# Quote streaming (SSE at /api/stream/quotes/, WebSocket at /ws/quotes/; ASGI only)
+QUOTE_STREAM_MAX_SYMBOLS = int(os.environ.get('INVESTA_QUOTE_STREAM_MAX_SYMBOLS', '200'))
+QUOTE_STREAM_KEEPALIVE = float(os.environ.get('INVESTA_QUOTE_STREAM_KEEPALIVE', '15'))
+# Seconds between local random-walk ticks; 0 disables the tick generator
+QUOTE_STREAM_TICK_INTERVAL = float(os.environ.get('INVESTA_QUOTE_STREAM_TICK_INTERVAL', '0'))
+
+# Seconds before the in-memory top movers index is reloaded from the database
+MOVERS_INDEX_TTL = int(os.environ.get('INVESTA_MOVERS_INDEX_TTL', '60'))
+
+# Leaderboard snapshot (see api/services/leaderboard.py). Requests never rerank: ranks are
+# refreshed every rerank interval by `manage.py rebuild_leaderboard --rerank-only --loop` (or a
+# scheduled `--rerank-only` run); the top N entries are cached.
+LEADERBOARD_RERANK_INTERVAL = int(os.environ.get('INVESTA_LEADERBOARD_RERANK_INTERVAL', '300'))
+LEADERBOARD_TOP_N = int(os.environ.get('INVESTA_LEADERBOARD_TOP_N', '200'))
+LEADERBOARD_CACHE_TTL = int(os.environ.get('INVESTA_LEADERBOARD_CACHE_TTL', '60'))
+
+# Strategy backtests (see api/services/backtest.py): results cached per parameters,
+# close-price matrices kept per process for the most recent symbol sets
+BACKTEST_CACHE_TTL = int(os.environ.get('INVESTA_BACKTEST_CACHE_TTL', '3600'))
+BACKTEST_MATRIX_CACHE_SIZE = int(os.environ.get('INVESTA_BACKTEST_MATRIX_CACHE_SIZE', '32'))
+BACKTEST_MAX_SYMBOLS = int(os.environ.get('INVESTA_BACKTEST_MAX_SYMBOLS', '50'))
+
+# Portfolio risk (see api/services/risk.py): return statistics shared across
+# portfolios holding the same symbols, cached per day and price version
+RISK_CACHE_TTL = int(os.environ.get('INVESTA_RISK_CACHE_TTL', '3600'))
+
+# Stock autocomplete (see api/services/search.py): seconds before the in-process
+# index reloads to pick up stocks changed by other processes
+SEARCH_INDEX_TTL = int(os.environ.get('INVESTA_SEARCH_INDEX_TTL', '300'))
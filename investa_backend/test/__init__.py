@@ -2,9 +2,28 @@
 # Contains all testing and verification scripts
 
 __all__ = [
+    'benchmark_backtests',
+    'benchmark_batch_quotes',
+    'benchmark_indicators',
+    'benchmark_ingestion',
+    'benchmark_leaderboard',
+    'benchmark_news_feed',
+    'benchmark_news_ingestion',
+    'benchmark_order_history',
+    'benchmark_portfolio_history',
+    'benchmark_portfolio_risk',
+    'benchmark_quote_stream',
+    'benchmark_revaluation',
+    'benchmark_stock_search',
+    'benchmark_trade_summary',
     'create_test_user',
     'reset_test_user', 
     'test_api',
     'test_auth_flow',
+    'test_cost_basis',
+    'test_order_concurrency',
+    'test_quote_ingestion',
+    'test_stop_limit',
+    'test_trade_stats',
     'verify_data_connectivity'
 ]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark for the vectorized strategy backtester
+
+Seeds 50 synthetic symbols with 10 years of daily closes, runs every strategy
+over all of them from the database, from the cached price matrix and from
+the result cache, then removes the synthetic rows again.
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import django
+import numpy as np
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from api.models import Stock, StockPrice
+from api.services.backtest import STRATEGIES, price_matrix_cache, run_backtest
+from api.services.ingestion import upsert
+
+SYMBOLS = 50
+DAYS = 252 * 10
+TARGET_SECONDS = 1.0
+PREFIX = 'BT'
+
+
+def _seed():
+    """Insert the synthetic stocks and their random-walk closes; returns the stocks"""
+    stocks = Stock.objects.bulk_create([
+        Stock(symbol=f'{PREFIX}{i:03d}', name=f'Backtest benchmark {i}', exchange='NSE', sector='Benchmark')
+        for i in range(SYMBOLS)
+    ])
+    rng = np.random.default_rng(7)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, size=(SYMBOLS, DAYS)), axis=1))
+    first = date.today() - timedelta(days=DAYS * 7 // 5)
+    days = [(first + timedelta(days=d + d // 5 * 2)).isoformat() for d in range(DAYS)]  # Weekdays only
+    now = timezone.now().isoformat()
+    fields = ['stock', 'date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume', 'created_at']
+    with transaction.atomic():
+        for stock, row in zip(stocks, closes.round(2).tolist()):
+            upsert(StockPrice, fields, [(stock.pk, day, c, c, c, c, 1000, now) for day, c in zip(days, row)],
+                   unique_fields=['stock', 'date'], update_fields=fields[2:-1])
+    return stocks
+
+
+def _cleanup():
+    ids = list(Stock.objects.filter(symbol__startswith=PREFIX, sector='Benchmark').values_list('pk', flat=True))
+    with transaction.atomic(), connection.cursor() as cursor:
+        for table in (StockPrice._meta.db_table, Stock._meta.db_table):
+            column = 'stock_id' if table != Stock._meta.db_table else 'id'
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({",".join(["%s"] * len(ids))})', ids)
+    cache.clear()
+    price_matrix_cache.clear()
+
+
+def _time(strategy, stocks, points=250):
+    started = time.perf_counter()
+    result = run_backtest(strategy, stocks, points=points)
+    return time.perf_counter() - started, result
+
+
+def benchmark_backtests():
+    print("🧪 Benchmarking strategy backtests...")
+    print("=" * 60)
+    if Stock.objects.filter(symbol__startswith=PREFIX, sector='Benchmark').exists():
+        print("❌ Synthetic stocks from an earlier run still exist")
+        return False
+
+    passed = True
+    try:
+        started = time.perf_counter()
+        stocks = _seed()
+        print(f"\n1️⃣ Seeded {SYMBOLS} symbols x {DAYS:,} days in {time.perf_counter() - started:.1f}s")
+
+        print("\n2️⃣ Each strategy: cold (database) / warm (cached matrix) / cached result")
+        for strategy in STRATEGIES:
+            cache.clear()
+            price_matrix_cache.clear()
+            cold, result = _time(strategy, stocks)
+            warm, _ = _time(strategy, stocks, points=249)  # New result key, same price matrix
+            cached, _ = _time(strategy, stocks)
+            ok = cold < TARGET_SECONDS
+            passed &= ok
+            print(f"   {'✅' if ok else '❌'} {strategy}: {cold * 1000:.0f} / {warm * 1000:.0f} / "
+                  f"{cached * 1000:.1f} ms (CAGR {result['cagr']}%, Sharpe {result['sharpe_ratio']}, "
+                  f"max drawdown {result['max_drawdown']}%)")
+    finally:
+        _cleanup()
+
+    print("=" * 60)
+    print(f"🏁 Backtest benchmark {'passed' if passed else 'FAILED'} (target {TARGET_SECONDS:.0f}s cold)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_backtests()
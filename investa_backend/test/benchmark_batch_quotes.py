@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark for batched quote lookups
+
+Compares how a home screen loads every stock's quote: one
+/api/stocks/<id>/market_data/ call per symbol against a single
+/api/market-data/quotes/ call, and the 304 revalidation of an unchanged
+batch. Uses the stocks already in the database.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.test import Client
+from api.models import MarketData
+from api.services.quotes import quote_cache
+
+ROUNDS = 30
+TARGET_MS = 10
+
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def _time(call):
+    timings, response = [], None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        response = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return _percentiles(timings), response
+
+
+def benchmark_batch_quotes():
+    print("📦 Benchmarking batched quote lookups...")
+    print("=" * 60)
+    stocks = list(MarketData.objects.select_related('stock').values_list('stock_id', 'stock__symbol'))
+    if not stocks:
+        print("❌ No market data available, run populate_sample_data first")
+        return False
+
+    # Signed in, as the app is, so the anonymous rate limit doesn't cut the rounds short
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(User.objects.order_by('pk').first())
+    path = '/api/market-data/quotes/?symbols=' + ','.join(symbol for _, symbol in stocks)
+    quote_cache.clear()
+    client.get(path)  # Warm the search index and quote cache
+
+    print(f"\n1️⃣ All {len(stocks)} quotes per screen load, median / p95:")
+    (median, p95), singles = _time(
+        lambda: [client.get(f'/api/stocks/{stock_id}/market_data/') for stock_id, _ in stocks]
+    )
+    print(f"   🐢 One market_data call per symbol: {median:.1f} ms / {p95:.1f} ms")
+    (median, p95), response = _time(lambda: client.get(path))
+    ok = response.status_code == 200 and p95 < TARGET_MS
+    passed = ok
+    print(f"   {'✅' if ok else '❌'} One quotes call: {median:.1f} ms / {p95:.1f} ms "
+          f"({len(response.content):,} bytes)")
+
+    etag = response['ETag']
+    (median, p95), revalidated = _time(lambda: client.get(path, HTTP_IF_NONE_MATCH=etag))
+    ok = revalidated.status_code == 304 and p95 < TARGET_MS
+    passed &= ok
+    print(f"   {'✅' if ok else '❌'} Unchanged batch (304): {median:.1f} ms / {p95:.1f} ms")
+
+    rows = sum(len(single.content) for single in singles)
+    print(f"\n2️⃣ Payload: {len(response.content):,} bytes columnar vs {rows:,} bytes of market_data responses")
+
+    print("=" * 60)
+    print(f"🏁 Batch quote benchmark {'passed' if passed else 'FAILED'} (target p95 < {TARGET_MS} ms)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_batch_quotes()
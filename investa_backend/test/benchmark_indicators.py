@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark for the vectorized technical-indicator engine
+
+Computes every indicator for 2,000 synthetic symbols with 10 years of daily
+bars in one pass and reports the throughput. It then seeds the same number of
+synthetic stocks with a lookback of daily StockPrice rows and times the
+compute_indicators command end to end (load the bars, compute, upsert
+TechnicalIndicator), first inserting and then updating, and removes the
+synthetic rows again.
+"""
+
+import os
+import sys
+import time
+import django
+import numpy as np
+from datetime import date, timedelta
+from io import StringIO
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from api.models import Stock, StockPrice, TechnicalIndicator
+from api.services.indicators import DEFAULT_LOOKBACK, compute_indicators, load_price_matrix
+from api.services.ingestion import upsert
+
+SYMBOLS = 2000
+DAYS = 252 * 10
+PREFIX = 'IX'
+
+
+def _synthetic_bars(symbols, days, seed=42):
+    """Random-walk closes with highs/lows around them"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.02, size=(symbols, days))
+    closes = 100.0 * np.exp(np.cumsum(returns, axis=1))
+    spread = np.abs(rng.normal(0.0, 0.01, size=(symbols, days))) * closes
+    return closes + spread, closes - spread, closes
+
+
+def _seed(highs, lows, closes):
+    """Insert synthetic stocks with their last DEFAULT_LOOKBACK bars; returns the symbols"""
+    stocks = Stock.objects.bulk_create([
+        Stock(symbol=f'{PREFIX}{i:04d}', name=f'Indicator benchmark {i}', exchange='NSE', sector='Benchmark')
+        for i in range(len(closes))
+    ])
+    first = date.today() - timedelta(days=DEFAULT_LOOKBACK * 7 // 5)
+    days = [(first + timedelta(days=d + d // 5 * 2)).isoformat() for d in range(DEFAULT_LOOKBACK)]  # Weekdays only
+    now = timezone.now().isoformat()
+    fields = ['stock', 'date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume', 'created_at']
+    tail = np.s_[:, -DEFAULT_LOOKBACK:]
+    bars = zip(*(matrix[tail].round(2).tolist() for matrix in (highs, lows, closes)))
+    with transaction.atomic():
+        for stock, (high, low, close) in zip(stocks, bars):
+            upsert(StockPrice, fields, [(stock.pk, *bar, 1000, now) for bar in zip(days, close, high, low, close)],
+                   unique_fields=['stock', 'date'], update_fields=fields[2:-1])
+    return [stock.symbol for stock in stocks]
+
+
+def _cleanup():
+    ids = list(Stock.objects.filter(symbol__startswith=PREFIX, sector='Benchmark').values_list('pk', flat=True))
+    if not ids:
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        placeholders = ",".join(["%s"] * len(ids))
+        for table, column in [
+            (TechnicalIndicator._meta.db_table, 'stock_id'),
+            (StockPrice._meta.db_table, 'stock_id'),
+            (Stock._meta.db_table, 'id'),
+        ]:
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', ids)
+
+
+def _time_command(label, symbols):
+    started = time.perf_counter()
+    call_command('compute_indicators', *symbols, stdout=StringIO())
+    elapsed = time.perf_counter() - started
+    written = TechnicalIndicator.objects.filter(stock__symbol__startswith=PREFIX, stock__sector='Benchmark').count()
+    bars = len(symbols) * DEFAULT_LOOKBACK
+    print(f"   {label}: {elapsed:.2f}s ({bars / elapsed:,.0f} bars/s, {written:,} indicator rows)")
+
+
+def _time(label, highs, lows, closes):
+    started = time.perf_counter()
+    results = compute_indicators(highs, lows, closes)
+    elapsed = time.perf_counter() - started
+    bars = closes.size
+    print(f"   {label}: {elapsed:.2f}s ({bars / elapsed:,.0f} bars/s, {len(results)} symbols)")
+    return results
+
+
+def benchmark_indicators():
+    print("📈 Benchmarking technical-indicator computation...")
+    print("=" * 60)
+    print(f"   Generating {SYMBOLS} symbols x {DAYS} days...")
+    highs, lows, closes = _synthetic_bars(SYMBOLS, DAYS)
+
+    print("\n1️⃣ Full 10-year history:")
+    results = _time("All indicators", highs, lows, closes)
+
+    print(f"\n2️⃣ Default lookback ({DEFAULT_LOOKBACK} bars, as used by compute_indicators):")
+    tail = np.s_[:, -DEFAULT_LOOKBACK:]
+    _time("All indicators", highs[tail], lows[tail], closes[tail])
+
+    sample = results[0]
+    print("\n🔍 Sample output for symbol 0:")
+    for name, (value, signal, period) in sample.items():
+        print(f"   {name}: {value:.4f} {signal} {period or ''}")
+
+    print(f"\n3️⃣ compute_indicators command over {SYMBOLS} seeded symbols x {DEFAULT_LOOKBACK} bars:")
+    if Stock.objects.filter(symbol__startswith=PREFIX, sector='Benchmark').exists():
+        print("❌ Synthetic stocks from an earlier run still exist")
+        return
+    try:
+        started = time.perf_counter()
+        symbols = _seed(highs, lows, closes)
+        print(f"   Seeded {len(symbols) * DEFAULT_LOOKBACK:,} price rows in {time.perf_counter() - started:.1f}s")
+        _time_command("Insert indicators", symbols)
+        _time_command("Update indicators", symbols)
+        ids = list(Stock.objects.filter(symbol__in=symbols).values_list('pk', flat=True))
+        started = time.perf_counter()
+        load_price_matrix(ids)
+        print(f"   Of which loading the bars: {time.perf_counter() - started:.2f}s")
+    finally:
+        _cleanup()
+
+    print("=" * 60)
+    print("🏁 Indicator benchmark completed!")
+
+
+if __name__ == "__main__":
+    benchmark_indicators()
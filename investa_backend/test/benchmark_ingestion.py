@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark for bulk market-data ingestion
+
+Writes a synthetic end-of-day CSV for the existing stocks (dated before any
+real history), ingests it with and without the derived-cache refresh, then
+removes the synthetic rows again.
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+import django
+from datetime import date, timedelta
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.db import connection
+from api.models import Stock, StockPrice
+from api.services.ingestion import ingest_file
+from api.services.ohlcv_store import ohlcv_store
+from api.services.rolling_stats import rebuild_rolling_stats
+
+TARGET_ROWS = 200000
+TARGET_RATE = 100000
+START_DATE = date(1970, 1, 1)
+
+
+def _write_csv(path, stocks, days):
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['symbol', 'date', 'open', 'high', 'low', 'close', 'volume'])
+        for stock in stocks:
+            price = 100.0
+            for offset in range(days):
+                price = max(price * (1.0 + ((offset * 7919 + stock.pk) % 41 - 20) / 1000.0), 1.0)
+                writer.writerow([
+                    stock.symbol, (START_DATE + timedelta(days=offset)).isoformat(),
+                    f'{price:.2f}', f'{price * 1.01:.2f}', f'{price * 0.99:.2f}', f'{price:.2f}',
+                    1000 + offset,
+                ])
+
+
+def _cleanup(stocks, days):
+    StockPrice.objects.filter(date__lt=START_DATE + timedelta(days=days)).delete()
+    for stock in stocks:
+        if ohlcv_store.exists(stock.symbol):
+            ohlcv_store.build(stock)
+        rebuild_rolling_stats(stock)
+
+
+def benchmark_ingestion():
+    print("📥 Benchmarking bulk market-data ingestion...")
+    print("=" * 60)
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        print(f"   SQLite journal mode: {cursor.fetchone()[0]}")
+
+    stocks = list(Stock.objects.filter(is_active=True).order_by('symbol'))
+    if not stocks:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    days = TARGET_ROWS // len(stocks)
+    earliest = StockPrice.objects.order_by('date').values_list('date', flat=True).first()
+    if earliest and earliest <= START_DATE + timedelta(days=days):
+        print("❌ Existing price history overlaps the synthetic date range")
+        return False
+
+    passed = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'eod.csv')
+        _write_csv(path, stocks, days)
+        try:
+            for step, (label, refresh) in enumerate([("Insert, no refresh", False),
+                                                      ("Upsert existing rows, no refresh", False),
+                                                      ("Upsert with cache refresh", True)], start=1):
+                started = time.perf_counter()
+                report = ingest_file(path, 'prices', refresh=refresh)
+                elapsed = time.perf_counter() - started
+                rate = report.rows / elapsed
+                ok = rate >= TARGET_RATE or refresh
+                passed &= ok
+                print(f"\n{step}️⃣ {label}:")
+                print(f"   {'✅' if ok else '❌'} {report.rows} rows in {report.batches} batches, "
+                      f"{elapsed:.2f}s ({rate:,.0f} rows/s)")
+        finally:
+            _cleanup(stocks, days)
+
+    print("=" * 60)
+    print(f"🏁 Ingestion benchmark {'passed' if passed else 'FAILED'} "
+          f"(target {TARGET_RATE:,} rows/s without refresh)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_ingestion()
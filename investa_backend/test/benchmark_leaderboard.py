@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Benchmark for the materialized leaderboard
+
+Seeds 1,000,000 synthetic users with leaderboard entries (or the count given
+as the first argument) and ranks them as the rerank worker would. It then
+times small writes while a rerank of reshuffled growth runs, and the
+leaderboard and my_rank endpoints from the first request after the cached
+snapshot expires. Finally it removes the synthetic rows again.
+"""
+
+import os
+import sys
+import threading
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.test import Client
+from django.utils import timezone
+from api.models import LeaderboardEntry
+from api.services.leaderboard import period_start, rerank
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+TARGET_MS = 20
+TARGET_FIRST_MS = 50  # Also rebuilds the cached top N
+TARGET_WRITE_MS = 500  # A fill waits at most one rerank batch
+PREFIX = 'lb_bench_'
+REQUESTS = 50
+
+
+def _seed(count):
+    """Insert users and all-time entries with SQL; returns the first user id"""
+    first_id = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+    now = timezone.now().isoformat()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s) '
+            'INSERT INTO auth_user (id, password, is_superuser, username, first_name, last_name, '
+            'email, is_staff, is_active, date_joined) '
+            "SELECT %s + i, '!', 0, %s || i, '', '', '', 0, 1, %s FROM n",
+            [count - 1, first_id, PREFIX, now],
+        )
+        # Deterministic spread of values between 5,000 and 15,000
+        cursor.execute(
+            f'INSERT INTO {LeaderboardEntry._meta.db_table} (timeframe, user_id, period_start, start_value, '
+            'portfolio_value, portfolio_growth_percentage, total_trades, updated_at) '
+            "SELECT 'all', id, %s, 10000, 5000 + (id * 7919) % 10000, "
+            '((5000 + (id * 7919) % 10000) - 10000) / 100.0, id % 50, %s '
+            'FROM auth_user WHERE id >= %s',
+            [period_start('all'), now, first_id],
+        )
+    return first_id
+
+
+def _cleanup(first_id):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {LeaderboardEntry._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute('DELETE FROM auth_user WHERE id >= %s AND username LIKE %s', [first_id, PREFIX + '%'])
+    rerank('all')
+    cache.clear()
+
+
+def _reshuffle(first_id):
+    """Flip the growth sign of every third synthetic user, moving most ranks"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {LeaderboardEntry._meta.db_table} SET portfolio_growth_percentage = -portfolio_growth_percentage '
+            'WHERE user_id >= %s AND user_id %% 3 = 0',
+            [first_id],
+        )
+
+
+def _writes_during_rerank(first_id):
+    """Latencies of one-row leaderboard writes, like a fill's, while another thread reranks"""
+    done = threading.Event()
+
+    def worker():
+        try:
+            rerank('all')
+        finally:
+            done.set()
+            connections.close_all()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    timings = []
+    while not done.is_set():
+        user_id = first_id + len(timings) % USERS
+        started = time.perf_counter()
+        with transaction.atomic():
+            LeaderboardEntry.objects.filter(timeframe='all', user_id=user_id).update(total_trades=F('total_trades') + 1)
+        timings.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.01)
+    thread.join()
+    timings.sort()
+    return timings
+
+
+def _time_requests(client, path):
+    timings = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.content
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def benchmark_leaderboard():
+    print("🏆 Benchmarking the materialized leaderboard...")
+    print("=" * 60)
+    if User.objects.filter(username__startswith=PREFIX).exists():
+        print("❌ Synthetic users from an earlier run still exist")
+        return False
+
+    started = time.perf_counter()
+    first_id = _seed(USERS)
+    print(f"\n1️⃣ Seeded {USERS:,} users and entries in {time.perf_counter() - started:.1f}s")
+
+    passed = True
+    try:
+        started = time.perf_counter()
+        moved = rerank('all')
+        print(f"\n2️⃣ First rerank ({moved:,} ranks) in {time.perf_counter() - started:.2f}s")
+
+        _reshuffle(first_id)
+        started = time.perf_counter()
+        timings = _writes_during_rerank(first_id)
+        ok = timings[-1] < TARGET_WRITE_MS
+        passed &= ok
+        print(f"\n3️⃣ Rerank of reshuffled growth in {time.perf_counter() - started:.2f}s; "
+              f"{len(timings)} one-row writes meanwhile:")
+        print(f"   {'✅' if ok else '❌'} median {timings[len(timings) // 2]:.1f} ms / "
+              f"p95 {timings[int(len(timings) * 0.95)]:.1f} ms / max {timings[-1]:.1f} ms")
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.get(pk=first_id + USERS // 2))
+        deep_page = USERS // 2 // 100
+        client.get('/api/trading-performance/my_rank/?timeframe=all')  # Warm up the request path
+        print("\n4️⃣ Endpoint latency, first request after the snapshot expires and median / p95:")
+        for label, path in [
+            ("Top page", '/api/trading-performance/leaderboard/?timeframe=all'),
+            (f"Page {deep_page:,}", f'/api/trading-performance/leaderboard/?timeframe=all&page={deep_page}&page_size=100'),
+            ("My rank", '/api/trading-performance/my_rank/?timeframe=all'),
+        ]:
+            cache.clear()  # As when the rerank interval and LEADERBOARD_CACHE_TTL have run out
+            started = time.perf_counter()
+            response = client.get(path)
+            first = (time.perf_counter() - started) * 1000
+            assert response.status_code == 200, response.content
+            median, p95 = _time_requests(client, path)
+            ok = first < TARGET_FIRST_MS and p95 < TARGET_MS
+            passed &= ok
+            print(f"   {'✅' if ok else '❌'} {label}: first {first:.1f} ms, then {median:.1f} ms / {p95:.1f} ms")
+    finally:
+        _cleanup(first_id)
+
+    print("=" * 60)
+    print(f"🏁 Leaderboard benchmark {'passed' if passed else 'FAILED'} (target p95 < {TARGET_MS} ms, "
+          f"first request < {TARGET_FIRST_MS} ms, writes during a rerank < {TARGET_WRITE_MS} ms)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_leaderboard()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Benchmark for the news feed
+
+Seeds 100,000 synthetic news items, then times /api/news/ first and deep
+cursor pages, per-symbol pages and full-text searches, next to the
+OFFSET + COUNT(*) page the feed used before, and removes the rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+from api.models import Stock, StockNews
+
+ITEMS = 100000
+ROUNDS = 30
+DEEP_PAGES = 100
+TARGET_MS = 20
+TARGET_SEARCH_MS = 30  # A common term reads its whole FTS5 match list
+SOURCE = 'news_bench'
+LINKS_TABLE = StockNews.stocks.through._meta.db_table
+TOPICS = ['earnings', 'dividend', 'merger', 'guidance', 'buyback', 'downgrade', 'upgrade', 'lawsuit']
+
+
+def _seed(stock_ids):
+    now = timezone.now()
+    rows = []
+    for i in range(ITEMS):
+        topic, other = TOPICS[i % len(TOPICS)], TOPICS[(i // len(TOPICS)) % len(TOPICS)]
+        # Stored the way Django writes datetimes, so cursor comparisons line up
+        stamp = connection.ops.adapt_datetimefield_value(now - timedelta(minutes=i))
+        rows.append((
+            stock_ids[i % len(stock_ids)], f'Quarterly {topic} update {i}', SOURCE,
+            f'Analysts discuss the {topic} and the {other} outlook for item {i}', '', stamp, f'{SOURCE}-{i}', stamp,
+        ))
+    # FTS triggers from migration 0018 index every row as it goes in
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {StockNews._meta.db_table} '
+            '(stock_id, title, source, summary, url, published_at, content_hash, created_at) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s, %s)',
+            rows,
+        )
+        cursor.execute(
+            f'INSERT INTO {LINKS_TABLE} (stocknews_id, stock_id) '
+            f'SELECT id, stock_id FROM {StockNews._meta.db_table} WHERE source = %s',
+            [SOURCE],
+        )
+
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def _time(call):
+    timings, result = [], None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return _percentiles(timings), result
+
+
+def _deep_cursor(client, params):
+    """The ``next`` link DEEP_PAGES pages into the feed"""
+    response = client.get('/api/news/', params)
+    for _ in range(DEEP_PAGES - 1):
+        response = client.get(response.json()['next'])
+    return response.json()['next']
+
+
+def benchmark_news_feed():
+    print("📰 Benchmarking the news feed...")
+    print("=" * 60)
+    stock_ids = list(Stock.objects.order_by('pk').values_list('pk', flat=True))
+    if not stock_ids:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    if StockNews.objects.filter(source=SOURCE).exists():
+        print("❌ Synthetic news from an earlier run still exists")
+        return False
+
+    passed = True
+    try:
+        started = time.perf_counter()
+        _seed(stock_ids)
+        print(f"\n1️⃣ Seeded {ITEMS:,} news items in {time.perf_counter() - started:.1f}s")
+
+        # Signed in, as the feed requires, which also lifts the anonymous rate limit
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.order_by('pk').first())
+        symbol = Stock.objects.get(pk=stock_ids[0]).symbol
+        deep = _deep_cursor(client, {'page_size': 20})
+        deep_symbol = _deep_cursor(client, {'page_size': 20, 'symbol': symbol})
+
+        print("\n2️⃣ Feed pages of 20, median / p95:")
+        checks = [
+            ('First page', TARGET_MS, lambda: client.get('/api/news/')),
+            (f'Page {DEEP_PAGES + 1} by cursor', TARGET_MS, lambda: client.get(deep)),
+            (f'{symbol} first page', TARGET_MS, lambda: client.get('/api/news/', {'symbol': symbol})),
+            (f'{symbol} page {DEEP_PAGES + 1} by cursor', TARGET_MS, lambda: client.get(deep_symbol)),
+            ("Search 'lawsuit'", TARGET_SEARCH_MS, lambda: client.get('/api/news/', {'q': 'lawsuit'})),
+            ("Search 'merger guid'", TARGET_SEARCH_MS, lambda: client.get('/api/news/', {'q': 'merger guid'})),
+            ("Search 'update 4242'", TARGET_SEARCH_MS, lambda: client.get('/api/news/', {'q': 'update 4242'})),
+        ]
+        for label, target, call in checks:
+            (median, p95), response = _time(call)
+            ok = response.status_code == 200 and p95 < target
+            passed &= ok
+            print(f"   {'✅' if ok else '❌'} {label}: {median:.2f} ms / {p95:.2f} ms "
+                  f"({len(response.json()['results'])} items)")
+
+        offset = DEEP_PAGES * 20
+        ordered = StockNews.objects.select_related('stock').order_by('-published_at', '-id')
+        (median, p95), _ = _time(lambda: (ordered.count(), list(ordered[offset:offset + 20])))
+        print(f"   🐢 Page {DEEP_PAGES + 1} by OFFSET + COUNT(*) (query only): {median:.2f} ms / {p95:.2f} ms")
+    finally:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {LINKS_TABLE} WHERE stocknews_id IN '
+                f'(SELECT id FROM {StockNews._meta.db_table} WHERE source = %s)',
+                [SOURCE],
+            )
+            cursor.execute(f'DELETE FROM {StockNews._meta.db_table} WHERE source = %s', [SOURCE])
+
+    print("=" * 60)
+    print(f"🏁 News feed benchmark {'passed' if passed else 'FAILED'} (target p95 < {TARGET_MS} ms, "
+          f"{TARGET_SEARCH_MS} ms for searches)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_news_feed()
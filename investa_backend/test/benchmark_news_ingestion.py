@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Benchmark for news ingestion
+
+Writes a synthetic JSONL news dump where every fifth line repeats an earlier
+story for another stock, ingests it, ingests it again (all duplicates), then
+removes the synthetic stories again.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import django
+from datetime import datetime, timedelta, timezone
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.db import connection, transaction
+from api.models import Stock, StockNews
+from api.services.ingestion import IngestReport, Ingestor
+
+LINES = 100000
+REPEAT_EVERY = 5
+TARGET_RATE = 10000
+SOURCE = 'news_ingest_bench'
+START = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+
+def _write_jsonl(path, symbols):
+    with open(path, 'w') as handle:
+        for i in range(LINES):
+            # Every REPEAT_EVERY-th line repeats the story before it, naming other stocks
+            story = i - 1 if i % REPEAT_EVERY == REPEAT_EVERY - 1 else i
+            handle.write(json.dumps({
+                'title': f'Synthetic headline {story}',
+                'summary': f'Synthetic summary for story {story} with a few more words of body text',
+                'url': f'https://news.example.com/{i}',
+                'source': SOURCE,
+                'published_at': (START + timedelta(minutes=i)).isoformat(),
+                'symbols': [symbols[i % len(symbols)], symbols[(i * 7 + 3) % len(symbols)]],
+            }) + '\n')
+
+
+def _cleanup():
+    links = StockNews.stocks.through._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {links} WHERE stocknews_id IN '
+            f'(SELECT id FROM {StockNews._meta.db_table} WHERE source = %s)',
+            [SOURCE],
+        )
+        cursor.execute(f'DELETE FROM {StockNews._meta.db_table} WHERE source = %s', [SOURCE])
+
+
+def benchmark_news_ingestion():
+    print("🗞️ Benchmarking news ingestion...")
+    print("=" * 60)
+    symbols = list(Stock.objects.filter(is_active=True).order_by('symbol').values_list('symbol', flat=True))
+    if not symbols:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    if StockNews.objects.filter(source=SOURCE).exists():
+        print("❌ Synthetic news from an earlier run still exists")
+        return False
+
+    passed = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'news.jsonl')
+        _write_jsonl(path, symbols)
+        expected = LINES - LINES // REPEAT_EVERY
+        try:
+            ingestor = Ingestor('news', chunk_size=5000)
+            for step, label in enumerate(["Fresh dump", "Same dump again"], start=1):
+                started = time.perf_counter()
+                report = ingestor.ingest_file(path, IngestReport('news'))
+                elapsed = time.perf_counter() - started
+                rate = LINES / elapsed
+                stored = StockNews.objects.filter(source=SOURCE).count()
+                ok = rate >= TARGET_RATE and stored == expected
+                passed &= ok
+                print(f"\n{step}️⃣ {label}:")
+                print(f"   {'✅' if ok else '❌'} {LINES:,} lines in {elapsed:.2f}s ({rate:,.0f} lines/s)")
+                print(f"   📰 {report.rows:,} new stories, {report.duplicates:,} duplicates, "
+                      f"{report.links:,} stock links, {stored:,} stored (expected {expected:,})")
+
+            bloom = ingestor.bloom
+            print(f"\n3️⃣ Bloom filter: {bloom.count:,} hashes in {bloom.size / 8 / 1024:,.0f} KiB, "
+                  f"{bloom.hashes} probes per lookup")
+        finally:
+            _cleanup()
+
+    print("=" * 60)
+    print(f"🏁 News ingestion benchmark {'passed' if passed else 'FAILED'} (target {TARGET_RATE:,} lines/s)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_news_ingestion()
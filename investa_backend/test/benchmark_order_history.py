@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""
+Benchmark for order history
+
+Seeds 1,000,000 orders across 100 synthetic users, then times first and
+deep keyset pages of /api/orders/order_history/ with and without status,
+side and date filters, checks their query plans read the composite order
+indexes without a sort and times them alone, shows the unpaginated ``created_at__date`` query it
+replaced, and removes the rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test import Client
+from django.utils import timezone
+from api.models import Order, Stock
+
+ORDERS = 1000000
+USERS = 100
+SPACING_MINUTES = 90  # Between one user's consecutive orders, ~2 years of history each
+ROUNDS = 30
+DEEP_PAGES = 100
+TARGET_MS = 40  # Mostly serializing 20 orders with their nested user and stock
+TARGET_QUERY_MS = 5
+PREFIX = 'order_history_bench_'
+STATUSES = ['FILLED', 'CANCELLED', 'PENDING', 'FILLED', 'REJECTED']
+
+
+def _seed():
+    """Insert USERS users and ORDERS orders with SQL; returns the first user id"""
+    first_id = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+    now = timezone.now()
+    stamp = connection.ops.adapt_datetimefield_value(now)
+    statuses = ' '.join(f"WHEN {i} THEN '{status}'" for i, status in enumerate(STATUSES))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s) '
+            'INSERT INTO auth_user (id, password, is_superuser, username, first_name, last_name, '
+            'email, is_staff, is_active, date_joined) '
+            "SELECT %s + i, '!', 0, %s || i, '', '', '', 0, 1, %s FROM n",
+            [USERS - 1, first_id, PREFIX, stamp],
+        )
+        # Round-robin over the users; j = i / USERS numbers a user's orders, SPACING_MINUTES
+        # apart going back from now, alternating sides and cycling statuses every two
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s), '
+            f'o AS (SELECT i, i / {USERS} AS j FROM n), '
+            f's AS (SELECT row_number() OVER (ORDER BY id) - 1 AS k, id FROM {Stock._meta.db_table}), '
+            's_count(c) AS (SELECT count(*) FROM s) '
+            f'INSERT INTO {Order._meta.db_table} (order_type, side, quantity, filled_quantity, status, '
+            'commission, notes, created_at, updated_at, user_id, stock_id) '
+            "SELECT 'MARKET', CASE WHEN j %% 2 = 0 THEN 'BUY' ELSE 'SELL' END, 1 + i %% 9, 1 + i %% 9, "
+            f"CASE (j / 2) %% {len(STATUSES)} {statuses} END, 0, '', "
+            "datetime(%s, '-' || (j * %s) || ' minutes'), %s, %s + i %% %s, s.id "
+            'FROM o, s_count JOIN s ON s.k = o.i %% s_count.c',
+            [ORDERS - 1, now.strftime('%Y-%m-%d %H:%M:%S'), SPACING_MINUTES, stamp, first_id, USERS],
+        )
+    return first_id
+
+
+def _cleanup(first_id):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {Order._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute('DELETE FROM auth_user WHERE id >= %s AND username LIKE %s', [first_id, PREFIX + '%'])
+
+
+def _time(call):
+    timings, result = [], None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return (timings[len(timings) // 2], timings[int(len(timings) * 0.95)]), result
+
+
+def _deep_link(client, params):
+    """The ``next`` link DEEP_PAGES pages into the history"""
+    response = client.get('/api/orders/order_history/', params)
+    for _ in range(DEEP_PAGES - 1):
+        response = client.get(response.json()['next'])
+    return response.json()['next']
+
+
+def _sorts(queryset):
+    """Whether SQLite sorts the page instead of reading it in index order"""
+    with connection.cursor() as cursor:
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = ' / '.join(row[-1] for row in cursor.fetchall())
+    return 'TEMP B-TREE' in plan, plan
+
+
+def benchmark_order_history():
+    print("📜 Benchmarking order history...")
+    print("=" * 60)
+    if not Stock.objects.exists():
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username__startswith=PREFIX).exists():
+        print("❌ Synthetic users from an earlier run still exist")
+        return False
+
+    passed = True
+    started = time.perf_counter()
+    first_id = _seed()
+    try:
+        print(f"\n1️⃣ Seeded {ORDERS:,} orders for {USERS} users in {time.perf_counter() - started:.1f}s")
+
+        user = User.objects.get(pk=first_id)
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        today = timezone.localdate()
+        month = {'date_from': str(today - timedelta(days=120)), 'date_to': str(today - timedelta(days=90))}
+
+        print("\n2️⃣ History pages of 20, median / p95:")
+        checks = [
+            ('First page', {}, True),
+            ('Filled', {'status': 'FILLED'}, True),
+            ('Sells', {'side': 'SELL'}, True),
+            ('One month, 3 months back', month, False),
+            ('Filled sells in that month', {'status': 'FILLED', 'side': 'SELL', **month}, False),
+        ]
+        for label, params, deep in checks:
+            pages = [(label, lambda: client.get('/api/orders/order_history/', params))]
+            if deep:
+                link = _deep_link(client, params)
+                pages.append((f"{label}, page {DEEP_PAGES + 1}", lambda: client.get(link)))
+            for page_label, call in pages:
+                (median, p95), response = _time(call)
+                ok = response.status_code == 200 and p95 < TARGET_MS
+                passed &= ok
+                print(f"   {'✅' if ok else '❌'} {page_label}: {median:.2f} ms / {p95:.2f} ms "
+                      f"({len(response.json()['results'])} orders)")
+
+        print("\n3️⃣ Page queries alone, median / p95:")
+        orders = Order.objects.filter(user=user).order_by('-created_at', '-id')
+        now = timezone.now()
+        for label, queryset in [
+            ('All', orders),
+            ('Status', orders.filter(status='FILLED')),
+            ('Side', orders.filter(side='SELL')),
+            ('Date range', orders.filter(created_at__gte=now - timedelta(days=365),
+                                         created_at__lt=now - timedelta(days=30))),
+        ]:
+            # The keyset predicate of the page after row DEEP_PAGES * 20
+            created_at, pk = queryset.values_list('created_at', 'pk')[DEEP_PAGES * 20 - 1]
+            deep = queryset.filter(Q(created_at__lte=created_at), Q(created_at__lt=created_at) | Q(pk__lt=pk))
+            for page_label, page in [(label, queryset[:21]), (f"{label}, page {DEEP_PAGES + 1}", deep[:21])]:
+                sorts, plan = _sorts(page)
+                (median, p95), _ = _time(lambda: list(page.all()))
+                ok = not sorts and p95 < TARGET_QUERY_MS
+                passed &= ok
+                print(f"   {'✅' if ok else '❌'} {page_label}: {median:.2f} ms / {p95:.2f} ms ({plan})")
+
+        old = Order.objects.filter(user=user, created_at__date__gte=month['date_from']).order_by('-created_at')
+        (median, p95), _ = _time(lambda: list(old.values_list('pk', flat=True)))
+        print(f"\n   🐢 Unpaginated created_at__date filter (ids only): {median:.2f} ms / {p95:.2f} ms")
+    finally:
+        _cleanup(first_id)
+
+    print("=" * 60)
+    print(f"🏁 Order history benchmark {'passed' if passed else 'FAILED'} (target p95 < {TARGET_MS} ms, "
+          f"{TARGET_QUERY_MS} ms for the page query alone)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_order_history()
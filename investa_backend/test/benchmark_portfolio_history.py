@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Benchmark for portfolio equity-curve snapshots
+
+Seeds 2,000 synthetic portfolios with a year of trades each, reconstructs
+their daily history with the vectorized backfill, times the nightly snapshot
+job and the history endpoint, then removes the synthetic rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+from api.models import LeaderboardEntry, MarketData, Order, Portfolio, PortfolioSnapshot, Trade
+from api.services.snapshots import backfill_snapshots, take_snapshots
+
+PORTFOLIOS = 2000
+TRADES_PER_PORTFOLIO = 20
+TARGET_RATE = 50000
+TARGET_MS = 20
+REQUESTS = 50
+PREFIX = 'history_bench_'
+
+
+def _seed(stock_ids):
+    """Insert users, portfolios, one order each and a year of buys with SQL; returns the first user id"""
+    first_id = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+    now = timezone.now()
+    stamp = now.isoformat()
+    orders = Order._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s) '
+            'INSERT INTO auth_user (id, password, is_superuser, username, first_name, last_name, '
+            'email, is_staff, is_active, date_joined) '
+            "SELECT %s + i, '!', 0, %s || i, '', '', '', 0, 1, %s FROM n",
+            [PORTFOLIOS - 1, first_id, PREFIX, stamp],
+        )
+        cursor.execute(
+            f'INSERT INTO {Portfolio._meta.db_table} (user_id, total_value, total_invested, total_profit_loss, '
+            'cash_balance, cost_basis_method, realized_pnl, created_at, updated_at) '
+            "SELECT id, 10000, 0, 0, 10000, 'AVERAGE', 0, %s, %s FROM auth_user WHERE id >= %s",
+            [stamp, stamp, first_id],
+        )
+        cursor.execute(
+            f'INSERT INTO {orders} (order_type, side, quantity, filled_quantity, status, commission, notes, '
+            'created_at, updated_at, user_id, stock_id) '
+            "SELECT 'MARKET', 'BUY', 1, 1, 'FILLED', 0, '', %s, %s, id, %s FROM auth_user WHERE id >= %s",
+            [stamp, stamp, stock_ids[0], first_id],
+        )
+        # Buys every 18 days, staggered per user, across the stocks
+        for slot in range(TRADES_PER_PORTFOLIO):
+            cursor.execute(
+                f'INSERT INTO {Trade._meta.db_table} (quantity, price, side, total_amount, commission, '
+                'net_amount, executed_at, order_id, stock_id, user_id) '
+                "SELECT 1, 100, 'BUY', 100, 0, 100, datetime(%s, '-' || (%s + o.user_id %% 18) || ' days'), "
+                'o.id, %s, o.user_id '
+                f'FROM {orders} o WHERE o.user_id >= %s',
+                [now.strftime('%Y-%m-%d %H:%M:%S'), slot * 18, stock_ids[slot % len(stock_ids)], first_id],
+            )
+    return first_id
+
+
+def _cleanup(first_id):
+    portfolios = Portfolio._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {PortfolioSnapshot._meta.db_table} WHERE portfolio_id IN '
+            f'(SELECT id FROM {portfolios} WHERE user_id >= %s)',
+            [first_id],
+        )
+        cursor.execute(f'DELETE FROM {Trade._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute(f'DELETE FROM {Order._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute(f'DELETE FROM {portfolios} WHERE user_id >= %s', [first_id])
+        cursor.execute(f'DELETE FROM {LeaderboardEntry._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute('DELETE FROM auth_user WHERE id >= %s AND username LIKE %s', [first_id, PREFIX + '%'])
+
+
+def _time_requests(client, path):
+    timings = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.content
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def benchmark_portfolio_history():
+    print("📈 Benchmarking portfolio history snapshots...")
+    print("=" * 60)
+    stock_ids = list(MarketData.objects.order_by('stock_id').values_list('stock_id', flat=True))
+    if not stock_ids:
+        print("❌ No market data available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username__startswith=PREFIX).exists():
+        print("❌ Synthetic users from an earlier run still exist")
+        return False
+
+    started = time.perf_counter()
+    first_id = _seed(stock_ids)
+    print(f"\n1️⃣ Seeded {PORTFOLIOS:,} portfolios with {PORTFOLIOS * TRADES_PER_PORTFOLIO:,} "
+          f"trades in {time.perf_counter() - started:.1f}s")
+
+    passed = True
+    try:
+        portfolio_ids = list(Portfolio.objects.filter(user_id__gte=first_id).values_list('pk', flat=True))
+        started = time.perf_counter()
+        written = backfill_snapshots(portfolio_ids)
+        elapsed = time.perf_counter() - started
+        ok = written / elapsed >= TARGET_RATE
+        passed &= ok
+        print("\n2️⃣ Backfill from trades and closes:")
+        print(f"   {'✅' if ok else '❌'} {written:,} snapshots in {elapsed:.2f}s ({written / elapsed:,.0f} rows/s)")
+
+        started = time.perf_counter()
+        written = take_snapshots()
+        print(f"\n3️⃣ Nightly snapshot of all portfolios: {written:,} rows in {time.perf_counter() - started:.2f}s")
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.get(pk=first_id))
+        print("\n4️⃣ History endpoint latency (median / p95):")
+        for label, path in [
+            ("Full year", '/api/portfolio/history/?days=0'),
+            ("Full year, 100 points", '/api/portfolio/history/?days=0&points=100'),
+            ("Last 30 days", '/api/portfolio/history/?days=30'),
+        ]:
+            median, p95 = _time_requests(client, path)
+            ok = p95 < TARGET_MS
+            passed &= ok
+            print(f"   {'✅' if ok else '❌'} {label}: {median:.1f} ms / {p95:.1f} ms")
+    finally:
+        _cleanup(first_id)
+
+    print("=" * 60)
+    print(f"🏁 Portfolio history benchmark {'passed' if passed else 'FAILED'} "
+          f"(targets {TARGET_RATE:,} rows/s, p95 < {TARGET_MS} ms)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_portfolio_history()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark for the portfolio risk endpoint
+
+Seeds 200 synthetic portfolios holding the same 20 symbols in different
+sizes, times the first (uncached) risk request and then requests across all
+of them, which share one cached covariance matrix, then removes the
+synthetic rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+from api.models import LeaderboardEntry, MarketData, Portfolio, PortfolioHolding
+from api.services.backtest import price_matrix_cache
+
+PORTFOLIOS = 200
+SYMBOLS = 20
+TARGET_COLD_MS = 500
+TARGET_MS = 20
+PREFIX = 'risk_bench_'
+
+
+def _seed(stock_ids):
+    """Insert users, portfolios and their holdings with SQL; returns the first user id"""
+    first_id = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+    stamp = timezone.now().isoformat()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s) '
+            'INSERT INTO auth_user (id, password, is_superuser, username, first_name, last_name, '
+            'email, is_staff, is_active, date_joined) '
+            "SELECT %s + i, '!', 0, %s || i, '', '', '', 0, 1, %s FROM n",
+            [PORTFOLIOS - 1, first_id, PREFIX, stamp],
+        )
+        cursor.execute(
+            f'INSERT INTO {Portfolio._meta.db_table} (user_id, total_value, total_invested, total_profit_loss, '
+            'cash_balance, cost_basis_method, realized_pnl, created_at, updated_at) '
+            "SELECT id, 10000, 0, 0, 10000, 'AVERAGE', 0, %s, %s FROM auth_user WHERE id >= %s",
+            [stamp, stamp, first_id],
+        )
+        # Quantities vary by user and symbol so every portfolio has its own weights
+        for position, stock_id in enumerate(stock_ids):
+            cursor.execute(
+                f'INSERT INTO {PortfolioHolding._meta.db_table} (portfolio_id, stock_id, quantity, average_price, '
+                'total_invested, current_price, market_value, unrealized_pnl, realized_pnl, created_at, updated_at) '
+                'SELECT p.id, %s, q, 100, 100 * q, 100, 100 * q, 0, 0, %s, %s '
+                f'FROM (SELECT id, 1 + (user_id * 7 + %s) %% 25 AS q FROM {Portfolio._meta.db_table} '
+                'WHERE user_id >= %s) p',
+                [stock_id, stamp, stamp, position * 3, first_id],
+            )
+    return first_id
+
+
+def _cleanup(first_id):
+    portfolios = Portfolio._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {PortfolioHolding._meta.db_table} WHERE portfolio_id IN '
+            f'(SELECT id FROM {portfolios} WHERE user_id >= %s)',
+            [first_id],
+        )
+        cursor.execute(f'DELETE FROM {portfolios} WHERE user_id >= %s', [first_id])
+        cursor.execute(f'DELETE FROM {LeaderboardEntry._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute('DELETE FROM auth_user WHERE id >= %s AND username LIKE %s', [first_id, PREFIX + '%'])
+
+
+def _request(client, user, path):
+    client.force_login(user)
+    started = time.perf_counter()
+    response = client.get(path)
+    elapsed = (time.perf_counter() - started) * 1000
+    assert response.status_code == 200, response.content
+    return elapsed
+
+
+def benchmark_portfolio_risk():
+    print("📉 Benchmarking portfolio risk analytics...")
+    print("=" * 60)
+    stock_ids = list(MarketData.objects.order_by('stock_id').values_list('stock_id', flat=True)[:SYMBOLS])
+    if len(stock_ids) < SYMBOLS:
+        print("❌ Not enough market data available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username__startswith=PREFIX).exists():
+        print("❌ Synthetic users from an earlier run still exist")
+        return False
+
+    started = time.perf_counter()
+    first_id = _seed(stock_ids)
+    print(f"\n1️⃣ Seeded {PORTFOLIOS:,} portfolios x {SYMBOLS} holdings in {time.perf_counter() - started:.1f}s")
+
+    passed = True
+    try:
+        users = list(User.objects.filter(pk__gte=first_id, username__startswith=PREFIX).order_by('pk'))
+        client = Client(HTTP_HOST='localhost')
+        path = '/api/portfolio/risk/'
+        cache.clear()
+        price_matrix_cache.clear()
+        cold = _request(client, users[0], path)
+        ok = cold < TARGET_COLD_MS
+        passed &= ok
+        print("\n2️⃣ First request (prices, returns and covariance computed):")
+        print(f"   {'✅' if ok else '❌'} {cold:.1f} ms")
+
+        timings = sorted(_request(client, user, path) for user in users[1:])
+        median, p95 = timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+        ok = p95 < TARGET_MS
+        passed &= ok
+        print("\n3️⃣ Other portfolios with the same symbols (shared covariance), median / p95:")
+        print(f"   {'✅' if ok else '❌'} {median:.1f} ms / {p95:.1f} ms over {len(timings)} requests")
+    finally:
+        _cleanup(first_id)
+
+    print("=" * 60)
+    print(f"🏁 Portfolio risk benchmark {'passed' if passed else 'FAILED'} "
+          f"(targets {TARGET_COLD_MS} ms cold, p95 < {TARGET_MS} ms)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_portfolio_risk()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Benchmark for real-time quote streaming
+
+1. In-process: thousands of simulated subscribers on one QuoteHub, measuring
+   memory per connection, fan-out throughput and publish-to-receive latency.
+2. Live (optional): SSE connections against an ASGI server started with
+   INVESTA_QUOTE_STREAM_TICK_INTERVAL set, e.g.
+   INVESTA_QUOTE_STREAM_TICK_INTERVAL=0.5 uvicorn investa_backend.asgi:application
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import django
+import requests
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from api.services.streaming import QuoteHub
+
+BASE_URL = "http://127.0.0.1:8000/api"
+CONNECTIONS = 10000
+SYMBOLS = [f"SYM{i:03d}" for i in range(200)]
+SYMBOLS_PER_CONNECTION = 20
+ROUNDS = 5
+SLOW_CONNECTIONS = 1000
+LIVE_CONNECTIONS = 50
+LIVE_SECONDS = 5
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(int(len(samples) * q), len(samples) - 1)] * 1000
+    return f"p50 {pick(0.50):.2f}ms, p99 {pick(0.99):.2f}ms, max {samples[-1] * 1000:.2f}ms"
+
+
+async def _consume(subscription, latencies):
+    while True:
+        frames = await subscription.get()
+        if subscription.closed:
+            return
+        now = time.time()
+        latencies.extend(now - json.loads(frame.text)['ts'] for frame in frames[:1])
+
+
+async def _in_process():
+    hub = QuoteHub()
+    rng = random.Random(7)
+    latencies = []
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subscriptions = [hub.subscribe(rng.sample(SYMBOLS, SYMBOLS_PER_CONNECTION)) for _ in range(CONNECTIONS)]
+    # The last SLOW_CONNECTIONS never read during the run, like stalled clients
+    readers = subscriptions[:CONNECTIONS - SLOW_CONNECTIONS]
+    consumers = [asyncio.ensure_future(_consume(s, latencies)) for s in readers]
+    await asyncio.sleep(0)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / CONNECTIONS
+    tracemalloc.stop()
+    print(f"   {CONNECTIONS} connections, ~{per_connection / 1024:.1f} KiB each (hub + consumer task)")
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for symbol in SYMBOLS:
+            hub.publish({'symbol': symbol, 'price': '100.00', 'ts': time.time()})
+            await asyncio.sleep(0)  # Let consumers run between publishes
+    await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+
+    delivered = sum(s.delivered for s in readers)
+    print(f"   Published {hub.published} frames, delivered {delivered} "
+          f"({delivered / elapsed:,.0f} frames/s including consumer work)")
+    print(f"   Publish-to-receive latency: {_percentiles(latencies)}")
+
+    slow = subscriptions[len(readers):]
+    backlog = max(len(s._pending) for s in slow)
+    coalesced = sum(s.coalesced for s in slow)
+    ok = backlog <= SYMBOLS_PER_CONNECTION
+    print(f"   {'✅' if ok else '❌'} {SLOW_CONNECTIONS} stalled clients: max backlog {backlog} frames "
+          f"(<= {SYMBOLS_PER_CONNECTION} symbols), {coalesced} updates coalesced")
+
+    for subscription in subscriptions:
+        hub.unsubscribe(subscription)
+    await asyncio.gather(*consumers)
+    return ok and hub.connections == 0
+
+
+def _live_client(symbols, latencies, stop):
+    url = f"{BASE_URL}/stream/quotes/?symbols=" + ",".join(symbols)
+    with requests.get(url, stream=True, timeout=10) as response:
+        for line in response.iter_lines():
+            if stop.is_set():
+                return
+            if line.startswith(b'data: '):
+                latencies.append(time.time() - json.loads(line[6:])['ts'])
+
+
+def _live_sse():
+    try:
+        stocks = requests.get(f"{BASE_URL}/stocks/", timeout=5).json()['results']
+    except (requests.RequestException, ValueError, KeyError):
+        print("   ⏭️  No server at BASE_URL, skipping live test")
+        return True
+    symbols = [stock['symbol'] for stock in stocks[:10]]
+    probe = requests.get(f"{BASE_URL}/stream/quotes/?symbols={symbols[0]}", stream=True, timeout=5)
+    probe.close()
+    if probe.status_code != 200:
+        print(f"   ⏭️  Streaming unavailable ({probe.status_code}); run the server under ASGI")
+        return True
+
+    latencies, stop = [], threading.Event()
+    threads = [threading.Thread(target=_live_client, args=(symbols, latencies, stop), daemon=True)
+               for _ in range(LIVE_CONNECTIONS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(LIVE_SECONDS)
+    stop.set()
+    if not latencies:
+        print("   ❌ No quotes received; is INVESTA_QUOTE_STREAM_TICK_INTERVAL set on the server?")
+        return False
+    print(f"   {LIVE_CONNECTIONS} SSE connections, {len(latencies)} quotes in {LIVE_SECONDS}s")
+    print(f"   Publish-to-receive latency: {_percentiles(latencies)}")
+    return True
+
+
+def benchmark_quote_stream():
+    print("📡 Benchmarking quote streaming...")
+    print("=" * 60)
+
+    print("\n1️⃣ In-process fan-out:")
+    ok = asyncio.run(_in_process())
+    print(f"   {'✅' if ok else '❌'} All subscriptions released")
+
+    print("\n2️⃣ Live SSE against the ASGI server:")
+    ok &= _live_sse()
+
+    print("=" * 60)
+    print("🏁 Quote streaming benchmark " + ("completed!" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    benchmark_quote_stream()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Benchmark for batch mark-to-market revaluation
+
+Seeds 20,000 synthetic portfolios with 10 stale holdings each, revalues every
+holding against the latest MarketData prices (all rows change), repeats the
+run with nothing to change, then removes the synthetic rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+from api.models import LeaderboardEntry, MarketData, Portfolio, PortfolioHolding
+from api.services.revaluation import revalue_holdings
+
+PORTFOLIOS = 20000
+HOLDINGS_PER_PORTFOLIO = 10
+TARGET_RATE = 50000
+PREFIX = 'reval_bench_'
+
+
+def _seed(stock_ids):
+    """Insert users, portfolios and stale holdings with SQL; returns the first user id"""
+    first_id = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+    now = timezone.now().isoformat()
+    portfolios = Portfolio._meta.db_table
+    holdings = PortfolioHolding._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s) '
+            'INSERT INTO auth_user (id, password, is_superuser, username, first_name, last_name, '
+            'email, is_staff, is_active, date_joined) '
+            "SELECT %s + i, '!', 0, %s || i, '', '', '', 0, 1, %s FROM n",
+            [PORTFOLIOS - 1, first_id, PREFIX, now],
+        )
+        cursor.execute(
+            f'INSERT INTO {portfolios} (user_id, total_value, total_invested, total_profit_loss, '
+            'cash_balance, cost_basis_method, realized_pnl, created_at, updated_at) '
+            "SELECT id, 0, 0, 0, 5000, 'AVERAGE', 0, %s, %s FROM auth_user WHERE id >= %s",
+            [now, now, first_id],
+        )
+        for slot in range(HOLDINGS_PER_PORTFOLIO):
+            cursor.execute(
+                f'INSERT INTO {holdings} (portfolio_id, stock_id, quantity, average_price, total_invested, '
+                'current_price, market_value, unrealized_pnl, realized_pnl, created_at, updated_at) '
+                f'SELECT p.id, %s, 1 + p.id % 20, 100, 100 * (1 + p.id % 20), 0, 0, 0, 0, %s, %s '
+                f'FROM {portfolios} p WHERE p.user_id >= %s',
+                [stock_ids[slot % len(stock_ids)], now, now, first_id],
+            )
+    return first_id
+
+
+def _cleanup(first_id):
+    portfolios = Portfolio._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {PortfolioHolding._meta.db_table} WHERE portfolio_id IN '
+            f'(SELECT id FROM {portfolios} WHERE user_id >= %s)',
+            [first_id],
+        )
+        cursor.execute(f'DELETE FROM {portfolios} WHERE user_id >= %s', [first_id])
+        cursor.execute(f'DELETE FROM {LeaderboardEntry._meta.db_table} WHERE user_id >= %s', [first_id])
+        cursor.execute('DELETE FROM auth_user WHERE id >= %s AND username LIKE %s', [first_id, PREFIX + '%'])
+
+
+def benchmark_revaluation():
+    print("💹 Benchmarking batch mark-to-market revaluation...")
+    print("=" * 60)
+    stock_ids = list(MarketData.objects.order_by('stock_id').values_list('stock_id', flat=True))
+    if not stock_ids:
+        print("❌ No market data available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username__startswith=PREFIX).exists():
+        print("❌ Synthetic users from an earlier run still exist")
+        return False
+
+    started = time.perf_counter()
+    first_id = _seed(stock_ids)
+    print(f"\n1️⃣ Seeded {PORTFOLIOS:,} portfolios with {PORTFOLIOS * HOLDINGS_PER_PORTFOLIO:,} "
+          f"holdings in {time.perf_counter() - started:.1f}s")
+
+    passed = True
+    try:
+        for step, label in enumerate(["Revalue stale holdings", "Revalue again, nothing changed"], start=2):
+            report = revalue_holdings()
+            ok = report.rows_per_second >= TARGET_RATE
+            passed &= ok
+            print(f"\n{step}️⃣ {label}:")
+            print(f"   {'✅' if ok else '❌'} {report.holdings:,} holdings, {report.updated:,} updated, "
+                  f"{report.portfolios:,} portfolios in {report.seconds:.2f}s "
+                  f"({report.rows_per_second:,.0f} rows/s)")
+    finally:
+        _cleanup(first_id)
+
+    print("=" * 60)
+    print(f"🏁 Revaluation benchmark {'passed' if passed else 'FAILED'} (target {TARGET_RATE:,} rows/s)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_revaluation()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Benchmark for stock autocomplete
+
+Seeds 5,000 synthetic stocks, times the search index build and then
+keystroke-by-keystroke queries against the in-process index, the
+/api/stocks/search/ endpoint and the SearchFilter-backed list endpoint,
+then removes the synthetic rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.test import Client
+from api.models import Stock
+from api.services.search import stock_search_index
+
+STOCKS = 5000
+TARGET_MS = 5
+SECTOR = 'Search benchmark'
+WORDS = [
+    'Reliance', 'Tata', 'Infosys', 'Bharat', 'Hindustan', 'Adani', 'Mahindra', 'Bajaj', 'Larsen',
+    'Power', 'Steel', 'Motors', 'Finance', 'Pharma', 'Energy', 'Cement', 'Textiles', 'Chemicals',
+]
+# Each query is typed one character at a time, a few with typos
+QUERIES = ['RELI', 'TATAM', 'infosys', 'mahindra fin', 'bajaj pharma', 'hindustn steel', 'adani powr']
+
+
+def _seed():
+    stocks = []
+    for i in range(STOCKS):
+        first, second = WORDS[i % len(WORDS)], WORDS[(i // len(WORDS) + 9) % len(WORDS)]
+        stocks.append(Stock(
+            symbol=f'{first[:4].upper()}{second[:1].upper()}{i:04d}'[:10],
+            name=f'{first} {second} Industries {i}', exchange='NSE', sector=SECTOR,
+        ))
+    Stock.objects.bulk_create(stocks, batch_size=1000)
+
+
+def _keystrokes():
+    return [query[:length] for query in QUERIES for length in range(1, len(query) + 1)]
+
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def _time_calls(call, queries):
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        call(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return _percentiles(timings)
+
+
+def benchmark_stock_search():
+    print("🔎 Benchmarking stock autocomplete...")
+    print("=" * 60)
+    if Stock.objects.filter(sector=SECTOR).exists():
+        print("❌ Synthetic stocks from an earlier run still exist")
+        return False
+
+    passed = True
+    try:
+        started = time.perf_counter()
+        _seed()
+        print(f"\n1️⃣ Seeded {STOCKS:,} stocks in {time.perf_counter() - started:.1f}s")
+
+        # bulk_create sends no signals, so drop the index by hand
+        stock_search_index.reset()
+        started = time.perf_counter()
+        stock_search_index.search('warm up')
+        print(f"\n2️⃣ Index built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        queries = _keystrokes()
+        # Signed in, so the anonymous rate limit doesn't answer most keystrokes with 429s
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.order_by('pk').first())
+        print(f"\n3️⃣ {len(queries)} keystrokes, median / p95:")
+        median, p95 = _time_calls(stock_search_index.search, queries)
+        print(f"   ⚡ Index lookup: {median:.2f} ms / {p95:.2f} ms")
+        median, p95 = _time_calls(lambda query: client.get('/api/stocks/search/', {'q': query}), queries)
+        ok = p95 < TARGET_MS
+        passed &= ok
+        print(f"   {'✅' if ok else '❌'} /api/stocks/search/: {median:.2f} ms / {p95:.2f} ms")
+        median, p95 = _time_calls(lambda query: client.get('/api/stocks/', {'search': query}), queries)
+        print(f"   📋 /api/stocks/?search= (SearchFilter, paginated): {median:.2f} ms / {p95:.2f} ms")
+
+        for query in ('RELI', 'hindustn steel', 'adani powr'):
+            symbols = [entry.symbol for entry in stock_search_index.search(query, 3)]
+            print(f"   🔤 {query!r} -> {', '.join(symbols)}")
+    finally:
+        Stock.objects.filter(sector=SECTOR).delete()
+        stock_search_index.reset()
+
+    print("=" * 60)
+    print(f"🏁 Stock search benchmark {'passed' if passed else 'FAILED'} (target p95 < {TARGET_MS} ms)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_stock_search()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark for the trade summary
+
+Seeds one synthetic user with 200,000 trades over two years, materializes
+their UserTradeStats rows, then times /api/trades/trade_summary/ next to the
+six-query summary it replaced and the one-query cold path, and removes the
+rows again.
+"""
+
+import os
+import sys
+import time
+import django
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Avg, Sum
+from django.test import Client
+from django.utils import timezone
+from api.models import Order, Stock, Trade, UserTradeStats
+from api.services.trade_stats import counters, rebuild_trade_stats, trade_summary
+
+TRADES = 200000
+DAYS = 730
+ROUNDS = 30
+TARGET_MS = 10
+USERNAME = 'trade_summary_bench'
+
+
+def _seed(user, stock_ids):
+    """Insert one order and TRADES trades of ``user`` spread over DAYS days with SQL"""
+    stamp = connection.ops.adapt_datetimefield_value(timezone.now())
+    orders = Order._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {orders} (order_type, side, quantity, filled_quantity, status, commission, notes, '
+            'created_at, updated_at, user_id, stock_id) '
+            "VALUES ('MARKET', 'BUY', 1, 1, 'FILLED', 0, '', %s, %s, %s, %s)",
+            [stamp, stamp, user.pk, stock_ids[0]],
+        )
+        order_id = cursor.lastrowid
+        # Every third trade sells; sizes, prices and stocks cycle
+        cursor.execute(
+            'WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s), '
+            f's AS (SELECT row_number() OVER (ORDER BY id) - 1 AS k, id FROM {Stock._meta.db_table}) '
+            f'INSERT INTO {Trade._meta.db_table} (quantity, price, side, total_amount, commission, '
+            'net_amount, executed_at, order_id, stock_id, user_id) '
+            "SELECT 1 + i %% 9, 100 + i %% 50, CASE WHEN i %% 3 = 0 THEN 'SELL' ELSE 'BUY' END, "
+            '(1 + i %% 9) * (100 + i %% 50), 0, (1 + i %% 9) * (100 + i %% 50), '
+            "datetime(%s, '-' || (i %% %s) || ' days'), %s, s.id, %s "
+            'FROM n JOIN s ON s.k = n.i %% %s',
+            [TRADES - 1, stamp, DAYS, order_id, user.pk, len(stock_ids)],
+        )
+
+
+def _cleanup(user):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {UserTradeStats._meta.db_table} WHERE user_id = %s', [user.pk])
+        cursor.execute(f'DELETE FROM {Trade._meta.db_table} WHERE user_id = %s', [user.pk])
+        cursor.execute(f'DELETE FROM {Order._meta.db_table} WHERE user_id = %s', [user.pk])
+    user.delete()
+
+
+def _six_queries(trades):
+    """The summary as trade_summary computed it before UserTradeStats"""
+    return {
+        'total_trades': trades.count(),
+        'buy_trades': trades.filter(side='BUY').count(),
+        'sell_trades': trades.filter(side='SELL').count(),
+        'total_volume': trades.aggregate(total=Sum('quantity'))['total'] or 0,
+        'total_amount': trades.aggregate(total=Sum('total_amount'))['total'] or 0,
+        'average_trade_size': trades.aggregate(avg=Avg('total_amount'))['avg'] or 0,
+    }
+
+
+def _time(call):
+    timings, result = [], None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return (timings[len(timings) // 2], timings[int(len(timings) * 0.95)]), result
+
+
+def benchmark_trade_summary():
+    print("🧮 Benchmarking the trade summary...")
+    print("=" * 60)
+    stock_ids = list(Stock.objects.order_by('pk').values_list('pk', flat=True))
+    if not stock_ids:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username=USERNAME).exists():
+        print("❌ The synthetic user from an earlier run still exists")
+        return False
+
+    passed = True
+    user = User.objects.create(username=USERNAME)
+    try:
+        started = time.perf_counter()
+        _seed(user, stock_ids)
+        print(f"\n1️⃣ Seeded {TRADES:,} trades in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        rebuild_trade_stats([user.pk])
+        rows = UserTradeStats.objects.filter(user=user).count()
+        print(f"\n2️⃣ Materialized {rows:,} UserTradeStats rows in {time.perf_counter() - started:.2f}s")
+
+        trades = Trade.objects.filter(user=user)
+        expected = _six_queries(trades)
+        summary = trade_summary(user)
+        consistent = all(summary[field] == expected[field] for field in counters())
+        passed &= consistent
+        print(f"   {'✅' if consistent else '❌'} Stats rows match the trade log")
+
+        print("\n3️⃣ Summary query only, median / p95:")
+        (median, p95), _ = _time(lambda: _six_queries(trades))
+        print(f"   🐢 Six queries over Trade: {median:.2f} ms / {p95:.2f} ms")
+        (median, p95), _ = _time(lambda: trades.aggregate(**counters()))
+        print(f"   🐢 One conditional aggregate (cold path): {median:.2f} ms / {p95:.2f} ms")
+        (median, p95), _ = _time(lambda: trade_summary(user))
+        print(f"   ⚡ UserTradeStats row: {median:.2f} ms / {p95:.2f} ms")
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        print("\n4️⃣ /api/trades/trade_summary/, median / p95:")
+        for label, params in [
+            ('Totals', {}),
+            ('By symbol and month', {'breakdown': 'symbol,month'}),
+        ]:
+            (median, p95), response = _time(lambda: client.get('/api/trades/trade_summary/', params))
+            ok = response.status_code == 200 and p95 < TARGET_MS
+            passed &= ok
+            buckets = sum(len(response.json().get(f'by_{name}', [])) for name in ('symbol', 'month'))
+            print(f"   {'✅' if ok else '❌'} {label}: {median:.2f} ms / {p95:.2f} ms ({buckets} buckets)")
+    finally:
+        _cleanup(user)
+
+    print("=" * 60)
+    print(f"🏁 Trade summary benchmark {'passed' if passed else 'FAILED'} (target p95 < {TARGET_MS} ms)")
+    return passed
+
+
+if __name__ == "__main__":
+    benchmark_trade_summary()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Test for cost basis methods
+
+For each of FIFO, LIFO and AVERAGE, a synthetic user buys 10 @ 100 and
+10 @ 120, then sells 15 @ 130 through apply_fills; the realized P&L and the
+basis left on the holding must match the method. A holding older than the
+lot ledger must fall back to its average price. The users are removed again.
+"""
+
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from api.models import Order, Portfolio, PortfolioHolding, PositionLot, Stock, Trade
+from api.services.execution import apply_fills
+
+PREFIX = 'cost_basis_test_'
+# Method -> (realized P&L, basis of the 5 shares left)
+EXPECTED = {
+    'FIFO': (Decimal('350.00'), Decimal('600.00')),
+    'LIFO': (Decimal('250.00'), Decimal('500.00')),
+    'AVERAGE': (Decimal('300.00'), Decimal('550.00')),
+}
+
+
+def _fill(user, stock, side, quantity, price):
+    order = Order.objects.create(user=user, stock=stock, order_type='MARKET', side=side, quantity=quantity)
+    return apply_fills({order.pk: Decimal(price)})
+
+
+def _check(label, actual, expected):
+    ok = actual == expected
+    print(f"   {'✅' if ok else '❌'} {label}: {actual} (expected {expected})")
+    return ok
+
+
+def _holding(user, stock):
+    return PortfolioHolding.objects.get(portfolio__user=user, stock=stock)
+
+
+def test_cost_basis():
+    print("🔍 Testing cost basis methods...")
+    print("=" * 60)
+    stock = Stock.objects.order_by('pk').first()
+    if stock is None:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username__startswith=PREFIX).exists():
+        print("❌ Synthetic users from an earlier run still exist")
+        return False
+
+    all_ok = True
+    users = []
+    try:
+        for step, (method, (realized, basis)) in enumerate(EXPECTED.items(), start=1):
+            user = User.objects.create(username=f'{PREFIX}{method.lower()}')
+            users.append(user)
+            Portfolio.objects.create(user=user, cost_basis_method=method)
+            _fill(user, stock, 'BUY', 10, '100.00')
+            _fill(user, stock, 'BUY', 10, '120.00')
+            filled = _fill(user, stock, 'SELL', 15, '130.00')
+
+            print(f"\n{step}️⃣ {method}: buy 10 @ 100 and 10 @ 120, sell 15 @ 130")
+            all_ok &= _check("Sell filled", len(filled), 1)
+            trade = Trade.objects.get(order=filled[0]) if filled else None
+            all_ok &= _check("Trade realized P&L", trade and trade.realized_pnl, realized)
+            holding = _holding(user, stock)
+            all_ok &= _check("Holding realized P&L", holding.realized_pnl, realized)
+            all_ok &= _check("Portfolio realized P&L", Portfolio.objects.get(user=user).realized_pnl, realized)
+            all_ok &= _check("Shares left", holding.quantity, 5)
+            all_ok &= _check("Basis left", holding.total_invested, basis)
+            all_ok &= _check("Lot shares left", sum(holding.lots.values_list('quantity', flat=True)), 5)
+
+        user = User.objects.create(username=f'{PREFIX}legacy')
+        users.append(user)
+        Portfolio.objects.create(user=user, cost_basis_method='FIFO')
+        _fill(user, stock, 'BUY', 10, '100.00')
+        # As if bought before PositionLot existed
+        PositionLot.objects.filter(holding__portfolio__user=user).delete()
+        _fill(user, stock, 'SELL', 5, '130.00')
+        print(f"\n{len(EXPECTED) + 1}️⃣ FIFO without lots: buy 10 @ 100, drop the lots, sell 5 @ 130")
+        holding = _holding(user, stock)
+        all_ok &= _check("Holding realized P&L", holding.realized_pnl, Decimal('150.00'))
+        all_ok &= _check("Basis left", holding.total_invested, Decimal('500.00'))
+    finally:
+        for user in users:
+            user.delete()
+
+    print("=" * 60)
+    print("🏁 Cost basis test " + ("passed!" if all_ok else "FAILED"))
+    return all_ok
+
+
+if __name__ == "__main__":
+    test_cost_basis()
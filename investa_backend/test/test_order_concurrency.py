@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Concurrency stress test for order execution
+
+Fires parallel MARKET orders for one user against a running server and
+checks that cash balance, holdings and portfolio totals add up afterwards.
+"""
+
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+BASE_URL = "http://127.0.0.1:8000/api"
+PARALLEL_ORDERS = 20
+
+
+def _place_order(token, stock_id, side):
+    headers = {"Authorization": f"Token {token}"}
+    payload = {"stock": stock_id, "side": side, "quantity": 1, "order_type": "MARKET"}
+    return requests.post(f"{BASE_URL}/orders/", json=payload, headers=headers)
+
+
+def _snapshot(headers, stock_id):
+    portfolio = requests.get(f"{BASE_URL}/portfolio/my_portfolio/", headers=headers).json()
+    holdings = requests.get(f"{BASE_URL}/portfolio/holdings/", headers=headers).json()['holdings']
+    holding = next((h for h in holdings if h['stock']['id'] == stock_id), None)
+    return {
+        'cash': Decimal(portfolio['cash_balance']),
+        'invested': Decimal(portfolio['total_invested']),
+        'value': Decimal(portfolio['total_value']),
+        'quantity': holding['quantity'] if holding else 0,
+        'holdings_invested': sum(Decimal(h['total_invested']) for h in holdings),
+    }
+
+
+def _fire(token, stock_id, side):
+    with ThreadPoolExecutor(max_workers=PARALLEL_ORDERS) as pool:
+        futures = [pool.submit(_place_order, token, stock_id, side) for _ in range(PARALLEL_ORDERS)]
+        responses = [f.result() for f in futures]
+    filled = [r.json() for r in responses if r.status_code == 201 and r.json()['status'] == 'FILLED']
+    errors = [r for r in responses if r.status_code != 201]
+    return filled, errors
+
+
+def _check(label, actual, expected):
+    ok = actual == expected
+    print(f"   {'✅' if ok else '❌'} {label}: {actual} (expected {expected})")
+    return ok
+
+
+def test_order_concurrency():
+    print("🔍 Testing concurrent order execution...")
+    print("=" * 60)
+
+    response = requests.post(f"{BASE_URL}/auth/login/", json={
+        "username": "test@example.com",
+        "password": "test123"
+    })
+    if response.status_code != 200:
+        print(f"❌ Login failed: {response.text}")
+        return False
+    token = response.json()['token']
+    headers = {"Authorization": f"Token {token}"}
+
+    stocks = requests.get(f"{BASE_URL}/stocks/", headers=headers).json()['results']
+    if not stocks:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    stock_id = stocks[0]['id']
+
+    all_ok = True
+    for side in ('BUY', 'SELL'):
+        print(f"\n{'1️⃣' if side == 'BUY' else '2️⃣'} Firing {PARALLEL_ORDERS} parallel {side} orders...")
+        before = _snapshot(headers, stock_id)
+        filled, errors = _fire(token, stock_id, side)
+        after = _snapshot(headers, stock_id)
+
+        amount = sum(Decimal(order['total_amount']) for order in filled)
+        sign = -1 if side == 'BUY' else 1
+        print(f"   Filled: {len(filled)}, errors: {len(errors)}")
+        all_ok &= _check("No request errors", len(errors), 0)
+        all_ok &= _check("Cash balance", after['cash'], before['cash'] + sign * amount)
+        all_ok &= _check("Holding quantity", after['quantity'], before['quantity'] - sign * len(filled))
+        all_ok &= _check("Total invested matches holdings", after['invested'], after['holdings_invested'])
+
+    print("=" * 60)
+    print("🏁 Order concurrency test " + ("passed!" if all_ok else "FAILED"))
+    return all_ok
+
+
+if __name__ == "__main__":
+    test_order_concurrency()
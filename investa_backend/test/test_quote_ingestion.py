@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Test for quote ingestion
+
+Ingests a price-only quote CSV over a stock whose MarketData row carries
+fundamentals, checks the prices moved while market cap, P/E ratio and
+dividend yield kept their stored values, then restores the row.
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import django
+from decimal import Decimal
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from api.models import MarketData
+from api.services.ingestion import QUOTE_COLUMNS, QUOTE_OPTIONAL_COLUMNS, ingest_file
+
+FUNDAMENTALS = {'market_cap': Decimal('1234567.89'), 'pe_ratio': Decimal('12.34'), 'dividend_yield': Decimal('1.23')}
+PRICES = {
+    'current_price': Decimal('101.01'), 'change_amount': Decimal('1.01'), 'change_percentage': Decimal('1.01'),
+    'volume': 4321, 'high_24h': Decimal('102.02'), 'low_24h': Decimal('99.99'), 'open_24h': Decimal('100.00'),
+    'previous_close': Decimal('100.00'),
+}
+
+
+def _check(label, actual, expected):
+    ok = actual == expected
+    print(f"   {'✅' if ok else '❌'} {label}: {actual} (expected {expected})")
+    return ok
+
+
+def test_quote_ingestion():
+    print("🔍 Testing price-only quote ingestion...")
+    print("=" * 60)
+    quote = MarketData.objects.select_related('stock').order_by('stock__symbol').first()
+    if quote is None:
+        print("❌ No market data available, run populate_sample_data first")
+        return False
+
+    fields = [*QUOTE_COLUMNS[1:], *QUOTE_OPTIONAL_COLUMNS]
+    original = MarketData.objects.filter(pk=quote.pk).values(*fields).get()
+    all_ok = True
+    try:
+        MarketData.objects.filter(pk=quote.pk).update(**FUNDAMENTALS)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'quotes.csv')
+            with open(path, 'w', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(QUOTE_COLUMNS)
+                writer.writerow([quote.stock.symbol, *PRICES.values()])
+            report = ingest_file(path, 'quotes', refresh=False)
+
+        print(f"\n1️⃣ Ingested {report.rows} price-only quote for {quote.stock.symbol}")
+        stored = MarketData.objects.filter(pk=quote.pk).values(*fields).get()
+        for name, value in {**PRICES, **FUNDAMENTALS}.items():
+            all_ok &= _check(name, stored[name], value)
+    finally:
+        MarketData.objects.filter(pk=quote.pk).update(**original)
+
+    print("=" * 60)
+    print("🏁 Quote ingestion test " + ("passed!" if all_ok else "FAILED"))
+    return all_ok
+
+
+if __name__ == "__main__":
+    test_quote_ingestion()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Test for triggered stop-limit orders
+
+Rests a SELL stop 100 / limit 99 on a synthetic stock, triggers it at 98,
+forces the matching engine to reload its books from the database and checks
+that a move to 101 still fills the order as a limit, then removes the
+synthetic rows again.
+"""
+
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from api.models import Order, Portfolio, Stock
+from api.services.execution import apply_fills
+from api.services.matching import MatchingEngine
+
+USERNAME = 'stop_limit_test'
+SYMBOL = 'ZZSTOPTEST'
+
+
+def _check(label, actual, expected):
+    ok = actual == expected
+    print(f"   {'✅' if ok else '❌'} {label}: {actual} (expected {expected})")
+    return ok
+
+
+def test_stop_limit():
+    print("🔍 Testing stop-limit orders across a book reload...")
+    print("=" * 60)
+    if User.objects.filter(username=USERNAME).exists() or Stock.objects.filter(symbol=SYMBOL).exists():
+        print("❌ Synthetic rows from an earlier run still exist")
+        return False
+
+    all_ok = True
+    user = User.objects.create(username=USERNAME)
+    stock = Stock.objects.create(symbol=SYMBOL, name='Stop-limit test stock')
+    try:
+        Portfolio.objects.create(user=user)
+        bought = Order.objects.create(user=user, stock=stock, order_type='MARKET', side='BUY', quantity=10)
+        apply_fills({bought.pk: Decimal('102.00')})
+        order = Order.objects.create(
+            user=user, stock=stock, order_type='STOP_LIMIT', side='SELL', quantity=10,
+            stop_price=Decimal('100.00'), price=Decimal('99.00'),
+        )
+        # Its own engine, so only this stock's book moves
+        engine = MatchingEngine(reload_interval=0)
+        engine.submit([(order, Decimal('102.00'))])
+
+        print("\n1️⃣ SELL stop 100 / limit 99 resting at 102, price drops to 98")
+        engine.on_price(stock.pk, Decimal('98.00'))
+        order.refresh_from_db()
+        all_ok &= _check("Status", order.status, 'PENDING')
+        all_ok &= _check("Trigger recorded", order.triggered_at is not None, True)
+
+        print("\n2️⃣ Books reloaded from the database, price recovers to 101")
+        engine.reset()
+        filled = engine.on_price(stock.pk, Decimal('101.00'))
+        order.refresh_from_db()
+        all_ok &= _check("Filled by the move", [o.pk for o in filled], [order.pk])
+        all_ok &= _check("Status", order.status, 'FILLED')
+        all_ok &= _check("Fill price", order.average_fill_price, Decimal('101.00'))
+    finally:
+        user.delete()
+        stock.delete()
+
+    print("=" * 60)
+    print("🏁 Stop-limit test " + ("passed!" if all_ok else "FAILED"))
+    return all_ok
+
+
+if __name__ == "__main__":
+    test_stop_limit()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Test for maintained trade stats
+
+Writes trades for a synthetic user without touching UserTradeStats (as
+imports or the admin would), then records a fresh batch the way
+apply_fills does and checks the stats rows it creates count the earlier
+trades too, then removes the user again.
+"""
+
+import os
+import sys
+import django
+from datetime import timedelta
+from decimal import Decimal
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'investa_backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from api.models import Order, Stock, Trade, UserTradeStats
+from api.services.trade_stats import BREAKDOWNS, rebuild_trade_stats, record_trade_stats, trade_summary
+
+USERNAME = 'trade_stats_test'
+
+
+def _trades(user, order, stock, count, side='BUY'):
+    return Trade.objects.bulk_create([
+        Trade(order=order, user=user, stock=stock, quantity=2, price=Decimal('10.00'), side=side,
+              total_amount=Decimal('20.00'), net_amount=Decimal('20.00'))
+        for _ in range(count)
+    ])
+
+
+def _check(label, actual, expected):
+    ok = actual == expected
+    print(f"   {'✅' if ok else '❌'} {label}: {actual} (expected {expected})")
+    return ok
+
+
+def test_trade_stats():
+    print("🔍 Testing trade stats over earlier trades...")
+    print("=" * 60)
+    stock = Stock.objects.order_by('pk').first()
+    if stock is None:
+        print("❌ No stocks available, run populate_sample_data first")
+        return False
+    if User.objects.filter(username=USERNAME).exists():
+        print("❌ The synthetic user from an earlier run still exists")
+        return False
+
+    all_ok = True
+    user = User.objects.create(username=USERNAME)
+    try:
+        order = Order.objects.create(user=user, stock=stock, order_type='MARKET', side='BUY', quantity=1)
+        # Earlier trades without stats rows: three this month, two sells some months back
+        _trades(user, order, stock, 3)
+        old = _trades(user, order, stock, 2, side='SELL')
+        Trade.objects.filter(pk__in=[trade.pk for trade in old]).update(
+            executed_at=timezone.now() - timedelta(days=70)
+        )
+        print("\n1️⃣ Wrote 5 trades without stats rows")
+
+        with transaction.atomic():
+            record_trade_stats(_trades(user, order, stock, 1))
+        print("\n2️⃣ Recorded a batch of 1 trade")
+        summary = trade_summary(user, BREAKDOWNS)
+        all_ok &= _check("Total trades", summary['total_trades'], 6)
+        all_ok &= _check("Sell trades", summary['sell_trades'], 2)
+        all_ok &= _check(f"{stock.symbol} trades", [row['total_trades'] for row in summary['by_symbol']], [6])
+        all_ok &= _check("Trades per month", [row['total_trades'] for row in summary['by_month']], [2, 4])
+        all_ok &= _check("Rows written", UserTradeStats.objects.filter(user=user).count(), 4)
+        all_ok &= _check("Drift against the trade log", rebuild_trade_stats([user.pk], fix=False).drifted, {})
+    finally:
+        user.delete()
+
+    print("=" * 60)
+    print("🏁 Trade stats test " + ("passed!" if all_ok else "FAILED"))
+    return all_ok
+
+
+if __name__ == "__main__":
+    test_trade_stats()